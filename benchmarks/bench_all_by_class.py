@@ -0,0 +1,51 @@
+#!/usr/bin/python3
+"""Benchmark storage.all(cls) against the former full scan of __objects
+
+Usage (from the repository root):
+    PYTHONPATH=. ./benchmarks/bench_all_by_class.py [number_of_objects]
+"""
+import sys
+import time
+from models import storage
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+
+
+def scan_all(cls):
+    """The previous all(cls): walk every key of the store"""
+    objs = {}
+    for key, val in storage.all().items():
+        if key.startswith(cls.__name__ + '.'):
+            objs.update({key: val})
+    return objs
+
+
+def timed(func, cls, rounds=20):
+    """Returns the mean time of func(cls) in milliseconds"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func(cls)
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 120000
+    storage.all().clear()
+    # a skewed mix: few states and amenities, many places and reviews
+    mix = [(State, 1), (Amenity, 1), (City, 8), (User, 10),
+           (Place, 30), (Review, 50)]
+    for cls, share in mix:
+        for _ in range(total * share // 100):
+            storage.new(cls())
+
+    print("{} objects in storage".format(len(storage.all())))
+    print("{:<10}{:>8}{:>14}{:>14}".format("class", "count",
+                                           "scan (ms)", "index (ms)"))
+    for cls, _ in mix:
+        print("{:<10}{:>8}{:>14.3f}{:>14.3f}".format(
+            cls.__name__, len(storage.all(cls)),
+            timed(scan_all, cls), timed(storage.all, cls)))
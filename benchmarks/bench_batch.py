@@ -0,0 +1,40 @@
+#!/usr/bin/python3
+"""Benchmark creates saved one by one against creates inside a batch
+
+Runs against the storage selected by HBNB_TYPE_STORAGE. File storage
+writes to a temporary file, DBStorage to the configured database.
+
+Usage (from the repository root):
+    PYTHONPATH=. ./benchmarks/bench_batch.py [creates]
+"""
+import os
+import sys
+import tempfile
+import time
+from contextlib import nullcontext
+from models import storage
+from models.engine.file_storage import FileStorage
+from models.state import State
+
+
+def creates(count, context):
+    """Returns the time in seconds of count creates saved in context"""
+    start = time.perf_counter()
+    with context:
+        for i in range(count):
+            State(name="State{}".format(i)).save()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    if isinstance(storage, FileStorage):
+        path = os.path.join(tempfile.mkdtemp(), 'file.json')
+        FileStorage._FileStorage__file_path = path
+        storage.all().clear()
+    print("{}, {} creates".format(type(storage).__name__, count))
+    for label, context in (("no batch", nullcontext()),
+                           ("batch", storage.batch())):
+        elapsed = creates(count, context)
+        print("{:<10}{:>10.2f} s{:>12.0f} creates/s".format(
+            label, elapsed, count / elapsed))
@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+"""Benchmark the rows per second of the ways to import Reviews
+
+Compares one save() per review, a batch() block, bulk_new() and
+bulk_update(). The per-review saves only run on the first 2000 rows.
+
+Usage (from the repository root):
+    PYTHONPATH=. ./benchmarks/bench_bulk.py [number_of_reviews]
+    HBNB_TYPE_STORAGE=sqlite HBNB_SQLITE_PATH=/tmp/hbnb_bench.db \\
+    PYTHONPATH=. ./benchmarks/bench_bulk.py [number_of_reviews]
+"""
+import os
+import sys
+import tempfile
+import time
+from models import storage
+from models.engine.file_storage import FileStorage
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+
+
+def rate(label, count, func):
+    """Prints the rows per second of func(), which handles count rows"""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print("{:<12}{:>9} rows {:10.2f} s {:12.0f} rows/s".format(
+        label, count, elapsed, count / elapsed))
+
+
+def batch(reviews):
+    """Saves the reviews inside one batch() block"""
+    with storage.batch():
+        for review in reviews:
+            review.save()
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    if isinstance(storage, FileStorage):
+        path = os.path.join(tempfile.mkdtemp(), 'file.json')
+        FileStorage._FileStorage__file_path = path
+        FileStorage._FileStorage__objects.clear()
+    user = User(email="bench@hbnb.io", password="pwd")
+    user.save()
+    state = State(name="Bench")
+    state.save()
+    city = City(name="Bench", state_id=state.id)
+    city.save()
+    place = Place(name="Bench", city_id=city.id, user_id=user.id)
+    place.save()
+
+    def reviews(count):
+        """Returns count new reviews of the place"""
+        return [Review(text="Great", place_id=place.id, user_id=user.id)
+                for _ in range(count)]
+
+    few = reviews(min(total, 2000))
+    rate("save()", len(few), lambda: [review.save() for review in few])
+    many = reviews(total)
+    rate("batch()", total, lambda: batch(many))
+    many = reviews(total)
+    rate("bulk_new()", total, lambda: storage.bulk_new(many))
+    rows = [{'id': review.id, 'text': "Updated"} for review in many]
+    rate("bulk_update", total, lambda: storage.bulk_update(Review, rows))
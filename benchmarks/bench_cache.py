@@ -0,0 +1,42 @@
+#!/usr/bin/python3
+"""Benchmark the reads of the 100-hbnb route with and without the cache
+
+Each simulated request reads every State with its cities and every
+Amenity, then closes its session as the route teardown does.
+
+Usage (from the repository root, on an empty database):
+    HBNB_TYPE_STORAGE=db HBNB_DB_URL=sqlite:////tmp/hbnb_bench.db \\
+    PYTHONPATH=. ./benchmarks/bench_cache.py [rows] [requests]
+"""
+import os
+import sys
+import time
+from unittest.mock import patch
+from models import storage
+from models.amenity import Amenity
+from models.state import State
+from benchmarks.db_fixture import populate
+
+
+def serve(store, requests):
+    """Returns the mean time of a request in milliseconds"""
+    start = time.perf_counter()
+    for _ in range(requests):
+        states = store.all(State, load=['cities']).values()
+        sum(len(state.cities) for state in states)
+        store.all(Amenity)
+        store.close()
+    return (time.perf_counter() - start) / requests * 1000
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    print(populate(total))
+    for enabled in ("0", "1"):
+        with patch.dict(os.environ, {"HBNB_DB_CACHE": enabled}):
+            store = type(storage)()
+        store.reload()
+        print("cache {:<4}{:8.2f} ms per request {}".format(
+            "on" if enabled == "1" else "off", serve(store, requests),
+            store.cache_stats()))
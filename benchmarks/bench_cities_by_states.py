@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+"""Benchmark rendering /cities_by_states in file storage mode
+
+Compares State.cities scanning every City, as it used to, with the
+foreign key index of FileStorage.
+
+Usage (from the repository root):
+    PYTHONPATH=. ./benchmarks/bench_cities_by_states.py [states] [cities]
+"""
+import importlib
+import sys
+import time
+from models import storage
+from models.city import City
+from models.state import State
+
+
+def scan_cities(self):
+    """The previous State.cities: walk every City in storage"""
+    return [city for city in storage.all(City).values()
+            if city.state_id == self.id]
+
+
+def render(client, rounds=3):
+    """Returns the mean time in ms of a GET /cities_by_states"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        client.get('/cities_by_states')
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+if __name__ == "__main__":
+    states = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    cities = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    app = importlib.import_module('web_flask.8-cities_by_states').app
+    storage.all().clear()
+    state_ids = []
+    for i in range(states):
+        state = State(name="State {}".format(i))
+        storage.new(state)
+        state_ids.append(state.id)
+    for i in range(cities):
+        storage.new(City(name="City {}".format(i),
+                         state_id=state_ids[i % states]))
+    # close() must not reload a file.json unrelated to this data
+    storage.close = lambda: None
+    client = app.test_client()
+    print("{} states, {} cities".format(states, cities))
+    index = render(client)
+    State.cities = property(scan_cities)
+    print("scan:  {:10.1f} ms".format(render(client)))
+    print("index: {:10.1f} ms".format(index))
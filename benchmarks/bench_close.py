@@ -0,0 +1,39 @@
+#!/usr/bin/python3
+"""Benchmark storage.close(), run by Flask after every request
+
+Compares the previous close(), a full reload(), with the change-aware
+close() on an unchanged file, for growing stores.
+
+Usage (from the repository root):
+    PYTHONPATH=. ./benchmarks/bench_close.py [sizes...]
+"""
+import os
+import sys
+import tempfile
+import time
+from models import storage
+from models.engine.file_storage import FileStorage
+from models.state import State
+
+
+def timed(func, rounds=5):
+    """Returns the mean time of func() in milliseconds"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+if __name__ == "__main__":
+    sizes = [int(size) for size in sys.argv[1:]] or [1000, 10000, 100000]
+    FileStorage._FileStorage__file_path = os.path.join(tempfile.mkdtemp(),
+                                                       'file.json')
+    print("{:>8}{:>14}{:>14}".format("objects", "reload (ms)", "close (ms)"))
+    for size in sizes:
+        storage.all().clear()
+        for i in range(size):
+            storage.new(State(name="State{}".format(i)))
+        storage.save()
+        print("{:>8}{:>14.2f}{:>14.4f}".format(
+            size, timed(storage.reload), timed(storage.close, 1000)))
+    os.remove(FileStorage._FileStorage__file_path)
@@ -0,0 +1,90 @@
+#!/usr/bin/python3
+"""Benchmark save() and reload() of FileStorage with each JSON codec
+
+For every codec installed, reports the time and peak memory of a save()
+that encodes every object, of an eager reload() and of building every
+object after a lazy reload(), which decodes their JSON text with the
+codec. The snapshot itself is always read by the incremental reader.
+
+Usage (from the repository root):
+    PYTHONPATH=. ./benchmarks/bench_codec.py [number_of_objects]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from models import storage
+from models.base_model import BaseModel
+from models.engine.codec import codecs
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.state import State
+from benchmarks.bench_compact import reset
+
+
+def measure(setup, func):
+    """Returns the time of func() and, from a second traced run, its
+    peak memory in MiB; setup() runs before each"""
+    setup()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    setup()
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2 ** 20
+
+
+def dirty_all():
+    """Makes the next save() encode every object"""
+    for obj in storage.all().values():
+        obj.mark_dirty()
+    FileStorage._FileStorage__fragments.clear()
+    FileStorage._FileStorage__records.clear()
+
+
+def empty():
+    """Empties storage before a reload"""
+    reset()
+    BaseModel.collect_dirty()
+
+
+def lazy_build():
+    """Reloads lazily, then builds every Place"""
+    FileStorage._FileStorage__lazy = True
+    try:
+        storage.reload()
+        storage.all(Place)
+    finally:
+        FileStorage._FileStorage__lazy = False
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    path = os.path.join(tempfile.mkdtemp(), 'file.json')
+    FileStorage._FileStorage__file_path = path
+    reset()
+    objs = [Place(name="Place {}".format(i), number_rooms=3,
+                  latitude=i / 7) if i % 100
+            else State(name="State {}".format(i)) for i in range(total)]
+    for obj in objs:
+        storage.new(obj)
+    del objs
+    for name, codec in codecs.items():
+        try:
+            FileStorage._FileStorage__codec = codec()
+        except ImportError:
+            print("{:<8}not installed".format(name))
+            continue
+        saved = measure(dirty_all, storage.save)
+        loaded = measure(empty, storage.reload)
+        built = measure(empty, lazy_build)
+        empty()
+        storage.reload()
+        print("{:<8}save {:6.2f} s {:7.1f} MiB, reload {:6.2f} s "
+              "{:7.1f} MiB, lazy build {:6.2f} s {:7.1f} MiB".format(
+                  name, *saved, *loaded, *built))
+    os.remove(path)
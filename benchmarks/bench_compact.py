@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+"""Report the memory per record of each way reload() can hold a store
+
+Compares the memory held after reload() when every record is built
+into an object (the default, which also caches the JSON text of each
+record), kept as JSON text (HBNB_FILE_LAZY=1) and kept in columns
+(HBNB_FILE_COMPACT=1), and the time iter() then takes to walk them.
+
+Usage (from the repository root):
+    PYTHONPATH=. ./benchmarks/bench_compact.py [number_of_objects]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from models import storage
+from models.engine.file_storage import FileStorage
+from models.city import City
+from models.place import Place
+from models.state import State
+
+
+def reset():
+    """Empties storage, loaded objects and unloaded records alike"""
+    FileStorage._FileStorage__objects.clear()
+    FileStorage._FileStorage__by_class.clear()
+    FileStorage._FileStorage__indexed = 0
+    FileStorage._FileStorage__unloaded.clear()
+    FileStorage._FileStorage__fragments.clear()
+    FileStorage._FileStorage__records.clear()
+    FileStorage._FileStorage__columns.clear()
+    FileStorage._FileStorage__fk_index.clear()
+    FileStorage._FileStorage__fk_values.clear()
+    FileStorage._FileStorage__place_amenity.clear()
+    FileStorage._FileStorage__amenity_place.clear()
+    FileStorage._FileStorage__id_order.clear()
+    FileStorage._FileStorage__id_added.clear()
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    path = os.path.join(tempfile.mkdtemp(), 'file.json')
+    FileStorage._FileStorage__file_path = path
+    reset()
+    states = [State(name="State {}".format(i)) for i in range(50)]
+    cities = [City(name="City {}".format(i), state_id=states[i % 50].id)
+              for i in range(500)]
+    for obj in states + cities:
+        storage.new(obj)
+    for i in range(total - len(states) - len(cities)):
+        storage.new(Place(city_id=cities[i % 500].id, user_id=states[0].id,
+                          name="Place {}".format(i), number_rooms=i % 7,
+                          price_by_night=i % 300, latitude=i / 7,
+                          longitude=-i / 11))
+    storage.save()
+    reset()
+    print("{} objects, {:.1f} MiB on disk".format(
+        total, os.path.getsize(path) / 2 ** 20))
+
+    for label, lazy, compact in (("objects", False, False),
+                                 ("json text", True, False),
+                                 ("columns", False, True)):
+        FileStorage._FileStorage__lazy = lazy
+        FileStorage._FileStorage__compact = compact
+        tracemalloc.start()
+        storage.reload()
+        held = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        start = time.perf_counter()
+        for _ in storage.iter(Place):
+            pass
+        walked = time.perf_counter() - start
+        print("{:<10}{:8.0f} bytes per record, iter(Place) {:6.2f} s".format(
+            label, held / total, walked))
+        reset()
+    os.remove(path)
@@ -0,0 +1,47 @@
+#!/usr/bin/python3
+"""Benchmark DBStorage.all() against DBStorage.keys() and count()
+
+all() loads an ORM object per row, keys() builds every key in one
+UNION ALL statement without loading objects. "parallel" is all() with
+HBNB_DB_PARALLEL_ALL=1, querying the classes on several pooled
+connections at once. --latency=<ms> adds that delay to every statement,
+as a link to a remote database would.
+
+Usage (from the repository root, on an empty database):
+    HBNB_TYPE_STORAGE=db HBNB_DB_URL=sqlite:////tmp/hbnb_bench.db \\
+    PYTHONPATH=. ./benchmarks/bench_db_all.py [rows] [--latency=ms]
+"""
+import sys
+import time
+from sqlalchemy import event
+from models import storage
+from benchmarks.db_fixture import populate
+
+
+def timed(label, func):
+    """Prints the time of func() and returns its result"""
+    start = time.perf_counter()
+    result = func()
+    print("{:<10}{:>10.2f} s".format(label, time.perf_counter() - start))
+    return result
+
+
+if __name__ == "__main__":
+    latency = [float(arg.partition('=')[2]) / 1000 for arg in sys.argv[1:]
+               if arg.startswith('--latency=')]
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    total = int(args[0]) if args else 200000
+    counts = timed("populate", lambda: populate(total))
+    print(counts)
+    storage.close()
+    storage.reload()
+    print("{} rows".format(timed("count", storage.count)))
+    print("{} keys".format(len(timed("keys", storage.keys))))
+    if latency:
+        event.listen(storage._DBStorage__engine, "before_cursor_execute",
+                     lambda *args: time.sleep(latency[0]))
+    storage.close()
+    print("{} objects".format(len(timed("all", storage.all))))
+    storage._DBStorage__parallel = True
+    storage.close()
+    print("{} objects".format(len(timed("parallel", storage.all))))
@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+"""Benchmark the cost of saving one updated object in a large store
+
+Compares re-serializing every object, as save() used to, with the
+fragment cache of clean objects in snapshot and journal mode.
+
+Usage (from the repository root):
+    PYTHONPATH=. ./benchmarks/bench_dirty_save.py [number_of_objects]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from models import storage
+from models.engine.file_storage import FileStorage
+from models.place import Place
+
+
+def full_dump(path):
+    """The previous save(): to_dict() and dump every object"""
+    with open(path, 'w') as f:
+        json.dump({k: v.to_dict() for k, v in storage.all().items()}, f)
+
+
+def update_and_save(obj, rounds=5):
+    """Returns the mean time in ms of one update followed by a save"""
+    start = time.perf_counter()
+    for i in range(rounds):
+        obj.name = "Place {}".format(i)
+        storage.save()
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    path = os.path.join(tempfile.mkdtemp(), 'file.json')
+    FileStorage._FileStorage__file_path = path
+    storage.all().clear()
+    for i in range(total):
+        storage.new(Place(name="Place {}".format(i), number_rooms=i % 7))
+    obj = next(iter(storage.all().values()))
+
+    start = time.perf_counter()
+    full_dump(path)
+    print("re-serialize all {} objects: {:10.1f} ms".format(
+        total, (time.perf_counter() - start) * 1000))
+
+    storage.save()  # fills the fragment cache
+    print("update + save, snapshot mode: {:8.1f} ms".format(
+        update_and_save(obj)))
+
+    FileStorage._FileStorage__journal = True
+    FileStorage._FileStorage__journal_limit = total
+    print("update + save, journal mode:  {:8.3f} ms".format(
+        update_and_save(obj)))
+    for name in (path, path + '.journal'):
+        if os.path.exists(name):
+            os.remove(name)
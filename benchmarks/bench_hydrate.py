@@ -0,0 +1,43 @@
+#!/usr/bin/python3
+"""Benchmark building models from the dictionaries reload() reads
+
+Compares cls(**record) followed by mark_clean(), as reload() used to
+build each object, with cls.from_dict(record).
+
+Usage (from the repository root):
+    PYTHONPATH=. ./benchmarks/bench_hydrate.py [number_of_records]
+"""
+import sys
+import time
+from models.place import Place
+from models.state import State
+
+
+def through_init(records):
+    """Builds the models with __init__"""
+    for cls, record in records:
+        cls(**record).mark_clean()
+
+
+def through_from_dict(records):
+    """Builds the models with from_dict()"""
+    for cls, record in records:
+        cls.from_dict(record)
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    records = []
+    for i in range(total):
+        if i % 100:
+            obj = Place(name="Place {}".format(i), number_rooms=3)
+        else:
+            obj = State(name="State {}".format(i))
+        records.append((type(obj), obj.to_dict()))
+    for name, func in (("__init__", through_init),
+                       ("from_dict", through_from_dict)):
+        start = time.perf_counter()
+        func(records)
+        elapsed = time.perf_counter() - start
+        print("{:<10}{:8.2f} s, {:6.2f} us per record".format(
+            name, elapsed, elapsed / total * 1e6))
@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+"""Benchmark the peak memory of exporting Places with all() and iter()
+
+Each export walks every Place and writes its to_dict() as a JSON line
+to /dev/null. With file storage the store is reloaded lazily before
+each export. With a database the rows are generated by db_fixture.
+
+Usage (from the repository root):
+    PYTHONPATH=. ./benchmarks/bench_iter.py [number_of_places]
+    HBNB_TYPE_STORAGE=db HBNB_DB_URL=sqlite:////tmp/hbnb_bench.db \\
+    PYTHONPATH=. ./benchmarks/bench_iter.py [number_of_rows]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from models import storage
+from models.engine.file_storage import FileStorage
+from models.place import Place
+
+
+def export(objs):
+    """Writes the objects as JSON lines to /dev/null"""
+    with open(os.devnull, 'w') as out:
+        for obj in objs:
+            out.write(json.dumps(obj.to_dict(), default=str) + '\n')
+
+
+def reset():
+    """Starts from an unloaded store"""
+    if isinstance(storage, FileStorage):
+        FileStorage._FileStorage__objects.clear()
+        storage.reload()
+    else:
+        storage.close()
+
+
+def measure(label, func):
+    """Prints the time of func(), then its peak memory in a second run"""
+    reset()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    reset()
+    tracemalloc.start()
+    func()
+    size = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print("{:<8}{:8.2f} s {:10.1f} MiB peak".format(label, elapsed,
+                                                    size / 2 ** 20))
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    if isinstance(storage, FileStorage):
+        path = os.path.join(tempfile.mkdtemp(), 'file.json')
+        FileStorage._FileStorage__file_path = path
+        FileStorage._FileStorage__objects.clear()
+        with storage.batch():
+            for i in range(total):
+                Place(name="Place {}".format(i), number_rooms=3).save()
+        FileStorage._FileStorage__lazy = True
+    else:
+        from benchmarks.db_fixture import populate
+        print(populate(total))
+    measure("all", lambda: export(storage.all(Place).values()))
+    measure("iter", lambda: export(storage.iter(Place)))
@@ -0,0 +1,43 @@
+#!/usr/bin/python3
+"""Benchmark bursts of single-object creates, snapshot vs journal mode
+
+Every create is followed by a save, as the console does. In snapshot
+mode each save rewrites the whole file, in journal mode it appends.
+
+Usage (from the repository root):
+    PYTHONPATH=. ./benchmarks/bench_journal.py [creates] [step]
+"""
+import os
+import sys
+import tempfile
+import time
+from models import storage
+from models.engine.file_storage import FileStorage
+from models.state import State
+
+
+def burst(journal, creates, step, path):
+    """Prints creates per second for every step creates"""
+    FileStorage._FileStorage__journal = journal
+    FileStorage._FileStorage__file_path = path
+    storage.all().clear()
+    start = time.perf_counter()
+    for i in range(1, creates + 1):
+        State(name="State{}".format(i)).save()
+        if i % step == 0:
+            now = time.perf_counter()
+            print("{:<10}{:>8}{:>14.0f}".format(
+                "journal" if journal else "snapshot", i, step / (now - start)))
+            start = now
+    for name in (path, path + '.journal'):
+        if os.path.exists(name):
+            os.remove(name)
+
+
+if __name__ == "__main__":
+    creates = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    step = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    path = os.path.join(tempfile.mkdtemp(), 'file.json')
+    print("{:<10}{:>8}{:>14}".format("mode", "objects", "creates/s"))
+    burst(False, creates, step, path)
+    burst(True, creates, step, path)
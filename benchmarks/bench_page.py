@@ -0,0 +1,49 @@
+#!/usr/bin/python3
+"""Benchmark keyset pages against OFFSET pages, first and deep
+
+page() starts after an id, query(offset=...) skips the rows before the
+page. Both read 100 Places ordered by id.
+
+Usage (from the repository root):
+    PYTHONPATH=. ./benchmarks/bench_page.py [number_of_places]
+    HBNB_TYPE_STORAGE=db HBNB_DB_URL=sqlite:////tmp/hbnb_bench.db \\
+    PYTHONPATH=. ./benchmarks/bench_page.py [number_of_rows]
+"""
+import os
+import sys
+import tempfile
+import time
+from models import storage
+from models.engine.file_storage import FileStorage
+from models.place import Place
+
+
+def timed(func, repeat=20):
+    """Returns the mean time of func() in milliseconds"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    if isinstance(storage, FileStorage):
+        path = os.path.join(tempfile.mkdtemp(), 'file.json')
+        FileStorage._FileStorage__file_path = path
+        FileStorage._FileStorage__objects.clear()
+        with storage.batch():
+            for i in range(total):
+                Place(name="Place {}".format(i)).save()
+    else:
+        from benchmarks.db_fixture import populate
+        print(populate(total))
+    ids = sorted(key.partition('.')[2] for key in storage.keys(Place))
+    storage.page(Place, 1)
+    for label, offset in (("first", 0), ("deep", len(ids) * 9 // 10)):
+        after = ids[offset - 1] if offset else None
+        keyset = timed(lambda: storage.page(Place, 100, after))
+        skip = timed(lambda: storage.query(Place, order_by='id', limit=100,
+                                           offset=offset))
+        print("{:<6} page {:8.2f} ms, offset {:8.2f} ms".format(
+            label, keyset, skip))
@@ -0,0 +1,85 @@
+#!/usr/bin/python3
+"""Benchmark eager and lazy reload() of a large file.json
+
+Reports the reload time and the time of the first all(State), as well
+as the peak memory of parsing the file with json.load() against the
+incremental reader.
+
+Usage (from the repository root):
+    PYTHONPATH=. ./benchmarks/bench_reload.py [number_of_objects]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from models import storage
+from models.engine.file_storage import FileStorage
+from models.engine.json_stream import iter_items
+from models.place import Place
+from models.state import State
+
+
+def peak(func):
+    """Returns the peak memory allocated by func() in MiB"""
+    tracemalloc.start()
+    func()
+    size = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return size / 2 ** 20
+
+
+def parse_whole(path):
+    """Parses the file in one go, as reload() used to"""
+    with open(path) as f:
+        json.load(f)
+
+
+def parse_stream(path):
+    """Parses the file member by member"""
+    with open(path) as f:
+        for _ in iter_items(f):
+            pass
+
+
+def reset():
+    """Empties storage, loaded objects and unloaded records alike"""
+    FileStorage._FileStorage__objects.clear()
+    FileStorage._FileStorage__by_class.clear()
+    FileStorage._FileStorage__indexed = 0
+    FileStorage._FileStorage__unloaded.clear()
+    FileStorage._FileStorage__fragments.clear()
+    FileStorage._FileStorage__records.clear()
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    path = os.path.join(tempfile.mkdtemp(), 'file.json')
+    FileStorage._FileStorage__file_path = path
+    reset()
+    for i in range(total):
+        if i % 100:
+            storage.new(Place(name="Place {}".format(i), number_rooms=3))
+        else:
+            storage.new(State(name="State {}".format(i)))
+    storage.save()
+    print("{} objects, {:.1f} MiB on disk".format(
+        total, os.path.getsize(path) / 2 ** 20))
+    print("parse peak, json.load: {:8.1f} MiB".format(
+        peak(lambda: parse_whole(path))))
+    print("parse peak, streaming: {:8.1f} MiB".format(
+        peak(lambda: parse_stream(path))))
+
+    for lazy in (False, True):
+        FileStorage._FileStorage__lazy = lazy
+        reset()
+        start = time.perf_counter()
+        storage.reload()
+        loaded = time.perf_counter() - start
+        start = time.perf_counter()
+        storage.all(State)
+        first = time.perf_counter() - start
+        print("{:<6} reload {:8.2f} s, first all(State) {:8.3f} s".format(
+            "lazy" if lazy else "eager", loaded, first))
+    os.remove(path)
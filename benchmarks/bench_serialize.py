@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+"""Benchmark to_dict() and str() of many models
+
+Times the way to_dict() and str() used to build their output, then the
+current methods. to_dict() is timed on a first call and on a repeated
+call, which is answered from the memoized dictionary.
+
+Usage (from the repository root):
+    PYTHONPATH=. ./benchmarks/bench_serialize.py [number_of_objects]
+"""
+import sys
+import time
+from models.place import Place
+from models.state import State
+
+
+def old_to_dict(obj):
+    """Builds the dictionary of obj as to_dict() used to"""
+    dictionary = {}
+    dictionary.update(obj.__dict__)
+    dictionary.update({'__class__':
+                      (str(type(obj)).split('.')[-1]).split('\'')[0]})
+    dictionary['created_at'] = obj.created_at.isoformat()
+    dictionary['updated_at'] = obj.updated_at.isoformat()
+    if '_sa_instance_state' in dictionary:
+        del dictionary['_sa_instance_state']
+    return dictionary
+
+
+def old_str(obj):
+    """Builds the text of obj as str() used to"""
+    cls = (str(type(obj)).split('.')[-1]).split('\'')[0]
+    return '[{}] ({}) {}'.format(cls, obj.id, obj.__dict__)
+
+
+def timed(label, func, objs):
+    """Prints the time func takes over objs"""
+    start = time.perf_counter()
+    for obj in objs:
+        func(obj)
+    elapsed = time.perf_counter() - start
+    print("{:<20}{:8.2f} s, {:6.2f} us per object".format(
+        label, elapsed, elapsed / len(objs) * 1e6))
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    objs = [Place(name="Place {}".format(i), number_rooms=3) if i % 100
+            else State(name="State {}".format(i)) for i in range(total)]
+    timed("to_dict, before", old_to_dict, objs)
+    timed("to_dict, first", Place.to_dict, objs)
+    timed("to_dict, repeated", Place.to_dict, objs)
+    timed("str, before", old_str, objs)
+    timed("str", str, objs)
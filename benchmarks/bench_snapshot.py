@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+"""Compare the size and reload() time of JSON and binary snapshots
+
+Writes the same store as a JSON snapshot and as a binary one
+(HBNB_FILE_FORMAT=binary), then times reload() of each, building every
+object, keeping JSON text (HBNB_FILE_LAZY=1) and keeping columns
+(HBNB_FILE_COMPACT=1).
+
+Usage (from the repository root):
+    PYTHONPATH=. ./benchmarks/bench_snapshot.py [number_of_objects]
+"""
+import os
+import sys
+import tempfile
+import time
+from bench_compact import reset
+from models import storage
+from models.engine.file_storage import FileStorage
+from models.engine.snapshot import convert
+from models.city import City
+from models.place import Place
+from models.state import State
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    folder = tempfile.mkdtemp()
+    paths = {fmt: os.path.join(folder, fmt) for fmt in ('json', 'binary')}
+    FileStorage._FileStorage__file_path = paths['json']
+    FileStorage._FileStorage__binary = False
+    reset()
+    states = [State(name="State {}".format(i)) for i in range(50)]
+    cities = [City(name="City {}".format(i), state_id=states[i % 50].id)
+              for i in range(500)]
+    for obj in states + cities:
+        storage.new(obj)
+    for i in range(total - len(states) - len(cities)):
+        storage.new(Place(city_id=cities[i % 500].id, user_id=states[0].id,
+                          name="Place {}".format(i), number_rooms=i % 7,
+                          price_by_night=i % 300, latitude=i / 7,
+                          longitude=-i / 11))
+    storage.save()
+    reset()
+    convert(paths['json'], paths['binary'], 'binary')
+
+    for fmt, path in paths.items():
+        FileStorage._FileStorage__file_path = path
+        print("{:<7}{:5.1f} MiB".format(fmt, os.path.getsize(path) / 2 ** 20),
+              end='')
+        for label, lazy, compact in (("objects", False, False),
+                                     ("lazy", True, False),
+                                     ("compact", False, True)):
+            FileStorage._FileStorage__lazy = lazy
+            FileStorage._FileStorage__compact = compact
+            start = time.perf_counter()
+            storage.reload()
+            print(", {} {:5.2f} s".format(
+                label, time.perf_counter() - start), end='')
+            reset()
+        print()
+        os.remove(path)
+    os.rmdir(folder)
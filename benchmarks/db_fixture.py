@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+"""Fills the database of HBNB_DB_URL with generated rows for benchmarks
+
+The rows are inserted with executemany, bypassing the ORM, and spread
+over the six tables with valid foreign keys.
+"""
+import uuid
+from datetime import datetime
+from os import getenv
+from sqlalchemy import create_engine, insert
+from models.base_model import Base
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+
+
+def rows(count, **columns):
+    """Returns count rows with fresh ids, timestamps and columns
+
+    Column values may be callables, called with the row number.
+    """
+    now = datetime.now()
+    return [dict({'id': str(uuid.uuid4()), 'created_at': now,
+                  'updated_at': now},
+                 **{name: value(i) if callable(value) else value
+                    for name, value in columns.items()})
+            for i in range(count)]
+
+
+def populate(total, chunk=50000):
+    """Inserts about total rows in the database of HBNB_DB_URL
+
+    Returns:
+        dict: The number of rows inserted in each table by class name.
+    """
+    engine = create_engine(getenv("HBNB_DB_URL"))
+    Base.metadata.create_all(engine)
+    states = rows(max(total // 100, 1), name=lambda i: "State {}".format(i))
+    cities = rows(max(total // 20, 1), name=lambda i: "City {}".format(i),
+                  state_id=lambda i: states[i % len(states)]['id'])
+    users = rows(max(total // 10, 1), email="bench@hbnb.io",
+                 password="pwd")
+    amenities = rows(max(total // 1000, 1),
+                     name=lambda i: "Amenity {}".format(i))
+    places = rows(max(total * 3 // 10, 1),
+                  name=lambda i: "Place {}".format(i),
+                  city_id=lambda i: cities[i % len(cities)]['id'],
+                  user_id=lambda i: users[i % len(users)]['id'],
+                  price_by_night=lambda i: i % 500, number_rooms=2,
+                  number_bathrooms=1, max_guest=4)
+    reviews = rows(max(total - len(states) - len(cities) - len(users) -
+                       len(amenities) - len(places), 1),
+                   text="Great stay",
+                   place_id=lambda i: places[i % len(places)]['id'],
+                   user_id=lambda i: users[i % len(users)]['id'])
+    counts = {}
+    with engine.begin() as conn:
+        for cls, data in ((State, states), (City, cities), (User, users),
+                          (Amenity, amenities), (Place, places),
+                          (Review, reviews)):
+            for start in range(0, len(data), chunk):
+                conn.execute(insert(cls.__table__),
+                             data[start:start + chunk])
+            counts[cls.__name__] = len(data)
+    engine.dispose()
+    return counts
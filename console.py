@@ -4,7 +4,7 @@ import cmd
 import sys
 import re
 from models.base_model import BaseModel
-from models.__init__ import storage
+from models import storage
 from models.user import User
 from models.place import Place
 from models.state import State
@@ -169,11 +169,11 @@ class HBNBCommand(cmd.Cmd):
             print("** instance id missing **")
             return
 
-        key = c_name + "." + c_id
-        try:
-            print(storage._FileStorage__objects[key])
-        except KeyError:
+        obj = storage.get(HBNBCommand.classes[c_name], c_id)
+        if obj is None:
             print("** no instance found **")
+            return
+        print(obj)
 
     def help_show(self):
         """ Help information for the show command """
@@ -200,13 +200,12 @@ class HBNBCommand(cmd.Cmd):
             print("** instance id missing **")
             return
 
-        key = c_name + "." + c_id
-
-        try:
-            del (storage.all()[key])
-            storage.save()
-        except KeyError:
+        obj = storage.get(HBNBCommand.classes[c_name], c_id)
+        if obj is None:
             print("** no instance found **")
+            return
+        storage.delete(obj)
+        storage.save()
 
     def help_destroy(self):
         """ Help information for the destroy command """
@@ -215,35 +214,54 @@ class HBNBCommand(cmd.Cmd):
 
     def do_all(self, args):
         """ Shows all objects, or all objects of a class"""
-        print_list = []
-
-        obj_dict = storage.all()
-        if args:
-            args = args.split(' ')[0]  # remove possible trailing args
-            if args not in HBNBCommand.classes:
+        cls = None
+        c_name = None
+        options = {}
+        words = iter(args.split())
+        for word in words:
+            if word in ('--limit', '--after'):
+                options[word[2:]] = next(words, '')
+            elif c_name is None:
+                c_name = word  # ignore possible trailing args
+        if c_name:
+            if c_name not in HBNBCommand.classes:
                 print("** class doesn't exist **")
                 return
-            for k, v in obj_dict.items():
-                if k.split('.')[0] == args:
-                    print_list.append(str(v))
+            cls = HBNBCommand.classes[c_name]
+
+        if options:
+            if cls is None:
+                print("** class name missing **")
+                return
+            limit = options.get('limit')
+            if limit is not None and not limit.isdigit():
+                print("** invalid limit **")
+                return
+            objs = storage.page(cls, limit and int(limit),
+                                options.get('after') or None)
         else:
-            for k, v in obj_dict.items():
-                print_list.append(str(v))
+            objs = storage.iter(cls)
 
-        print(print_list)
+        # prints the list of str(obj) as print(list) would, one at a time
+        sep = '['
+        for obj in objs:
+            print(sep + repr(str(obj)), end='')
+            sep = ', '
+        print('[]' if sep == '[' else ']')
 
     def help_all(self):
         """ Help information for the all command """
         print("Shows all objects, or all of a class")
-        print("[Usage]: all <className>\n")
+        print("[Usage]: all <className> [--limit <n>] [--after <id>]")
+        print("With --limit or --after, lists at most <n> objects in id")
+        print("order, starting after the one with id <id>\n")
 
     def do_count(self, args):
         """Count current number of class instances"""
-        count = 0
-        for k, v in storage._FileStorage__objects.items():
-            if args == k.split('.')[0]:
-                count += 1
-        print(count)
+        if args not in HBNBCommand.classes:
+            print(0)
+            return
+        print(storage.count(HBNBCommand.classes[args]))
 
     def help_count(self):
         """ """
@@ -272,11 +290,9 @@ class HBNBCommand(cmd.Cmd):
             print("** instance id missing **")
             return
 
-        # generate key from class and id
-        key = c_name + "." + c_id
-
-        # determine if key is present
-        if key not in storage.all():
+        # determine if the instance is present
+        new_dict = storage.get(HBNBCommand.classes[c_name], c_id)
+        if new_dict is None:
             print("** no instance found **")
             return
 
@@ -309,9 +325,6 @@ class HBNBCommand(cmd.Cmd):
 
             args = [att_name, att_val]
 
-        # retrieve dictionary of current objects
-        new_dict = storage.all()[key]
-
         # iterate through attr names and values
         for i, att_name in enumerate(args):
             # block only runs on even iterations
@@ -330,6 +343,7 @@ class HBNBCommand(cmd.Cmd):
                 # update dictionary with name, value pair
                 new_dict.__dict__.update({att_name: att_val})
 
+        new_dict.mark_dirty()
         new_dict.save()  # save updates to file
 
     def help_update(self):
@@ -0,0 +1,34 @@
+#!/usr/bin/python3
+"""Converts a FileStorage snapshot between the JSON and binary formats
+
+Usage: ./convert_snapshot.py <source> <target> json|binary
+
+The models package is not imported as a whole, as that would reload the
+storage: only models.engine.snapshot and the modules it needs are loaded.
+"""
+import os
+import sys
+import types
+from importlib import import_module
+
+
+def load_snapshot():
+    """Returns models.engine.snapshot without running models/__init__.py"""
+    root = os.path.dirname(os.path.abspath(__file__))
+    for name in ('models', 'models.engine'):
+        if name not in sys.modules:
+            package = types.ModuleType(name)
+            package.__path__ = [os.path.join(root, *name.split('.'))]
+            sys.modules[name] = package
+    return import_module('models.engine.snapshot')
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4:
+        print("Usage: {} <source> <target> json|binary".format(sys.argv[0]))
+        sys.exit(1)
+    try:
+        print(load_snapshot().convert(*sys.argv[1:]))
+    except (OSError, ValueError) as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
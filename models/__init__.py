@@ -3,6 +3,7 @@
 
 from models.engine.file_storage import FileStorage
 from models.engine.db_storage import DBStorage
+from models.engine.sqlite_storage import SQLiteStorage
 from models.base_model import BaseModel
 from models.amenity import Amenity
 from models.state import State
@@ -15,6 +16,8 @@ from os import getenv
 
 if getenv("HBNB_TYPE_STORAGE") == "db":
     storage = DBStorage()
+elif getenv("HBNB_TYPE_STORAGE") == "sqlite":
+    storage = SQLiteStorage()
 else:
     storage = FileStorage()
 storage.reload()
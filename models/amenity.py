@@ -9,9 +9,17 @@ from os import getenv
 class Amenity(BaseModel, Base):
     """ Class Amenity """
     __tablename__ = 'amenities'
-    if getenv("HBNB_TYPE_STORAGE") == "db":
-        name = Column(String(128), nullable=False)
+    if getenv("HBNB_TYPE_STORAGE") in ("db", "sqlite"):
+        name = Column(String(128), nullable=False, index=True)
         place_amenities = relationship("Place", secondary="place_amenity",
                                        back_populates="amenities")
     else:
         name = ""
+
+        @property
+        def place_amenities(self):
+            from models import storage
+            from models.place import Place
+
+            return [storage.get(Place, place_id)
+                    for place_id in storage.places_with(self.id)]
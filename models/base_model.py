@@ -1,19 +1,125 @@
 #!/usr/bin/python3
 """This module defines a base class for all models in our hbnb clone"""
 import uuid
+import weakref
 from datetime import datetime
+from os import getenv
 from sqlalchemy import Column, Integer, String, DateTime
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import configure_mappers
+from sqlalchemy.orm.instrumentation import opt_manager_of_class
 
 Base = declarative_base()
 
+# instances changed since storage last serialized them
+_dirty = weakref.WeakSet()
+# instances whose foreign keys (*_id and *_ids attributes) changed since
+# storage last indexed them
+_relinked = weakref.WeakSet()
+# the to_dict() of instances until their next change; kept in file mode
+# only, where nothing but attribute assignment, mark_dirty() and the
+# tracked lists and dicts below change an instance, unlike the objects a
+# SQLAlchemy session loads and expires, and only for instances without
+# lists or dicts, whose copies share them
+_dicts = weakref.WeakKeyDictionary()
+_memoize = getenv("HBNB_TYPE_STORAGE") not in ("db", "sqlite")
+
+
+def _changed(obj, name):
+    """Marks obj changed after its attribute name was set or mutated"""
+    _dirty.add(obj)
+    _dicts.pop(obj, None)
+    if name.endswith(('_id', '_ids')):
+        _relinked.add(obj)
+
+
+class _Tracked:
+    """Mixin of the lists and dicts of file mode instances, which mark
+    their instance changed when they change in place
+
+    Attributes:
+        mutators (tuple): The names of the methods that change the value.
+    """
+    __slots__ = ()
+    mutators = ()
+
+    def __init__(self, obj, name, value):
+        """Copies value for the attribute name of obj"""
+        super().__init__(value)
+        self._owner = weakref.ref(obj)
+        self._name = name
+
+    def __init_subclass__(cls, **kwargs):
+        """Makes each mutator mark the instance changed"""
+        super().__init_subclass__(**kwargs)
+        for name in cls.mutators:
+            setattr(cls, name, cls.__tracking(getattr(cls, name)))
+
+    @staticmethod
+    def __tracking(method):
+        """Returns method, marking the instance changed after each call"""
+        def tracked(self, *args, **kwargs):
+            result = method(self, *args, **kwargs)
+            obj = self._owner()
+            if obj is not None:
+                _changed(obj, self._name)
+            return result
+        tracked.__name__ = method.__name__
+        tracked.__doc__ = method.__doc__
+        return tracked
+
+
+class _TrackedList(_Tracked, list):
+    """A list attribute of a file mode instance"""
+    __slots__ = ('_owner', '_name')
+    mutators = ('__setitem__', '__delitem__', '__iadd__', '__imul__',
+                'append', 'extend', 'insert', 'pop', 'remove', 'clear',
+                'sort', 'reverse')
+
+
+class _TrackedDict(_Tracked, dict):
+    """A dict attribute of a file mode instance"""
+    __slots__ = ('_owner', '_name')
+    mutators = ('__setitem__', '__delitem__', '__ior__', 'pop', 'popitem',
+                'clear', 'update', 'setdefault')
+
+
+def _tracked(obj, name, value):
+    """Returns value as the attribute name of obj, tracking its changes
+
+    Plain lists and dicts are copied into tracked ones, as is the tracked
+    value of another attribute, which marks only its own instance changed.
+    Other values, and every value outside file mode, are returned as is.
+    """
+    if not _memoize:
+        return value
+    if type(value) is list:
+        return _TrackedList(obj, name, value)
+    if type(value) is dict:
+        return _TrackedDict(obj, name, value)
+    if isinstance(value, _Tracked) and (
+            value._owner() is not obj or value._name != name):
+        return type(value)(obj, name, value)
+    return value
+
 
 class BaseModel:
-    """A base class for all hbnb models"""
+    """A base class for all hbnb models
+
+    Attributes:
+        class_name (str): The name of the class, as to_dict() and str()
+                          print it, set once per subclass.
+    """
+    class_name = 'BaseModel'
     id = Column(String(60), primary_key=True, nullable=False)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow())
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow())
 
+    def __init_subclass__(cls, **kwargs):
+        """Records the name of a new model class"""
+        super().__init_subclass__(**kwargs)
+        cls.class_name = cls.__name__
+
     def __init__(self, *args, **kwargs):
         """Instatntiates a new model"""
         from models import storage
@@ -22,42 +128,133 @@ class BaseModel:
         self.updated_at = datetime.now()
         if kwargs:
             if 'updated_at' in kwargs:
-                kwargs['updated_at'] = datetime.strptime(
-                                       kwargs['updated_at'],
-                                       '%Y-%m-%dT%H:%M:%S.%f')
+                kwargs['updated_at'] = datetime.fromisoformat(
+                                       kwargs['updated_at'])
             if 'created_at' in kwargs:
-                kwargs['created_at'] = datetime.strptime(
-                                       kwargs['created_at'],
-                                       '%Y-%m-%dT%H:%M:%S.%f')
+                kwargs['created_at'] = datetime.fromisoformat(
+                                       kwargs['created_at'])
             if '__class__' in kwargs:
                 del kwargs['__class__']
             self.__dict__.update(kwargs)
+            self.__track()
+
+    @classmethod
+    def from_dict(cls, dictionary):
+        """Builds an instance from a dictionary of to_dict()
+
+        Unlike cls(**dictionary), __init__ is skipped: no id or
+        timestamps are made up only to be overwritten, storage is not
+        imported and the timestamps are parsed with fromisoformat. The
+        values are set directly, so the instance is not marked changed.
+        Mapped classes get their SQLAlchemy state from the class manager.
+        """
+        manager = opt_manager_of_class(cls)
+        if manager is None:
+            obj = object.__new__(cls)
+        else:
+            if not manager.mapper.configured:
+                configure_mappers()
+            obj = manager.new_instance()
+            # the state is set through __setattr__
+            _dirty.discard(obj)
+        attrs = obj.__dict__
+        attrs.update(dictionary)
+        attrs.pop('__class__', None)
+        if 'id' not in attrs:
+            attrs['id'] = str(uuid.uuid4())
+        for name in ('created_at', 'updated_at'):
+            value = attrs.get(name)
+            if isinstance(value, str):
+                attrs[name] = datetime.fromisoformat(value)
+            elif value is None:
+                attrs[name] = datetime.now()
+        obj.__track()
+        return obj
+
+    def __setattr__(self, name, value):
+        """Sets an attribute and marks the instance as changed"""
+        super().__setattr__(name, _tracked(self, name, value))
+        _changed(self, name)
+
+    def __track(self):
+        """Makes the lists and dicts of the instance track their changes"""
+        if _memoize:
+            attrs = self.__dict__
+            for name, value in attrs.items():
+                if isinstance(value, (list, dict)):
+                    attrs[name] = _tracked(self, name, value)
 
     def __str__(self):
         """Returns a string representation of the instance"""
-        cls = (str(type(self)).split('.')[-1]).split('\'')[0]
-        return '[{}] ({}) {}'.format(cls, self.id, self.__dict__)
+        return '[{}] ({}) {}'.format(type(self).class_name, self.id,
+                                     self.__dict__)
 
     def save(self):
         """Updates updated_at with current time when instance is changed"""
         from models import storage
         self.updated_at = datetime.now()
+        self.mark_dirty()
         storage.new(self)
         storage.save()
 
-    def to_dict(self):
-        """Convert instance into dict format"""
-        dictionary = {}
-        dictionary.update(self.__dict__)
-        dictionary.update({'__class__':
-                          (str(type(self)).split('.')[-1]).split('\'')[0]})
+    def to_dict(self, memoize=True):
+        """Convert instance into dict format
+
+        The dictionary of an instance without list or dict attributes is
+        built once per change of the instance, and a copy of it returned
+        each time.
+
+        Args:
+            memoize (bool): Keep the dictionary for the next call. Storage
+                            passes False, as it caches the JSON text.
+        """
+        memo = _dicts.get(self)
+        if memo is not None:
+            return dict(memo)
+        dictionary = dict(self.__dict__)
+        dictionary.pop('_sa_instance_state', None)
+        dictionary['__class__'] = type(self).class_name
         dictionary['created_at'] = self.created_at.isoformat()
         dictionary['updated_at'] = self.updated_at.isoformat()
-        if '_sa_instance_state' in dictionary:
-            del dictionary['_sa_instance_state']
+        if _memoize and memoize and not any(
+                type(value) in (list, dict) for value in dictionary.values()):
+            _dicts[self] = dict(dictionary)
         return dictionary
 
+    def __forget(self):
+        """Drops the memoized output of the instance"""
+        _dicts.pop(self, None)
+
     def delete(self):
         """Delete the current instance from the storage"""
         from models import storage
         storage.delete(self)
+
+    @property
+    def is_dirty(self):
+        """True if the instance changed since storage last serialized it"""
+        return self in _dirty
+
+    def mark_dirty(self):
+        """Flags a change made without attribute assignment"""
+        _dirty.add(self)
+        self.__forget()
+
+    def mark_clean(self):
+        """Flags the instance as matching its serialized form"""
+        _dirty.discard(self)
+
+    @staticmethod
+    def collect_dirty(clear=True):
+        """Returns every changed instance and, by default, marks them clean"""
+        changed = list(_dirty)
+        if clear:
+            _dirty.clear()
+        return changed
+
+    @staticmethod
+    def collect_relinked():
+        """Returns the instances whose foreign keys changed and forgets them"""
+        changed = list(_relinked)
+        _relinked.clear()
+        return changed
@@ -21,10 +21,17 @@ class City(BaseModel, Base):
 
     """
     __tablename__ = "cities"
-    if getenv("HBNB_TYPE_STORAGE") == "db":
+    if getenv("HBNB_TYPE_STORAGE") in ("db", "sqlite"):
         name = Column(String(128), nullable=False)
-        state_id = Column(String(60), ForeignKey('states.id'), nullable=False)
+        state_id = Column(String(60), ForeignKey('states.id'), nullable=False,
+                          index=True)
         places = relationship('Place', cascade='all, delete', backref='cities')
     else:
         name = ""
         state_id = ""
+
+        @property
+        def places(self):
+            from models import storage
+            from models.place import Place
+            return list(storage.lookup(Place, 'city_id', self.id).values())
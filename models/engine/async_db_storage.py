@@ -0,0 +1,273 @@
+#!/usr/bin/python3
+"""
+This module defines the AsyncDBStorage class which manages persistent
+storage for the hbnb clone from asyncio code, e.g. an ASGI application.
+
+It maps the same models as DBStorage, so HBNB_TYPE_STORAGE must be db or
+sqlite for the models to have their columns. The application creates
+its own instance next to models.storage, which stays synchronous:
+
+    storage = AsyncDBStorage()
+    await storage.reload()
+
+    async def handler(request):
+        async with storage.request():
+            states = await storage.all(State, load=['cities'])
+
+Relationships cannot be loaded lazily from asyncio code, so pass the
+ones a request reads to load=, as with DBStorage.all().
+"""
+from asyncio import current_task
+from contextlib import asynccontextmanager
+from os import getenv
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_scoped_session
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from models.base_model import Base
+from models.engine.db_storage import load_options, select_query
+from models.engine.migrations import migrate
+from models.engine.query import Query
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+
+
+def async_url(url):
+    """
+    Return a database URL with an asyncio driver.
+
+    URLs naming no driver, or a blocking one, get the asyncio driver of
+    their backend: aiosqlite for SQLite, aiomysql for MySQL and asyncpg
+    for PostgreSQL. Other URLs are returned as they are.
+
+    Args:
+        url (str): The database URL, e.g. mysql+mysqldb://...
+
+    Return:
+        str: The URL, e.g. mysql+aiomysql://...
+    """
+    url = make_url(url)
+    driver = AsyncDBStorage.drivers.get(url.get_backend_name())
+    if driver is None or url.get_driver_name() in \
+            AsyncDBStorage.drivers.values():
+        return url.render_as_string(hide_password=False)
+    return url.set(drivername=url.get_backend_name() + '+' + driver) \
+        .render_as_string(hide_password=False)
+
+
+class AsyncDBStorage:
+    """
+    This class manages SQL database storage for hbnb clone from asyncio
+    code. Its methods that talk to the database are coroutines.
+
+    Each asyncio task, i.e. each request an ASGI server handles, works
+    in its own session, created on first use and closed by close() or
+    at the end of a request() block.
+
+    Attributes:
+        drivers (dict): The asyncio driver of each backend.
+        __engine (sqlalchemy.ext.asyncio.AsyncEngine): The engine.
+        __session (sqlalchemy.ext.asyncio.async_scoped_session): The
+            session registry, by task.
+        __classes (tuple): The mapped classes, in the order all() loads them.
+            Any other class, such as BaseModel, has no rows: all(), get(),
+            count() and query() find nothing of it, as with DBStorage.
+    """
+    drivers = {
+        'sqlite': 'aiosqlite',
+        'mysql': 'aiomysql',
+        'postgresql': 'asyncpg',
+    }
+    __engine = None
+    __session = None
+    __classes = (State, City, User, Place, Review, Amenity)
+
+    def __init__(self, url=None):
+        """
+        Initialize AsyncDBStorage instance and create the engine.
+
+        The database is the one DBStorage uses, HBNB_DB_URL or the MySQL
+        URL built from the HBNB_MYSQL_* variables, or the SQLite file of
+        HBNB_SQLITE_PATH when HBNB_TYPE_STORAGE is sqlite, reached through
+        the asyncio driver of its backend. The pool is sized by the
+        HBNB_DB_POOL_* variables, as for DBStorage.
+
+        Args:
+            url (str, optional): The database URL. Defaults to the URL
+                above.
+        """
+        if url is None and getenv("HBNB_DB_URL") is None and \
+                getenv("HBNB_TYPE_STORAGE") == "sqlite":
+            url = 'sqlite:///' + getenv("HBNB_SQLITE_PATH", "hbnb.db")
+        url = url or getenv("HBNB_DB_URL") or \
+            'mysql://{}:{}@{}/{}'.format(
+                getenv("HBNB_MYSQL_USER"), getenv("HBNB_MYSQL_PWD"),
+                getenv("HBNB_MYSQL_HOST"), getenv("HBNB_MYSQL_DB"))
+        url = async_url(url)
+        pool = {}
+        if make_url(url).get_backend_name() != 'sqlite':
+            pool = {
+                'pool_size': int(getenv("HBNB_DB_POOL_SIZE", "5")),
+                'max_overflow': int(getenv("HBNB_DB_MAX_OVERFLOW", "10")),
+                'pool_timeout': float(getenv("HBNB_DB_POOL_TIMEOUT", "30")),
+                'pool_recycle': int(getenv("HBNB_DB_POOL_RECYCLE", "3600")),
+            }
+        self.__engine = create_async_engine(url, pool_pre_ping=True, **pool)
+
+    async def all(self, cls=None, load=None):
+        """
+        Return a dictionary of all objects of a given class, if specified,
+        or all objects in the database if no class is specified.
+
+        Args:
+            cls (class, optional): The class of the objects to return.
+            load (list, optional): Relationships to load with the objects,
+                as for DBStorage.all(). Ignored when no class is given.
+
+        Return:
+            dict: The objects, by "<class name>.<id>" key.
+        """
+        dic = {}
+        if self.__unmapped(cls):
+            return dic
+        for clas in [cls] if cls else self.__classes:
+            stmt = select(clas)
+            if load and cls:
+                stmt = stmt.options(*load_options(clas, load))
+            prefix = clas.__name__ + '.'
+            dic.update({prefix + obj.id: obj
+                        for obj in await self.__session.scalars(stmt)})
+        return dic
+
+    async def get(self, cls, id):
+        """
+        Return one object of a class by primary key.
+
+        Objects already in the session are returned without a query.
+
+        Args:
+            cls (class): The class of the object.
+            id (str): The id of the object.
+
+        Return:
+            BaseModel: The object, or None if it does not exist.
+        """
+        if self.__unmapped(cls):
+            return None
+        return await self.__session.get(cls, id)
+
+    async def count(self, cls=None):
+        """
+        Return the number of rows of a class, or of all classes, counted
+        by the database in a single statement.
+
+        Args:
+            cls (class, optional): The class of the objects to count.
+
+        Return:
+            int: The number of rows.
+        """
+        if self.__unmapped(cls):
+            return 0
+        counts = [select(func.count()).select_from(clas).scalar_subquery()
+                  for clas in ([cls] if cls else self.__classes)]
+        return sum((await self.__session.execute(select(*counts))).one())
+
+    async def query(self, cls, order_by=None, limit=None, offset=None,
+                    load=None, **filters):
+        """
+        Return the objects of a class that pass filters, in order, with
+        the single SELECT DBStorage.query() sends for the same arguments.
+
+        Return:
+            list: The matching objects.
+        """
+        query = Query(cls, order_by, limit, offset, **filters)
+        if self.__unmapped(cls):
+            return []
+        return list(await self.__session.scalars(select_query(query, load)))
+
+    async def page(self, cls, limit=None, after=None):
+        """
+        Return the objects of a class in id order, starting after an id,
+        as DBStorage.page() does.
+
+        Return:
+            list: The objects, ordered by id.
+        """
+        filters = {} if after is None else {'id__gt': after}
+        return await self.query(cls, order_by='id', limit=limit, **filters)
+
+    def new(self, obj):
+        """
+        Add an object to the session of the current task. Adding does not
+        talk to the database, so this is not a coroutine.
+
+        Args:
+            obj (BaseModel): The object to add.
+        """
+        self.__session.add(obj)
+
+    async def save(self):
+        """
+        Commit all changes of the session of the current task.
+        """
+        await self.__session.commit()
+
+    async def delete(self, obj=None):
+        """
+        Delete an object from the session of the current task.
+
+        Args:
+            obj (BaseModel, optional): The object to delete.
+        """
+        if obj:
+            await self.__session.delete(obj)
+
+    async def reload(self):
+        """
+        Create the missing tables and indexes, then the session registry.
+        """
+        async with self.__engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(migrate)
+        if self.__session is not None:
+            await self.__session.remove()
+        factory = async_sessionmaker(self.__engine, expire_on_commit=False)
+        self.__session = async_scoped_session(factory, scopefunc=current_task)
+
+    async def close(self):
+        """
+        Close the session of the current task and return its connection
+        to the pool. The next call in this task starts a new session.
+        """
+        await self.__session.remove()
+
+    @asynccontextmanager
+    async def request(self):
+        """
+        Close the session of the current task when the block exits, the
+        session-per-request pattern of an ASGI handler or middleware.
+        Changes not saved inside the block are rolled back.
+        """
+        try:
+            yield self
+        finally:
+            await self.close()
+
+    async def dispose(self):
+        """
+        Close every pooled connection, e.g. on application shutdown.
+        """
+        await self.__engine.dispose()
+
+    def __unmapped(self, cls):
+        """
+        Tell whether cls is a class other than the mapped ones, which no
+        table holds the rows of.
+        """
+        return cls is not None and cls not in self.__classes
@@ -0,0 +1,143 @@
+#!/usr/bin/python3
+"""This module defines the query result cache of DBStorage"""
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+
+
+class QueryCache:
+    """A least recently used cache of query results, by class
+
+    Each entry holds the list of objects a query returned, and the names
+    of the classes it depends on. invalidate() drops every entry of a
+    class. Entries also expire ttl seconds after they were stored, and the
+    least recently used ones are evicted once the entries hold more than
+    maxsize objects in total. A result larger than maxsize is not stored.
+
+    invalidate() also counts the invalidations of each class. A caller
+    reads generation() before running a query and passes it to put(),
+    which then drops the result if one of its classes was invalidated
+    meanwhile, as it may predate the change.
+
+    Attributes:
+        maxsize (int): The number of objects the entries may hold.
+        ttl (float): The lifetime of an entry in seconds.
+        hits (int): The lookups answered from the cache.
+        misses (int): The lookups that were not, expired entries included.
+        evictions (int): The entries dropped to make room.
+        invalidations (int): The entries dropped by invalidate().
+    """
+
+    def __init__(self, maxsize=10000, ttl=60.0):
+        """Creates an empty cache"""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.__entries = OrderedDict()
+        self.__by_name = {}
+        self.__generations = {}
+        self.__size = 0
+        self.__lock = Lock()
+
+    def __contains__(self, key):
+        """Tells whether key has an entry that has not expired, without
+        counting a hit or a miss"""
+        with self.__lock:
+            entry = self.__entries.get(key)
+            return entry is not None and entry[0] > monotonic()
+
+    def get(self, key):
+        """Returns the objects stored under key, or None
+
+        A hit makes the entry the most recently used one.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry[0] <= monotonic():
+                self.__remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def generation(self, names):
+        """Returns the invalidation counts of the named classes, by name"""
+        with self.__lock:
+            return {name: self.__generations.get(name, 0) for name in names}
+
+    def put(self, key, objs, names, generation=None):
+        """Stores a query result
+
+        Args:
+            key (hashable): The query.
+            objs (list): The objects it returned.
+            names (iterable): The names of the classes the result depends
+                on; a change to one of them drops the entry.
+            generation (dict, optional): What generation() returned before
+                the query ran. The result is not stored if one of the
+                classes was invalidated since.
+        """
+        if len(objs) > self.maxsize:
+            return
+        names = frozenset(names)
+        with self.__lock:
+            if generation is not None and any(
+                    self.__generations.get(name, 0) != count
+                    for name, count in generation.items()):
+                return
+            if key in self.__entries:
+                self.__remove(key)
+            self.__entries[key] = (monotonic() + self.ttl, names, objs)
+            self.__size += len(objs)
+            for name in names:
+                self.__by_name.setdefault(name, set()).add(key)
+            while self.__size > self.maxsize:
+                self.__remove(next(iter(self.__entries)))
+                self.evictions += 1
+
+    def discard(self, key):
+        """Drops the entry of key, if any"""
+        with self.__lock:
+            if key in self.__entries:
+                self.__remove(key)
+
+    def invalidate(self, names):
+        """Drops the entries that depend on any of the named classes"""
+        with self.__lock:
+            for name in names:
+                self.__generations[name] = \
+                    self.__generations.get(name, 0) + 1
+                for key in list(self.__by_name.get(name, ())):
+                    self.__remove(key)
+                    self.invalidations += 1
+
+    def clear(self):
+        """Drops every entry, keeping the counters"""
+        with self.__lock:
+            self.__entries.clear()
+            self.__by_name.clear()
+            self.__size = 0
+
+    def stats(self):
+        """Returns the counters, the number of entries and of objects"""
+        with self.__lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'evictions': self.evictions,
+                    'invalidations': self.invalidations,
+                    'entries': len(self.__entries), 'size': self.__size}
+
+    def __remove(self, key):
+        """Drops the entry of key; the lock must be held"""
+        _, names, objs = self.__entries.pop(key)
+        self.__size -= len(objs)
+        for name in names:
+            keys = self.__by_name[name]
+            keys.discard(key)
+            if not keys:
+                del self.__by_name[name]
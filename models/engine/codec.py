@@ -0,0 +1,135 @@
+#!/usr/bin/python3
+"""This module defines the JSON codecs FileStorage can encode records with
+
+HBNB_JSON_CODEC picks one by name: json, the standard library and the
+default, orjson or ujson, when installed. auto picks the fastest one
+installed. Every codec writes plain JSON, so a file written with one is
+read by the others.
+"""
+import json
+import math
+from importlib import import_module
+from os import getenv
+
+# orjson reads integers of more than 64 bits as floats: text holding 19
+# digits in a row, once every digit is made 0, is left to json
+_digits = bytes.maketrans(b'123456789', b'0' * 9)
+_long_int = b'0' * 19
+
+
+def _finite(obj):
+    """Tells whether obj holds no NaN or infinite float"""
+    if type(obj) is float:
+        return math.isfinite(obj)
+    if isinstance(obj, dict):
+        return all(map(_finite, obj.values()))
+    if isinstance(obj, (list, tuple)):
+        return all(map(_finite, obj))
+    return True
+
+
+class JsonCodec:
+    """Encodes and decodes JSON with the standard library
+
+    Attributes:
+        name (str): The name HBNB_JSON_CODEC selects the codec by.
+    """
+    name = 'json'
+
+    def dumps(self, obj):
+        """Returns the JSON text of obj"""
+        return json.dumps(obj)
+
+    def loads(self, text):
+        """Returns the value of a JSON text"""
+        return json.loads(text)
+
+
+class OrjsonCodec(JsonCodec):
+    """Encodes and decodes JSON with orjson, which writes UTF-8 text
+    without escaping non-ASCII characters nor spaces after separators
+
+    orjson turns NaN and infinities into null, and holds no integer
+    beyond 64 bits: such values are left to the standard library.
+    """
+    name = 'orjson'
+
+    def __init__(self):
+        """Imports orjson
+
+        Raises:
+            ImportError: If orjson is not installed.
+        """
+        self.__orjson = import_module('orjson')
+
+    def dumps(self, obj):
+        """Returns the JSON text of obj"""
+        try:
+            text = self.__orjson.dumps(obj)
+        except TypeError:
+            return json.dumps(obj)
+        if b'null' in text and not _finite(obj):
+            return json.dumps(obj)
+        return text.decode()
+
+    def loads(self, text):
+        """Returns the value of a JSON text"""
+        data = text.encode() if isinstance(text, str) else text
+        if _long_int in data.translate(_digits):
+            return json.loads(text)
+        try:
+            return self.__orjson.loads(data)
+        except ValueError:
+            # NaN and infinities, which json writes
+            return json.loads(text)
+
+
+class UjsonCodec(JsonCodec):
+    """Encodes and decodes JSON with ujson"""
+    name = 'ujson'
+
+    def __init__(self):
+        """Imports ujson
+
+        Raises:
+            ImportError: If ujson is not installed.
+        """
+        self.__ujson = import_module('ujson')
+
+    def dumps(self, obj):
+        """Returns the JSON text of obj"""
+        return self.__ujson.dumps(obj, escape_forward_slashes=False)
+
+    def loads(self, text):
+        """Returns the value of a JSON text"""
+        return self.__ujson.loads(text)
+
+
+codecs = {codec.name: codec for codec in (JsonCodec, OrjsonCodec, UjsonCodec)}
+
+
+def get_codec(name=None):
+    """Returns a codec by name
+
+    Args:
+        name (str, optional): json, orjson, ujson or auto. Defaults to
+                              HBNB_JSON_CODEC, or json when it is unset.
+
+    Returns:
+        JsonCodec: The codec.
+
+    Raises:
+        ValueError: If the name is unknown.
+        ImportError: If the library of the codec is not installed.
+    """
+    name = name or getenv("HBNB_JSON_CODEC") or 'json'
+    if name == 'auto':
+        for codec in (OrjsonCodec, UjsonCodec):
+            try:
+                return codec()
+            except ImportError:
+                pass
+        return JsonCodec()
+    if name not in codecs:
+        raise ValueError("unknown JSON codec {}".format(name))
+    return codecs[name]()
@@ -0,0 +1,154 @@
+#!/usr/bin/python3
+"""This module holds stored records column by column, for FileStorage"""
+import sys
+from array import array
+from datetime import datetime, timedelta
+
+_missing = object()
+_int64 = range(-2 ** 63, 2 ** 63)
+_epoch = datetime(1970, 1, 1)
+_microsecond = timedelta(microseconds=1)
+
+
+class ColumnStore:
+    """The records of one class, held column by column
+
+    Each attribute is a column with one slot per record. Integers and
+    floats are packed in an array while every value of the column is one,
+    and so are the created_at and updated_at timestamps, as microseconds
+    since the epoch. Other columns are lists. The strings of foreign key
+    columns (*_id) are interned, so that each id is held once however
+    many records refer to it. A value that does not fit the array of its
+    column turns it into a list.
+
+    Records are added as the dictionaries of to_dict(), or with datetime
+    timestamps, and read back as the dictionaries of to_dict(), under
+    their "<class name>.<id>" key. The id of a record is read back
+    from its key rather than stored. Removing a record leaves its slot
+    empty; the columns are packed again once half of the slots are.
+
+    Attributes:
+        timestamps (tuple): The names of the timestamp columns.
+    """
+    timestamps = ('created_at', 'updated_at')
+
+    def __init__(self):
+        """Creates an empty store"""
+        self.__rows = {}
+        self.__columns = {}
+        self.__size = 0
+
+    def __len__(self):
+        """Returns the number of records"""
+        return len(self.__rows)
+
+    def __contains__(self, key):
+        """Tells whether a record is stored under key"""
+        return key in self.__rows
+
+    def keys(self):
+        """Returns a view of the keys of the records"""
+        return self.__rows.keys()
+
+    def add(self, key, record):
+        """Stores a record under key, replacing the record it had
+
+        Args:
+            key (str): The key of the record.
+            record (dict): The record, as to_dict() returns it.
+        """
+        self.discard(key)
+        row = self.__size
+        self.__size += 1
+        derived = key.partition('.')[2]
+        for name, value in record.items():
+            if name == '__class__' or name == 'id' and value == derived:
+                continue
+            if name not in self.__columns:
+                self.__columns[name] = [_missing] * row
+            self.__append(name, self.__pack(name, value))
+        for name, column in self.__columns.items():
+            if len(column) == row:
+                self.__append(name, _missing)
+        self.__rows[key] = row
+
+    def get(self, key, cls_name=None):
+        """Returns the record stored under key, or None
+
+        Args:
+            key (str): The key of the record.
+            cls_name (str, optional): The __class__ of the record.
+
+        Returns:
+            dict: A new dictionary of the record.
+        """
+        row = self.__rows.get(key)
+        if row is None:
+            return None
+        record = {'id': key.partition('.')[2]}
+        for name, column in self.__columns.items():
+            value = column[row]
+            if value is _missing:
+                continue
+            if name in self.timestamps and type(value) is int:
+                value = (_epoch + value * _microsecond).isoformat()
+            elif isinstance(value, list):
+                value = list(value)
+            record[name] = value
+        if cls_name is not None:
+            record['__class__'] = cls_name
+        return record
+
+    def discard(self, key):
+        """Removes the record of key, if any"""
+        row = self.__rows.pop(key, None)
+        if row is None:
+            return
+        for column in self.__columns.values():
+            if not isinstance(column, array):
+                column[row] = _missing
+        if len(self.__rows) < self.__size // 2:
+            self.__pack_rows()
+
+    def __pack(self, name, value):
+        """Returns value as its column holds it"""
+        if name in self.timestamps and type(value) is datetime:
+            return (value - _epoch) // _microsecond
+        if name in self.timestamps and isinstance(value, str):
+            try:
+                return (datetime.fromisoformat(value) - _epoch) \
+                    // _microsecond
+            except (TypeError, ValueError):
+                return value
+        if isinstance(value, str) and name.endswith('_id'):
+            return sys.intern(value)
+        return value
+
+    def __append(self, name, value):
+        """Appends value to a column, turning it into a list if needed
+
+        Integers outside the 64 bits of the 'q' arrays go to lists.
+        """
+        column = self.__columns[name]
+        if isinstance(column, array):
+            if column.typecode == 'q' and type(value) is int and \
+                    value in _int64 or \
+                    column.typecode == 'd' and type(value) is float:
+                column.append(value)
+                return
+            column = self.__columns[name] = list(column)
+        elif not column and (type(value) is float or
+                             type(value) is int and value in _int64):
+            column = self.__columns[name] = array(
+                'q' if type(value) is int else 'd')
+        column.append(value)
+
+    def __pack_rows(self):
+        """Drops the empty slots of removed records"""
+        rows = sorted(self.__rows.items(), key=lambda item: item[1])
+        for name, column in self.__columns.items():
+            packed = [column[row] for _, row in rows]
+            self.__columns[name] = (array(column.typecode, packed)
+                                    if isinstance(column, array) else packed)
+        self.__rows = {key: row for row, (key, _) in enumerate(rows)}
+        self.__size = len(rows)
@@ -3,12 +3,28 @@
 This module defines the DBStorage class which manages persistent storage
 for the hbnb clone using a MySQL database.
 """
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import chain, groupby
 from os import getenv
-from sqlalchemy import create_engine, MetaData
-from sqlalchemy.orm import sessionmaker, scoped_session
+from threading import Lock, local
+from time import perf_counter
+from sqlalchemy import create_engine, event, MetaData
+from sqlalchemy import bindparam, func, insert, literal, select, text
+from sqlalchemy import union_all, update
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session, sessionmaker, scoped_session
+from sqlalchemy.pool import QueuePool
 import models
 from models.base_model import Base
 from models.base_model import BaseModel
+from models.engine.cache import QueryCache
+from models.engine.migrations import migrate
+from models.engine.query import Query
 from models.amenity import Amenity
 from models.city import City
 from models.place import Place
@@ -17,6 +33,106 @@ from models.state import State
 from models.user import User
 
 
+class TimedQueuePool(QueuePool):
+    """
+    A QueuePool that records how long checkouts wait for a connection.
+
+    Attributes:
+        waits (int): The number of connections handed out.
+        wait_time (float): The seconds spent getting them, including the
+            time blocked on a full pool.
+        max_wait (float): The longest single wait, in seconds.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """ Initialize the pool and its counters """
+        super().__init__(*args, **kwargs)
+        self.waits = 0
+        self.wait_time = 0.0
+        self.max_wait = 0.0
+        self.__lock = Lock()
+
+    def _do_get(self):
+        """ Get a connection from the pool and time the wait """
+        start = perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = perf_counter() - start
+            with self.__lock:
+                self.waits += 1
+                self.wait_time += waited
+                self.max_wait = max(self.max_wait, waited)
+
+
+def load_options(cls, load):
+    """
+    Map the relationship paths of all() to SQLAlchemy loader options.
+
+    Collections are loaded with selectinload, one extra SELECT ... IN
+    per path segment whatever the number of parents; many-to-one
+    relationships are loaded with joinedload in the parent query.
+
+    Args:
+        cls (class): The class queried by all().
+        load (list): The relationship paths.
+
+    Return:
+        list: The loader options.
+    """
+    options = []
+    for path in load:
+        option, clas = None, cls
+        for name in path.split('.'):
+            rel = inspect(clas).relationships.get(name)
+            if rel is None:
+                raise AttributeError("{} has no relationship {}"
+                                     .format(clas.__name__, name))
+            loader = selectinload if rel.uselist else joinedload
+            attr = getattr(clas, name)
+            option = (loader(attr) if option is None
+                      else getattr(option, loader.__name__)(attr))
+            clas = rel.mapper.class_
+        options.append(option)
+    return options
+
+
+def select_query(query, load=None):
+    """
+    Compile a Query to a SELECT statement.
+
+    Args:
+        query (Query): The query.
+        load (list, optional): Relationships to load, as for all().
+
+    Return:
+        sqlalchemy.Select: The statement.
+    """
+    cls = query.cls
+    stmt = select(cls)
+    for attr, op, value in query.conditions:
+        column = getattr(cls, attr)
+        if op == 'in':
+            stmt = stmt.where(column.in_(value))
+        else:
+            stmt = stmt.where(Query.operators[op](column, value))
+    stmt = stmt.order_by(*[getattr(cls, attr).desc() if descending
+                           else getattr(cls, attr)
+                           for attr, descending in query.order])
+    if query.limit is not None:
+        stmt = stmt.limit(query.limit)
+    if query.offset:
+        stmt = stmt.offset(query.offset)
+    if load:
+        stmt = stmt.options(*load_options(cls, load))
+    return stmt
+
+
+class _Local(local):
+    """ Per-thread state of a DBStorage """
+    batch = None
+
+
 class DBStorage:
     """
     This class manages SQL database storage for hbnb clone. It creates and
@@ -24,15 +140,58 @@ class DBStorage:
 
     Attributes:
         __engine (sqlalchemy.Engine): The SQLAlchemy engine.
-        __session (sqlalchemy.orm.session.Session): The SQLAlchemy session.
+        __session (sqlalchemy.orm.scoped_session): The session registry;
+            each thread works in its own session.
+        __local (threading.local): Per-thread state, i.e. the objects
+            passed to new() inside a batch() block.
+        __classes (tuple): The mapped classes, in the order all() loads them.
+            Any other class, such as BaseModel, has no rows: all(), iter(),
+            keys(), get(), count() and query() find nothing of it.
+        __cache (QueryCache): The results of all(), get() and query(), or
+            None when the cache is off.
+        __related (dict): The names of the classes each class has a
+            relationship with, itself included, which its changes
+            invalidate along with it.
+        __parallel (bool): Whether all() without a class queries the
+            classes at the same time.
+        __workers (ThreadPoolExecutor): The threads all() runs the
+            queries of the classes on, created on first use.
     """
     __engine = None
     __session = None
+    __local = None
+    __cache = None
+    __related = None
+    __parallel = False
+    __workers = None
+    __classes = (State, City, User, Place, Review, Amenity)
 
-    def __init__(self):
+    def __init__(self, url=None):
         """
         Initialize DBStorage instance, creates the engine and connects to
         the database.
+
+        HBNB_DB_URL, when set, replaces the MySQL URL built from the
+        HBNB_MYSQL_* variables, e.g. sqlite:///hbnb.db for a local
+        stand-in.
+
+        The connection pool is sized by HBNB_DB_POOL_SIZE (default 5),
+        HBNB_DB_MAX_OVERFLOW (default 10), HBNB_DB_POOL_TIMEOUT (seconds
+        to wait for a connection, default 30) and HBNB_DB_POOL_RECYCLE
+        (seconds before a connection is replaced, default 3600, below
+        the MySQL wait_timeout). SQLite keeps the pool SQLAlchemy picks
+        for it.
+
+        HBNB_DB_CACHE=1 turns on the query result cache, holding up to
+        HBNB_DB_CACHE_SIZE objects (default 10000) for HBNB_DB_CACHE_TTL
+        seconds (default 60).
+
+        HBNB_DB_PARALLEL_ALL=1 makes all() without a class query the
+        classes at the same time, see all().
+
+        Args:
+            url (str, optional): The database URL, used by subclasses
+                for other backends. Defaults to the URL above.
         """
         user = getenv("HBNB_MYSQL_USER")
         pwd = getenv("HBNB_MYSQL_PWD")
@@ -40,39 +199,260 @@ class DBStorage:
         db = getenv("HBNB_MYSQL_DB")
         env0 = getenv("HBNB_ENV", "none")
 
-        self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.format(
-            user, pwd, host, db), pool_pre_ping=True)
+        url = url or getenv("HBNB_DB_URL") or \
+            'mysql+mysqldb://{}:{}@{}/{}'.format(user, pwd, host, db)
+        pool = {}
+        if make_url(url).get_backend_name() != 'sqlite':
+            pool = {
+                'poolclass': TimedQueuePool,
+                'pool_size': int(getenv("HBNB_DB_POOL_SIZE", "5")),
+                'max_overflow': int(getenv("HBNB_DB_MAX_OVERFLOW", "10")),
+                'pool_timeout': float(getenv("HBNB_DB_POOL_TIMEOUT", "30")),
+                'pool_recycle': int(getenv("HBNB_DB_POOL_RECYCLE", "3600")),
+            }
+        self.__engine = create_engine(url, pool_pre_ping=True, **pool)
+        self.__local = _Local()
+        self.__parallel = getenv("HBNB_DB_PARALLEL_ALL") == "1"
+        self._configure(self.__engine)
+        if getenv("HBNB_DB_CACHE") == "1":
+            self.__cache = QueryCache(
+                int(getenv("HBNB_DB_CACHE_SIZE", "10000")),
+                float(getenv("HBNB_DB_CACHE_TTL", "60")))
+            self.__related = {
+                clas.__name__: {clas.__name__} | {
+                    rel.mapper.class_.__name__
+                    for rel in inspect(clas).relationships}
+                for clas in self.__classes}
 
         if env0 == 'test':
             Base.metadata.drop_all(self.__engine)
 
-    def all(self, cls=None):
+    def _configure(self, engine):
+        """
+        Prepare a new engine before the first connection, a hook for the
+        backends that subclass DBStorage. Does nothing here.
+
+        Args:
+            engine (sqlalchemy.Engine): The engine.
+        """
+
+    def all(self, cls=None, load=None):
         """
         Return a dictionary of all objects of a given class, if specified,
         or all objects in the database if no class is specified.
 
         Args:
             cls (str, optional): The class of the objects to return.
+            load (list, optional): Relationships to load with the objects,
+                as attribute names or dotted paths of cls, e.g. ['cities']
+                or ['cities.places']. Without it, every access to one of
+                them on a returned object costs its own query. Ignored
+                when no class is given.
+
+        Without a class, the classes are queried one after the other.
+        With HBNB_DB_PARALLEL_ALL=1, the classes not cached are queried
+        at the same time instead, each on its own pooled connection, and
+        their objects added to the session without querying again. That
+        saves round trips but not the cost of adding each object, so it
+        only pays on a slow link to the database with few rows. It also
+        needs a QueuePool, and a session with no change it has not
+        committed, which the other connections would not see.
 
         Return:
             dict: A dictionary of all objects, with the key as the class name
             and id of the object, and the value as the object itself.
         """
         dic = {}
-        if cls:
-            query = self.__session.query(cls)
-            for obj in query:
-                key = "{}.{}".format(type(obj).__name__, obj.id)
-                dic[key] = obj
-        else:
-            classes = [State, City, User, Place, Review, Amenity]
-            for clas in classes:
-                query = self.__session.query(clas)
-                for obj in query:
-                    key = "{}.{}".format(type(obj).__name__, obj.id)
-                    dic[key] = obj
+        if self.__unmapped(cls):
+            return dic
+        loading = {} if cls else self.__load_apart()
+        for clas in [cls] if cls else self.__classes:
+            prefix = clas.__name__ + '.'
+            query = self.__session.query(clas)
+            if load and cls:
+                query = query.options(*load_options(clas, load))
+            objs = self.__cached(('all', clas.__name__, tuple(load or ())),
+                                 self.__path_names(clas, load if cls else ()),
+                                 loading.get(clas, query.all))
+            dic.update({prefix + obj.id: obj for obj in objs})
         return (dic)
 
+    def __load_apart(self):
+        """
+        Start querying the classes all() finds no cached result of, each
+        in a worker thread, when the session allows it.
+
+        Return:
+            dict: A callable per class, that waits for its objects and
+            merges them into the session.
+        """
+        session = self.__session()
+        if not self.__parallel or \
+                not isinstance(self.__engine.pool, QueuePool) or \
+                session.new or session.dirty or session.deleted or \
+                'hbnb_changed' in session.info:
+            return {}
+        classes = [clas for clas in self.__classes
+                   if self.__cache is None or
+                   ('all', clas.__name__, ()) not in self.__cache]
+        if len(classes) < 2:
+            return {}
+        if self.__workers is None:
+            self.__workers = ThreadPoolExecutor(len(self.__classes))
+
+        def query(clas):
+            with Session(self.__engine, expire_on_commit=False) as apart:
+                return list(apart.scalars(select(clas)))
+
+        def merged(future):
+            return lambda: [self.__attach(obj) for obj in future.result()]
+        return {clas: merged(self.__workers.submit(query, clas))
+                for clas in classes}
+
+    def iter(self, cls=None, batch_size=1000):
+        """
+        Yield the objects of a class, or of all classes, one at a time.
+
+        Rows are fetched batch_size at a time with yield_per, through a
+        server-side cursor where the driver has one. The session only
+        keeps weak references to unchanged objects, so the ones the
+        caller drops are freed as it goes. Finish or close the iteration
+        before running other queries in the same session: MySQL does not
+        allow them while a server-side cursor is open.
+
+        Args:
+            cls (class, optional): The class of the objects to yield.
+            batch_size (int): The number of rows fetched at a time.
+
+        Yields:
+            BaseModel: The objects.
+        """
+        if self.__unmapped(cls):
+            return
+        for clas in [cls] if cls else self.__classes:
+            stmt = select(clas).execution_options(yield_per=batch_size)
+            yield from self.__session.scalars(stmt)
+
+    def keys(self, cls=None):
+        """
+        Return the keys of all objects of a class, or of all classes.
+
+        The keys are built by the database in a single UNION ALL statement,
+        without loading any object.
+
+        Args:
+            cls (class, optional): The class of the keys to return.
+
+        Return:
+            list: The "<class name>.<id>" keys.
+        """
+        if self.__unmapped(cls):
+            return []
+        selects = [select((literal(clas.__name__ + '.') + clas.id)
+                          .label('key'))
+                   for clas in ([cls] if cls else self.__classes)]
+        stmt = selects[0] if len(selects) == 1 else union_all(*selects)
+        return list(self.__session.scalars(stmt))
+
+    def get(self, cls, id):
+        """
+        Return one object of a class by primary key.
+
+        Objects already in the session are returned without a query.
+
+        Args:
+            cls (class): The class of the object.
+            id (str): The id of the object.
+
+        Return:
+            BaseModel: The object, or None if it does not exist.
+        """
+        if self.__unmapped(cls):
+            return None
+        if self.__cache is None:
+            return self.__session.get(cls, id)
+        objs = self.__cached(
+            ('get', cls.__name__, id), [cls.__name__],
+            lambda: [obj for obj in [self.__session.get(cls, id)] if obj])
+        return objs[0] if objs else None
+
+    def count(self, cls=None):
+        """
+        Return the number of rows of a class, or of all classes.
+
+        The rows are counted by the database with SELECT COUNT(*), in a
+        single statement when no class is given, without loading objects.
+
+        Args:
+            cls (class, optional): The class of the objects to count.
+
+        Return:
+            int: The number of rows.
+        """
+        if self.__unmapped(cls):
+            return 0
+        counts = [select(func.count()).select_from(clas).scalar_subquery()
+                  for clas in ([cls] if cls else self.__classes)]
+        return sum(self.__session.execute(select(*counts)).one())
+
+    def query(self, cls, order_by=None, limit=None, offset=None, load=None,
+              **filters):
+        """
+        Return the objects of a class that pass filters, in order.
+
+        The filters, order and slice are compiled to the WHERE, ORDER BY,
+        LIMIT and OFFSET of a single SELECT. See Query for the filters and
+        order_by, and all() for load.
+
+        Return:
+            list: The matching objects.
+        """
+        query = Query(cls, order_by, limit, offset, **filters)
+        if self.__unmapped(cls):
+            return []
+        key = ('query', cls.__name__, repr((query.conditions, query.order,
+                                            query.limit, query.offset)),
+               tuple(load or ()))
+        return self.__cached(key, self.__path_names(cls, load), lambda: list(
+            self.__session.scalars(select_query(query, load))))
+
+    def page(self, cls, limit=None, after=None):
+        """
+        Return the objects of a class in id order, starting after an id.
+
+        The page is read with WHERE id > :after ORDER BY id LIMIT :limit,
+        which the primary key index answers without skipping rows, so a
+        deep page costs the same as the first one, unlike OFFSET.
+
+        Args:
+            cls (class): The class of the objects to return.
+            limit (int, optional): The maximum number of objects.
+            after (str, optional): The id the page starts after, usually
+                the last id of the previous page.
+
+        Return:
+            list: The objects, ordered by id.
+        """
+        filters = {} if after is None else {'id__gt': after}
+        return self.query(cls, order_by='id', limit=limit, **filters)
+
+    def explain(self, cls, order_by=None, limit=None, offset=None,
+                load=None, **filters):
+        """
+        Return the SQL query() sends for the same arguments, followed by
+        the plan of the database for it (EXPLAIN QUERY PLAN on SQLite,
+        EXPLAIN otherwise), one row per line.
+        """
+        query = Query(cls, order_by, limit, offset, **filters)
+        sql = str(select_query(query).compile(
+            dialect=self.__engine.dialect,
+            compile_kwargs={'literal_binds': True}))
+        prefix = ('EXPLAIN QUERY PLAN ' if self.__engine.dialect.name ==
+                  'sqlite' else 'EXPLAIN ')
+        rows = self.__session.execute(text(prefix + sql))
+        return '\n'.join([sql] + [' '.join(str(value) for value in row)
+                                  for row in rows])
+
     def new(self, obj):
         """
         Add an object to the current database session.
@@ -80,13 +460,151 @@ class DBStorage:
         Args:
             obj (BaseModel): The object to add.
         """
-        self.__session.add(obj)
+        self.__invalidate([type(obj).__name__])
+        if self.__local.batch is not None:
+            self.__local.batch.append(obj)
+        else:
+            self.__session.add(obj)
+
+    def bulk_new(self, objs, chunk_size=10000):
+        """
+        Insert many new objects with executemany and a single commit.
+
+        The column values of the objects are sent with Core INSERT
+        statements, chunk_size rows at a time, without adding the
+        objects to the session: they stay transient, and relationships
+        set on them (e.g. Place.amenities) are not written. Columns left
+        unset get their defaults. The tables are filled parents first, in
+        the order of their foreign keys. If an insert fails, the session
+        is rolled back. Inside a batch() block the commit, or the
+        rollback, is left to the block.
+
+        Args:
+            objs (iterable): The new objects, of any mapped classes.
+            chunk_size (int): The number of rows sent per statement.
+
+        Return:
+            int: The number of rows inserted.
+        """
+        rows = {}
+        columns = {}
+        for obj in objs:
+            cls = type(obj)
+            if cls not in columns:
+                columns[cls] = [column.key for column in cls.__table__.columns]
+                rows[cls] = []
+            # the instance dict holds the values set, without going
+            # through the attribute instrumentation
+            values = obj.__dict__
+            rows[cls].append({key: values[key] for key in columns[cls]
+                              if values.get(key) is not None})
+        order = {table: i
+                 for i, table in enumerate(Base.metadata.sorted_tables)}
+        try:
+            for cls in sorted(rows, key=lambda cls: order[cls.__table__]):
+                self.__executemany(insert(cls.__table__), rows[cls],
+                                   chunk_size)
+        except BaseException:
+            if self.__local.batch is None:
+                self.__session.rollback()
+            raise
+        self.__invalidate([cls.__name__ for cls in rows])
+        if self.__local.batch is None:
+            self.__session.commit()
+        return sum(map(len, rows.values()))
+
+    def bulk_update(self, cls, rows, chunk_size=10000):
+        """
+        Update many rows of a class by id with executemany and a single
+        commit.
+
+        Each row is a dictionary holding the id and the new values of
+        some columns; updated_at is set to now unless given. Objects of
+        cls already loaded in the session are expired, so they read the
+        new values on next access.
+
+        Args:
+            cls (class): The class of the rows.
+            rows (iterable): The dictionaries of the rows to update.
+            chunk_size (int): The number of rows sent per statement.
+
+        Return:
+            int: The number of rows matched.
+        """
+        table = cls.__table__
+        now = datetime.now()
+        data = sorted((dict({'updated_at': now}, **row) for row in rows),
+                      key=sorted)
+        ids = set()
+        total = 0
+        for names, group in groupby(data, key=sorted):
+            group = list(group)
+            stmt = update(table).where(table.c.id == bindparam('_id'))
+            stmt = stmt.values({name: bindparam('_' + name)
+                                for name in names if name != 'id'})
+            total += self.__executemany(
+                stmt, [{'_' + name: value for name, value in row.items()}
+                       for row in group], chunk_size)
+            ids.update(row['id'] for row in group)
+        session = self.__session()
+        for obj in list(session.identity_map.values()):
+            if type(obj) is cls and obj.id in ids:
+                session.expire(obj)
+        self.__invalidate([cls.__name__])
+        if self.__local.batch is None:
+            session.commit()
+        return total
+
+    def __executemany(self, stmt, rows, chunk_size):
+        """
+        Execute stmt for rows in chunks, in the session's transaction.
+
+        An executemany needs the same keys in every parameter set, so
+        rows are grouped by the columns they set first.
+
+        Return:
+            int: The number of rows matched.
+        """
+        total = 0
+        for _, group in groupby(sorted(rows, key=sorted), key=sorted):
+            group = list(group)
+            for start in range(0, len(group), chunk_size):
+                result = self.__session.execute(
+                    stmt, group[start:start + chunk_size])
+                total += result.rowcount
+        return total
 
     def save(self):
         """
         Commit all changes of the current database session to the database.
         """
-        self.__session.commit()
+        if self.__local.batch is None:
+            self.__session.commit()
+
+    @contextmanager
+    def batch(self):
+        """
+        Defer the commits of the objects saved inside the block.
+
+        Objects passed to new() are added to the session together when the
+        block exits, so the flush sends them as multi-row INSERTs, followed
+        by a single commit. If the block raises, the session is rolled
+        back instead. Nested blocks join the outermost one.
+        """
+        if self.__local.batch is not None:
+            yield
+            return
+        self.__local.batch = []
+        try:
+            yield
+        except BaseException:
+            self.__session.rollback()
+            raise
+        else:
+            self.__session.add_all(self.__local.batch)
+            self.__session.commit()
+        finally:
+            self.__local.batch = None
 
     def delete(self, obj=None):
         """
@@ -96,20 +614,166 @@ class DBStorage:
             obj (BaseModel, optional): The object to delete.
         """
         if obj:
+            self.__invalidate([type(obj).__name__])
             self.__session.delete(obj)
 
     def reload(self):
         """
-        Create the current database session from the engine using a
-        sessionmaker.
+        Create the missing tables and indexes, then the session registry.
+
+        Each thread gets its own session from the registry on first use,
+        so concurrent requests never share a unit of work.
         """
-        self.__session = Base.metadata.create_all(self.__engine)
+        Base.metadata.create_all(self.__engine)
+        migrate(self.__engine)
+        if self.__session is not None:
+            self.__session.remove()
         factory = sessionmaker(bind=self.__engine, expire_on_commit=False)
-        Session = scoped_session(factory)
-        self.__session = Session()
+        event.listen(factory, 'after_flush', self.__flushed)
+        event.listen(factory, 'after_transaction_end', self.__ended)
+        self.__session = scoped_session(factory)
 
     def close(self):
         """
-        Close the current database session.
+        Close the session of the current thread and return its
+        connection to the pool. The next call in this thread starts a
+        new session.
+        """
+        self.__session.remove()
+
+    def __unmapped(self, cls):
+        """
+        Tell whether cls is a class other than the mapped ones, which no
+        table holds the rows of.
+        """
+        return cls is not None and cls not in self.__classes
+
+    def cache_stats(self):
+        """
+        Return the counters of the query result cache.
+
+        Return:
+            dict: The hits, misses, evictions and invalidations, and the
+            number of entries and of objects they hold, or an empty dict
+            when the cache is off.
+        """
+        return {} if self.__cache is None else self.__cache.stats()
+
+    def __cached(self, key, names, load):
+        """
+        Return the objects of a query from the cache, or load and cache
+        them.
+
+        Cached objects come from the session of the thread that loaded
+        them, so a hit merges them into the current session without
+        querying (merge with load=False). An object changed but not saved
+        since cannot be merged that way, and turns the hit into a miss.
+
+        Args:
+            key (tuple): The query.
+            names (iterable): The classes the result depends on.
+            load (callable): Runs the query and returns a list.
+
+        Return:
+            list: The objects.
+        """
+        if self.__cache is None:
+            return load()
+        objs = self.__cache.get(key)
+        if objs is not None:
+            try:
+                return [self.__attach(obj) for obj in objs]
+            except InvalidRequestError:
+                self.__cache.discard(key)
+        names = set(names)
+        # read before the query, so that a commit invalidating names while
+        # it runs keeps its result out of the cache
+        generation = self.__cache.generation(names)
+        objs = load()
+        self.__cache.put(key, objs, names, generation)
+        return objs
+
+    def __attach(self, obj):
+        """
+        Return a cached object as an object of the current session.
+
+        An unchanged object no session holds any more is added back as
+        is, the cheap and common case once the request that loaded it
+        has ended. Otherwise its state is copied into the session with
+        merge(load=False), which does not query either.
+
+        Raises:
+            InvalidRequestError: If obj was changed and not saved.
+        """
+        session = self.__session()
+        state = inspect(obj)
+        if state.modified:
+            raise InvalidRequestError("cached object was changed")
+        if state.detached and state.key not in session.identity_map:
+            session.add(obj)
+            return obj
+        return session.merge(obj, load=False)
+
+    @staticmethod
+    def __path_names(cls, load):
+        """
+        Return the names of cls and of the classes along the paths of
+        load, the classes a query of cls with load depends on.
+        """
+        names = {cls.__name__}
+        for path in load or ():
+            clas = cls
+            for name in path.split('.'):
+                clas = inspect(clas).relationships[name].mapper.class_
+                names.add(clas.__name__)
+        return names
+
+    def __invalidate(self, names):
+        """
+        Drop the cached results of the named classes and of the classes
+        related to them.
+        """
+        if self.__cache is None:
+            return
+        self.__cache.invalidate({related for name in names
+                                 for related in self.__related.get(
+                                     name, (name,))})
+
+    def __flushed(self, session, flush_context):
+        """
+        Remember the classes of the rows a flush wrote, until the
+        transaction ends. all() also reads them as a sign of changes the
+        other connections cannot see yet.
+        """
+        session.info.setdefault('hbnb_changed', set()).update(
+            type(obj).__name__
+            for obj in chain(session.new, session.dirty, session.deleted))
+
+    def __ended(self, session, transaction):
+        """
+        Invalidate the classes a transaction wrote once it is committed,
+        rolled back or closed, so results cached meanwhile are not kept.
+        """
+        self.__invalidate(session.info.pop('hbnb_changed', ()))
+
+    def pool_stats(self):
+        """
+        Return the state of the connection pool.
+
+        Return:
+            dict: The pool size, the connections checked out, idle in the
+            pool and opened past the size (overflow), and with a
+            TimedQueuePool the number of checkouts and the total and
+            longest time they waited, in seconds. Keys a pool does not
+            track are left out.
         """
-        self.__session.close()
+        pool = self.__engine.pool
+        stats = {}
+        if isinstance(pool, QueuePool):
+            stats.update(size=pool.size(), checked_out=pool.checkedout(),
+                         checked_in=pool.checkedin(),
+                         overflow=pool.overflow())
+        if isinstance(pool, TimedQueuePool):
+            stats.update(waits=pool.waits, wait_time=pool.wait_time,
+                         max_wait=pool.max_wait)
+        return stats
@@ -1,19 +1,116 @@
 #!/usr/bin/python3
 """This module defines a class to manage file storage for hbnb clone"""
-import json
+import os
+from bisect import bisect_right
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import chain
+from os import getenv
+from models.base_model import BaseModel
+from models.engine.codec import get_codec
+from models.engine.columns import ColumnStore
+from models.engine.json_stream import iter_items, write_items
+from models.engine.query import Query
+from models.engine import snapshot
 
 
 class FileStorage:
-    """This class manages storage of hbnb models in JSON format"""
+    """This class manages storage of hbnb models in JSON format
+
+    Besides the flat __objects dictionary, objects are indexed by class
+    name in __by_class so that all(cls) only touches objects of the
+    requested class.
+
+    Objects are also indexed by the value of their foreign key attributes
+    (__fk_attrs) in __fk_index, which lookup() reads to answer State.cities
+    and the other relationships in O(number of children).
+
+    The place_amenity association of file mode is the amenity_ids list of
+    each Place. __place_amenity and __amenity_place index it in both
+    directions, and link_amenity()/unlink_amenity() keep the list and the
+    indexes in step.
+
+    The JSON text of every stored object is cached in __fragments. Only
+    objects passed to new() or flagged dirty by BaseModel since the last
+    save are serialized again, the others are written from the cache.
+    The lists and dicts BaseModel keeps in attributes flag their object
+    when they change in place; a list or dict nested in them does not.
+
+    With HBNB_FILE_JOURNAL=1, save() appends the objects passed to new()
+    or delete() since the previous save as JSON lines to a journal next
+    to the snapshot file, and rewrites the snapshot only once the journal
+    holds more than HBNB_FILE_JOURNAL_LIMIT records and more than half
+    as many records as the store.
+
+    Inside a batch() block, save() only touches memory and the file is
+    written once when the block exits.
+
+    close() compares the inode, size and modification time of the files
+    with the ones last read or written, and only reloads when another
+    process changed them. Records appended to the journal are applied
+    without reading the snapshot again.
+
+    page() walks the ids of a class in order from __id_order, a sorted
+    list built on first use. Ids added later wait in __id_added and are
+    merged in by the next page(); deleted ids are skipped when reached.
+
+    Records are encoded to JSON, and decoded outside of the incremental
+    reader of the snapshot, by the codec HBNB_JSON_CODEC selects, see
+    models.engine.codec. The snapshot is written and read incrementally.
+    With HBNB_FILE_LAZY=1, reload() only keeps the JSON text of each
+    record, indexed by class in __unloaded, and objects are built the
+    first time all() asks for their class.
+
+    HBNB_FILE_COMPACT=1 reloads lazily too, but keeps the records not
+    built yet in a ColumnStore per class, in __columns, instead of as JSON
+    text: packed arrays of numbers and timestamps and interned strings.
+    iter() walks them as objects built on the fly and not kept.
+
+    With HBNB_FILE_FORMAT=binary, the snapshot is written in the binary
+    format of models.engine.snapshot instead of JSON. reload() reads
+    either format, whichever the file holds, and the journal stays JSON.
+    The bytes of each record are cached in __records along with the
+    object they were encoded from, None for records not built, and kept
+    until save() finds the object changed or replaced. They come on top
+    of the JSON text of __fragments, which the journal still uses.
+    """
     __file_path = 'file.json'
     __objects = {}
+    __by_class = {}
+    __indexed = 0
+    __pending = {}
+    __fragments = {}
+    __records = {}
+    __journal = getenv("HBNB_FILE_JOURNAL") == "1"
+    __journal_limit = int(getenv("HBNB_FILE_JOURNAL_LIMIT", "1000"))
+    __journal_records = 0
+    __batch = None
+    __file_stat = None
+    __journal_ino = None
+    __journal_offset = 0
+    __lazy = getenv("HBNB_FILE_LAZY") == "1"
+    __unloaded = {}
+    __compact = getenv("HBNB_FILE_COMPACT") == "1"
+    __columns = {}
+    __codec = get_codec()
+    __binary = getenv("HBNB_FILE_FORMAT") == "binary"
+    __fk_attrs = ('state_id', 'city_id', 'place_id', 'user_id')
+    __fk_index = {}
+    __fk_values = {}
+    __place_amenity = {}
+    __amenity_place = {}
+    __id_order = {}
+    __id_added = {}
 
-    def all(self, cls=None):
+    def all(self, cls=None, load=None):
         """
         Returns a dictionary of models currently in storage.
 
         Args:
             cls (str, optional): Class name. Defaults to None.
+            load (list, optional): Relationships to load with the models.
+                Accepted for parity with DBStorage and ignored: the
+                relationship properties read the foreign key index.
 
         Returns:
             dict: If a class name is provided, it returns a dictionary
@@ -22,29 +119,378 @@ class FileStorage:
                   of all models currently in storage.
         """
         if cls:
-            objSameTypeCls = {}
-            for key, val in FileStorage.__objects.items():
-                if key.startswith(cls.__name__ + '.'):
-                    objSameTypeCls.update({key: val})
-            return objSameTypeCls
+            self.__hydrate(cls.__name__)
+            self.__check_index()
+            return dict(FileStorage.__by_class.get(cls.__name__, {}))
+        for name in list(FileStorage.__unloaded):
+            self.__hydrate(name)
         return FileStorage.__objects
 
+    def get(self, cls, id):
+        """
+        Returns one model of a class by id.
+
+        Args:
+            cls (class): The class of the model.
+            id (str): The id of the model.
+
+        Returns:
+            BaseModel: The model, or None if it is not in storage.
+        """
+        key = cls.__name__ + '.' + id
+        if FileStorage.__unloaded:
+            self.__hydrate(cls.__name__, key)
+        return FileStorage.__objects.get(key)
+
+    def count(self, cls=None):
+        """
+        Returns the number of models of a class, or of all models.
+
+        Args:
+            cls (class, optional): The class of the models to count.
+
+        Returns:
+            int: The number of models, built into objects or not.
+        """
+        if cls:
+            self.__check_index()
+            return len(FileStorage.__by_class.get(cls.__name__, ())) + \
+                len(FileStorage.__unloaded.get(cls.__name__, ()))
+        return len(FileStorage.__objects) + sum(
+            map(len, FileStorage.__unloaded.values()))
+
+    def keys(self, cls=None):
+        """
+        Returns the keys of the models of a class, or of all models.
+
+        Args:
+            cls (class, optional): The class of the keys to return.
+
+        Returns:
+            list: The "<class name>.<id>" keys, without building objects
+                  kept as JSON text by a lazy reload.
+        """
+        if cls:
+            self.__check_index()
+            return list(chain(
+                FileStorage.__by_class.get(cls.__name__, ()),
+                FileStorage.__unloaded.get(cls.__name__, ())))
+        return list(chain(FileStorage.__objects,
+                          *FileStorage.__unloaded.values()))
+
+    def iter(self, cls=None, batch_size=1000):
+        """
+        Yields the models of a class, or all models, one at a time.
+
+        Nothing is copied: the keys are read up front and each model is
+        looked up as it is reached, so models deleted meanwhile are
+        skipped. Records a lazy reload left as JSON text are decoded
+        batch_size at a time and not kept, so walking them holds one
+        batch in memory whatever the size of the store. Call save() on
+        such a model to keep changes made to it.
+
+        Args:
+            cls (class, optional): The class of the models to yield.
+            batch_size (int): The number of records decoded at a time.
+
+        Yields:
+            BaseModel: The models, built ones first.
+        """
+        if cls:
+            self.__check_index()
+            built = list(FileStorage.__by_class.get(cls.__name__, ()))
+            unloaded = {cls.__name__: list(
+                FileStorage.__unloaded.get(cls.__name__, ()))}
+        else:
+            built = list(FileStorage.__objects)
+            unloaded = {name: list(keys) for name, keys
+                        in FileStorage.__unloaded.items()}
+        for key in built:
+            obj = FileStorage.__objects.get(key)
+            if obj is not None:
+                yield obj
+        classes = self.__classes()
+        for name, keys in unloaded.items():
+            for start in range(0, len(keys), batch_size):
+                batch = keys[start:start + batch_size]
+                records = self.__stashed([
+                    key for key in batch if key not in FileStorage.__objects
+                    and key in FileStorage.__unloaded.get(name, ())])
+                for key in batch:
+                    obj = FileStorage.__objects.get(key)
+                    if obj is None and key in records:
+                        obj = classes[name].from_dict(records[key])
+                    if obj is not None:
+                        yield obj
+
+    def page(self, cls, limit=None, after=None):
+        """
+        Returns the models of a class in id order, starting after an id.
+
+        The start is found by bisecting the sorted ids of the class, so a
+        deep page costs the same as the first one.
+
+        Args:
+            cls (class): The class of the models to return.
+            limit (int, optional): The maximum number of models.
+            after (str, optional): The id the page starts after, usually
+                the last id of the previous page.
+
+        Returns:
+            list: The models, ordered by id.
+        """
+        order = self.__sorted_ids(cls.__name__)
+        index = 0 if after is None else bisect_right(order, after)
+        models = []
+        previous = None
+        while index < len(order) and (limit is None or len(models) < limit):
+            id = order[index]
+            index += 1
+            if id != previous:
+                previous = id
+                obj = self.get(cls, id)
+                if obj is not None:
+                    models.append(obj)
+        return models
+
+    def lookup(self, cls, attr, value):
+        """
+        Returns the models of a class whose foreign key has a given value.
+
+        Args:
+            cls (class): The class of the models to return.
+            attr (str): A foreign key attribute name, one of __fk_attrs.
+            value (str): The id the foreign key refers to.
+
+        Returns:
+            dict: The matching models of cls by key.
+        """
+        self.__hydrate(cls.__name__)
+        self.__refresh_links()
+        return dict(FileStorage.__fk_index.get(
+            (cls.__name__, attr), {}).get(value, {}))
+
+    def query(self, cls, order_by=None, limit=None, offset=None, load=None,
+              **filters):
+        """
+        Returns the models of a class that pass filters, in order.
+
+        An id filter is answered with get(), and an eq or in filter on a
+        foreign key from the foreign key index. Other queries scan the
+        models of cls. See Query for the filters and order_by.
+
+        Args:
+            cls (class): The class of the models to return.
+            order_by (str or list, optional): The sort keys.
+            limit (int, optional): The maximum number of models.
+            offset (int, optional): The number of models to skip.
+            load (list, optional): Ignored, as for all().
+
+        Returns:
+            list: The matching models.
+        """
+        query = Query(cls, order_by, limit, offset, **filters)
+        return query.apply(self.__candidates(query)[1])
+
+    def explain(self, cls, order_by=None, limit=None, offset=None,
+                load=None, **filters):
+        """
+        Returns how query() answers the same arguments, e.g.
+        "index City.state_id, order by name" or "scan Place, filter ...".
+        """
+        query = Query(cls, order_by, limit, offset, **filters)
+        path = self.__candidates(query)[0]
+        return ', '.join(filter(None, (path, query.describe())))
+
+    def amenities_of(self, place_id):
+        """
+        Returns the ids of the amenities linked to a place.
+
+        Args:
+            place_id (str): The id of the place.
+
+        Returns:
+            KeysView: A live view of the amenity ids, with O(1) membership.
+        """
+        self.__hydrate('Place')
+        self.__refresh_links()
+        return FileStorage.__place_amenity.get(place_id, {}).keys()
+
+    def places_with(self, amenity_id):
+        """
+        Returns the ids of the places linked to an amenity.
+
+        Args:
+            amenity_id (str): The id of the amenity.
+
+        Returns:
+            KeysView: A live view of the place ids, with O(1) membership.
+        """
+        self.__hydrate('Place')
+        self.__refresh_links()
+        return FileStorage.__amenity_place.get(amenity_id, {}).keys()
+
+    def link_amenity(self, place, amenity):
+        """Adds amenity to the amenity_ids of place"""
+        if amenity.id not in place.amenity_ids:
+            place.amenity_ids = place.amenity_ids + [amenity.id]
+
+    def unlink_amenity(self, place, amenity):
+        """Removes amenity from the amenity_ids of place"""
+        if amenity.id in place.amenity_ids:
+            place.amenity_ids = [amenity_id for amenity_id
+                                 in place.amenity_ids
+                                 if amenity_id != amenity.id]
+
     def new(self, obj):
         """Adds new object to storage dictionary"""
-        self.all().update({obj.to_dict()['__class__'] + '.' + obj.id: obj})
+        key = type(obj).__name__ + '.' + obj.id
+        self.__touch(key)
+        self.__put(key, obj)
+        FileStorage.__pending[key] = obj
+
+    def bulk_new(self, objs, chunk_size=None):
+        """Adds many new objects and writes the file once
+
+        Args:
+            objs (iterable): The new objects.
+            chunk_size: Accepted for parity with DBStorage and ignored.
+
+        Returns:
+            int: The number of objects added.
+        """
+        count = 0
+        for obj in objs:
+            self.new(obj)
+            count += 1
+        self.save()
+        return count
+
+    def bulk_update(self, cls, rows, chunk_size=None):
+        """Updates many objects of a class by id and writes the file once
+
+        Args:
+            cls (class): The class of the objects.
+            rows (iterable): Dictionaries holding the id and the new
+                             attribute values of each object; updated_at
+                             is set to now unless given.
+            chunk_size: Accepted for parity with DBStorage and ignored.
+
+        Returns:
+            int: The number of objects found and updated.
+        """
+        now = datetime.now()
+        count = 0
+        for row in rows:
+            obj = self.get(cls, row['id'])
+            if obj is None:
+                continue
+            obj.updated_at = now
+            for name, value in row.items():
+                if name != 'id':
+                    setattr(obj, name, value)
+            count += 1
+        self.save()
+        return count
 
     def save(self):
         """Saves storage dictionary to file"""
-        with open(FileStorage.__file_path, 'w') as f:
-            temp = {}
-            temp.update(FileStorage.__objects)
-            for key, val in temp.items():
-                temp[key] = val.to_dict()
-            json.dump(temp, f)
+        if FileStorage.__batch is not None:
+            return
+        changes = self.__encode_changes()
+        if not FileStorage.__journal:
+            self.__write_snapshot()
+            return
+        if not changes:
+            return
+        before = self.__stat(self.__journal_path())
+        with open(self.__journal_path(), 'a', encoding='utf-8') as f:
+            for key, encoded in changes.items():
+                if encoded is None:
+                    f.write(FileStorage.__codec.dumps(
+                        {'op': 'delete', 'key': key}) + '\n')
+                else:
+                    f.write('{"op": "set", "key": %s, "val": %s}\n'
+                            % encoded)
+        FileStorage.__journal_records += len(changes)
+        if before is None and FileStorage.__journal_offset == 0 or \
+                before is not None and \
+                before[:2] == (FileStorage.__journal_ino,
+                               FileStorage.__journal_offset):
+            # nobody else appended since our last read: skip our records
+            after = self.__stat(self.__journal_path())
+            FileStorage.__journal_ino = after[0]
+            FileStorage.__journal_offset = after[1]
+        # compacting once the journal outgrows half the store keeps the
+        # amortized cost of a save independent of the store size
+        if FileStorage.__journal_records > max(
+                FileStorage.__journal_limit, self.count() // 2):
+            self.__write_snapshot()
 
     def reload(self):
         """Loads storage dictionary from file"""
-        from models.base_model import BaseModel
+        self.__apply(self.__read_records())
+
+    def delete(self, obj=None):
+        """delete obj from __objects if it’s inside
+        """
+        if obj:
+            key = f"{type(obj).__name__}.{obj.id}"
+            if type(obj).__name__ == 'Amenity':
+                # like the place_amenity rows of the amenity in db mode
+                for place_id in list(self.places_with(obj.id)):
+                    place = FileStorage.__objects.get('Place.' + place_id)
+                    if place is not None:
+                        self.unlink_amenity(place, obj)
+            if key in self.__objects:
+                self.__touch(key)
+                self.__drop(key)
+                FileStorage.__pending[key] = None
+            elif key in FileStorage.__unloaded.get(type(obj).__name__, ()):
+                self.__touch(key)
+                self.__forget(key)
+                FileStorage.__pending[key] = None
+
+    def close(self):
+        """Deserialize the JSON file to objects if it changed"""
+        if self.__stat(FileStorage.__file_path) != FileStorage.__file_stat:
+            self.reload()
+            return
+        journal = self.__stat(self.__journal_path())
+        if journal is None:
+            if FileStorage.__journal_ino is not None:
+                self.reload()
+        elif journal[0] != FileStorage.__journal_ino or \
+                journal[1] < FileStorage.__journal_offset:
+            self.reload()
+        elif journal[1] > FileStorage.__journal_offset:
+            self.__apply(self.__read_journal())
+
+    @contextmanager
+    def batch(self):
+        """Defers persistence of the objects saved inside the block
+
+        The file is written once when the block exits. If the block raises,
+        objects added in it are removed, deleted ones are put back, and
+        objects saved or changed in it get their persisted state back.
+        Nested blocks join the outermost one.
+        """
+        if FileStorage.__batch is not None:
+            yield
+            return
+        dirty = set(map(id, BaseModel.collect_dirty(clear=False)))
+        FileStorage.__batch = {}
+        try:
+            yield
+        except BaseException:
+            self.__rollback(FileStorage.__batch, dirty)
+            raise
+        finally:
+            FileStorage.__batch = None
+        self.save()
+
+    def __classes(self):
+        """Returns the model classes by name"""
         from models.user import User
         from models.place import Place
         from models.state import State
@@ -52,28 +498,496 @@ class FileStorage:
         from models.amenity import Amenity
         from models.review import Review
 
-        classes = {
-                    'BaseModel': BaseModel, 'User': User, 'Place': Place,
-                    'State': State, 'City': City, 'Amenity': Amenity,
-                    'Review': Review
-                  }
+        return {
+                'BaseModel': BaseModel, 'User': User, 'Place': Place,
+                'State': State, 'City': City, 'Amenity': Amenity,
+                'Review': Review
+               }
+
+    def __apply(self, records):
+        """Stores the objects of records, dropping keys deleted by them
+
+        Args:
+            records (iterable): The key, stored dictionary and its JSON text
+                                of each record, with None as dictionary and
+                                text for deleted keys. The text of records
+                                read from a binary snapshot is None.
+        """
+        classes = self.__classes()
+        for key, val, text in records:
+            if val is None:
+                if key in FileStorage.__objects:
+                    self.__drop(key)
+                self.__forget(key)
+                continue
+            fragment = None if text is None else \
+                FileStorage.__codec.dumps(key) + ': ' + text
+            if (FileStorage.__lazy or FileStorage.__compact) and \
+                    key not in FileStorage.__objects:
+                self.__stash(key, fragment, val)
+            else:
+                obj = classes[val['__class__']].from_dict(val)
+                self.__put(key, obj)
+                if fragment is not None:
+                    FileStorage.__fragments[key] = fragment
+
+    def __hydrate(self, name, key=None):
+        """Builds the objects kept as JSON text by reload()
+
+        Args:
+            name (str): The class name of the objects to build.
+            key (str, optional): The only key to build. Defaults to all
+                                 the unloaded keys of the class.
+        """
+        if key is None:
+            keys = list(FileStorage.__unloaded.get(name, ()))
+        elif key in FileStorage.__unloaded.get(name, ()):
+            keys = [key]
+        else:
+            keys = None
+        if not keys:
+            return
+        cls = self.__classes()[name]
+        records = self.__stashed(keys)
+        if key is None:
+            del FileStorage.__unloaded[name]
+            FileStorage.__columns.pop(name, None)
+        for key in keys:
+            fragment = FileStorage.__fragments.get(key)
+            self.__put(key, cls.from_dict(records[key]))
+            if fragment is not None:
+                FileStorage.__fragments[key] = fragment
+
+    def __stash(self, key, fragment, val=None):
+        """Keeps the record of key without building its object
+
+        Args:
+            key (str): The key of the record.
+            fragment (str): The '"key": {...}' JSON text of the record,
+                            or None to encode it from val.
+            val (dict, optional): The record, decoded from fragment when
+                                  it is needed and not given.
+        """
+        name = key.partition('.')[0]
+        FileStorage.__unloaded.setdefault(name, {})[key] = None
+        FileStorage.__records.pop(key, None)
+        if FileStorage.__compact:
+            if val is None:
+                val = FileStorage.__codec.loads('{' + fragment + '}')[key]
+            FileStorage.__columns.setdefault(name, ColumnStore()).add(key,
+                                                                      val)
+        else:
+            if fragment is None:
+                fragment = FileStorage.__codec.dumps(key) + ': ' + \
+                    FileStorage.__codec.dumps(val)
+            FileStorage.__fragments[key] = fragment
+        self.__index_id(key)
+
+    def __stashed(self, keys):
+        """Returns the records of keys not built into objects, by key"""
+        if FileStorage.__compact:
+            records = {}
+            for key in keys:
+                name = key.partition('.')[0]
+                record = FileStorage.__columns[name].get(key, name)
+                if record is not None:
+                    records[key] = record
+            return records
+        return FileStorage.__codec.loads('{' + ','.join(
+            FileStorage.__fragments[key] for key in keys) + '}')
+
+    def __stashed_text(self, key):
+        """Returns the '"key": {...}' JSON text of a record not built"""
+        fragment = FileStorage.__fragments.get(key)
+        if fragment is None:
+            codec = FileStorage.__codec
+            fragment = codec.dumps(key) + ': ' + codec.dumps(
+                self.__stashed([key])[key])
+        return fragment
+
+    def __candidates(self, query):
+        """Returns the access path of a query and the models it yields"""
+        name = query.cls.__name__
+        for attr, op, value in query.conditions:
+            if attr == 'id' and op in ('eq', 'in'):
+                ids = [value] if op == 'eq' else value
+                objs = (self.get(query.cls, id) for id in dict.fromkeys(ids))
+                return 'get {}.id'.format(name), filter(None, objs)
+        for attr, op, value in query.conditions:
+            values = [value] if op == 'eq' else value
+            if attr in FileStorage.__fk_attrs and op in ('eq', 'in') and \
+                    all(values):
+                self.__hydrate(name)
+                self.__refresh_links()
+                index = FileStorage.__fk_index.get((name, attr), {})
+                return 'index {}.{}'.format(name, attr), chain.from_iterable(
+                    index.get(value, {}).values()
+                    for value in dict.fromkeys(values))
+        self.__hydrate(name)
+        self.__check_index()
+        return 'scan {}'.format(name), \
+            FileStorage.__by_class.get(name, {}).values()
+
+    def __forget(self, key):
+        """Removes key from the records not built into objects yet"""
+        FileStorage.__fragments.pop(key, None)
+        FileStorage.__records.pop(key, None)
+        name = key.partition('.')[0]
+        unloaded = FileStorage.__unloaded.get(name)
+        if unloaded:
+            unloaded.pop(key, None)
+        if name in FileStorage.__columns:
+            FileStorage.__columns[name].discard(key)
+
+    def __put(self, key, obj):
+        """Stores obj under key in __objects and the class index"""
+        if key not in FileStorage.__objects:
+            FileStorage.__indexed += 1
+            if FileStorage.__unloaded:
+                self.__forget(key)
+            self.__index_id(key)
+        FileStorage.__objects[key] = obj
+        FileStorage.__fragments.pop(key, None)
+        FileStorage.__by_class.setdefault(key.partition('.')[0], {})[key] = obj
+        self.__index_fk(key, obj)
+        self.__index_amenities(key, obj)
+
+    def __drop(self, key):
+        """Removes key from __objects and the class index"""
+        del FileStorage.__objects[key]
+        FileStorage.__fragments.pop(key, None)
+        FileStorage.__by_class.get(key.partition('.')[0], {}).pop(key, None)
+        FileStorage.__indexed -= 1
+        self.__unindex_fk(key)
+        self.__unindex_amenities(key)
+
+    def __index_fk(self, key, obj):
+        """Files obj under the current values of its foreign keys"""
+        if key in FileStorage.__fk_values:
+            self.__unindex_fk(key)
+        values = tuple(getattr(obj, attr, None)
+                       for attr in FileStorage.__fk_attrs)
+        if not any(values):
+            return
+        name = key.partition('.')[0]
+        for attr, value in zip(FileStorage.__fk_attrs, values):
+            if value:
+                FileStorage.__fk_index.setdefault(
+                    (name, attr), {}).setdefault(value, {})[key] = obj
+        FileStorage.__fk_values[key] = values
+
+    def __index_amenities(self, key, obj):
+        """Files the amenity links of a Place in both directions"""
+        name, _, place_id = key.partition('.')
+        if name != 'Place':
+            return
+        self.__unindex_amenities(key)
+        amenity_ids = getattr(obj, 'amenity_ids', None)
+        if not amenity_ids:
+            return
+        FileStorage.__place_amenity[place_id] = dict.fromkeys(amenity_ids)
+        for amenity_id in amenity_ids:
+            FileStorage.__amenity_place.setdefault(
+                amenity_id, {})[place_id] = None
+
+    def __unindex_amenities(self, key):
+        """Removes the amenity links of a Place from both directions"""
+        name, _, place_id = key.partition('.')
+        if name != 'Place':
+            return
+        for amenity_id in FileStorage.__place_amenity.pop(place_id, ()):
+            places = FileStorage.__amenity_place[amenity_id]
+            del places[place_id]
+            if not places:
+                del FileStorage.__amenity_place[amenity_id]
+
+    def __refresh_links(self):
+        """Re-files the objects whose foreign keys changed since last time"""
+        self.__check_index()
+        for obj in BaseModel.collect_relinked():
+            key = type(obj).__name__ + '.' + obj.id
+            if FileStorage.__objects.get(key) is obj:
+                self.__index_fk(key, obj)
+                self.__index_amenities(key, obj)
+
+    def __index_id(self, key):
+        """Queues the id of a new key for the sorted ids of its class"""
+        name, _, id = key.partition('.')
+        if name in FileStorage.__id_order:
+            FileStorage.__id_added.setdefault(name, []).append(id)
+
+    def __sorted_ids(self, name):
+        """Returns the sorted ids of a class, merging the queued ones
+
+        The list may hold deleted ids, and ids added twice next to each
+        other; page() skips both. It is built again from the stored keys
+        when more ids are queued than it holds, as after a reload.
+        """
+        self.__check_index()
+        order = FileStorage.__id_order.get(name)
+        added = FileStorage.__id_added.pop(name, ())
+        if order is None or len(added) > len(order):
+            order = sorted(key.partition('.')[2] for key in chain(
+                FileStorage.__by_class.get(name, ()),
+                FileStorage.__unloaded.get(name, ())))
+            FileStorage.__id_order[name] = order
+        elif added:
+            # a sorted run followed by a short one: timsort merges them
+            order.extend(added)
+            order.sort()
+        return order
+
+    def __unindex_fk(self, key):
+        """Removes key from the foreign key index"""
+        values = FileStorage.__fk_values.pop(key, None)
+        if values is None:
+            return
+        name = key.partition('.')[0]
+        for attr, value in zip(FileStorage.__fk_attrs, values):
+            if value:
+                children = FileStorage.__fk_index[(name, attr)][value]
+                del children[key]
+                if not children:
+                    del FileStorage.__fk_index[(name, attr)][value]
+
+    def __check_index(self):
+        """Rebuilds the class index if __objects was changed behind its back
+
+        all() hands out the live __objects dictionary, so callers that add
+        or remove keys directly bypass new() and delete(). A differing
+        entry count is the cheap signal that the index went stale.
+        """
+        if FileStorage.__indexed == len(FileStorage.__objects):
+            return
+        FileStorage.__by_class.clear()
+        FileStorage.__fk_index.clear()
+        FileStorage.__fk_values.clear()
+        FileStorage.__place_amenity.clear()
+        FileStorage.__amenity_place.clear()
+        FileStorage.__id_order.clear()
+        FileStorage.__id_added.clear()
+        for key, obj in FileStorage.__objects.items():
+            FileStorage.__by_class.setdefault(
+                key.partition('.')[0], {})[key] = obj
+            self.__index_fk(key, obj)
+            self.__index_amenities(key, obj)
+        FileStorage.__indexed = len(FileStorage.__objects)
+
+    def __journal_path(self):
+        """Returns the path of the journal kept next to the snapshot"""
+        return FileStorage.__file_path + '.journal'
+
+    def __stat(self, path):
+        """Returns the inode, size and modification time of path, or None"""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def __write_snapshot(self):
+        """Rewrites the whole snapshot file and drops the journal"""
+        if FileStorage.__binary:
+            records = {}
+            with open(FileStorage.__file_path, 'wb') as f:
+                snapshot.write_encoded(f, self.__encoded_records(records))
+            FileStorage.__records = records
+        else:
+            with open(FileStorage.__file_path, 'w', encoding='utf-8') as f:
+                write_items(f, chain(
+                    (self.__fragment(key, obj)
+                     for key, obj in FileStorage.__objects.items()),
+                    (self.__stashed_text(key)
+                     for keys in FileStorage.__unloaded.values()
+                     for key in keys)))
+        FileStorage.__file_stat = self.__stat(FileStorage.__file_path)
+        if os.path.exists(self.__journal_path()):
+            os.remove(self.__journal_path())
+        FileStorage.__journal_records = 0
+        FileStorage.__journal_ino = None
+        FileStorage.__journal_offset = 0
+
+    def __encoded_records(self, records, batch=1000):
+        """Yields the binary record of every object and record not built
+
+        The cached bytes of __records are reused while they were encoded
+        from the same object, or from the record not built yet.
+
+        Args:
+            records (dict): Filled with the object and bytes of each key,
+                            the cache of the next save.
+            batch (int): The number of records not built decoded at once.
+        """
+        cache = FileStorage.__records
+        codec = FileStorage.__codec
+        for key, obj in FileStorage.__objects.items():
+            cached = cache.get(key)
+            if cached is None or cached[0] is not obj:
+                cached = (obj, snapshot.encode(
+                    key, obj.to_dict(memoize=False), codec))
+            records[key] = cached
+            yield cached[1]
+        for keys in FileStorage.__unloaded.values():
+            keys = list(keys)
+            for i in range(0, len(keys), batch):
+                keys_batch = keys[i:i + batch]
+                missing = [key for key in keys_batch
+                           if cache.get(key, (True,))[0] is not None]
+                stashed = self.__stashed(missing) if missing else {}
+                for key in keys_batch:
+                    if key in stashed:
+                        records[key] = (None, snapshot.encode(
+                            key, stashed[key], codec))
+                    elif key in cache:
+                        records[key] = cache[key]
+                    else:
+                        continue
+                    yield records[key][1]
+
+    def __fragment(self, key, obj):
+        """Returns the cached '"key": {...}' JSON text of a stored object"""
+        fragment = FileStorage.__fragments.get(key)
+        if fragment is None:
+            codec = FileStorage.__codec
+            fragment = codec.dumps(key) + ': ' + codec.dumps(
+                obj.to_dict(memoize=False))
+            FileStorage.__fragments[key] = fragment
+        return fragment
+
+    def __encode_changes(self):
+        """Serializes the objects changed since the last save
+
+        Returns:
+            dict: The JSON encoded key and value of every changed object,
+                  or None for deleted ones, by key.
+        """
+        changes = FileStorage.__pending
+        FileStorage.__pending = {}
+        for obj in BaseModel.collect_dirty():
+            key = type(obj).__name__ + '.' + obj.id
+            if FileStorage.__objects.get(key) is obj:
+                changes[key] = obj
+                self.__index_fk(key, obj)
+                self.__index_amenities(key, obj)
+        for key, obj in list(changes.items()):
+            if obj is None:
+                continue
+            if FileStorage.__objects.get(key) is not obj:
+                del changes[key]
+                continue
+            encoded = (FileStorage.__codec.dumps(key),
+                       FileStorage.__codec.dumps(obj.to_dict(memoize=False)))
+            FileStorage.__fragments[key] = ': '.join(encoded)
+            FileStorage.__records.pop(key, None)
+            changes[key] = encoded
+        return changes
+
+    def __read_records(self):
+        """Reads the snapshot followed by the journal records
+
+        Yields:
+            tuple: The key, stored dictionary and its JSON text of each
+                   record, with None as dictionary and text for keys
+                   deleted by the journal, and as text for records of a
+                   binary snapshot.
+        """
+        FileStorage.__file_stat = self.__stat(FileStorage.__file_path)
         try:
-            temp = {}
-            with open(FileStorage.__file_path, 'r') as f:
-                temp = json.load(f)
-                for key, val in temp.items():
-                    self.all()[key] = classes[val['__class__']](**val)
+            if snapshot.is_binary(FileStorage.__file_path):
+                # only JSON text needs the timestamps formatted
+                with open(FileStorage.__file_path, 'rb') as f:
+                    for key, val in snapshot.iter_records(
+                            f, FileStorage.__codec,
+                            datetimes=not FileStorage.__lazy):
+                        yield key, val, None
+            else:
+                with open(FileStorage.__file_path, 'r', encoding='utf-8') as f:
+                    yield from iter_items(f)
         except FileNotFoundError:
             pass
+        FileStorage.__journal_ino = None
+        yield from self.__read_journal()
 
-    def delete(self, obj=None):
-        """delete obj from __objects if it’s inside
+    def __read_journal(self):
+        """Reads the journal records past __journal_offset
+
+        A torn last line, left by a crash in the middle of an append, is
+        left for the next read.
+
+        Yields:
+            tuple: The same records as __read_records().
         """
-        if obj:
-            key = f"{type(obj).__name__}.{obj.id}"
-            if key in self.__objects:
-                del self.__objects[key]
+        journal = self.__stat(self.__journal_path())
+        if journal is None or journal[0] != FileStorage.__journal_ino:
+            FileStorage.__journal_offset = 0
+            FileStorage.__journal_records = 0
+        if journal is None:
+            FileStorage.__journal_ino = None
+            return
+        FileStorage.__journal_ino = journal[0]
+        with open(self.__journal_path(), 'rb') as f:
+            f.seek(FileStorage.__journal_offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                FileStorage.__journal_offset += len(line)
+                try:
+                    record = FileStorage.__codec.loads(line)
+                except ValueError:
+                    continue
+                FileStorage.__journal_records += 1
+                val = record.get('val')
+                yield (record['key'], val,
+                       None if val is None else FileStorage.__codec.dumps(val))
 
-    def close(self):
-        """Deserialize the JSON file to objects"""
-        self.reload()
+    def __touch(self, key):
+        """Remembers the state of key before a batch first changes it"""
+        if FileStorage.__batch is not None and \
+                key not in FileStorage.__batch:
+            obj = FileStorage.__objects.get(key)
+            if obj is None and key in FileStorage.__unloaded.get(
+                    key.partition('.')[0], ()):
+                fragment = self.__stashed_text(key)
+            else:
+                fragment = FileStorage.__fragments.get(key)
+            FileStorage.__batch[key] = (obj, fragment)
+
+    def __rollback(self, touched, dirty):
+        """Undoes the changes made inside a failed batch
+
+        Args:
+            touched (dict): The object and cached fragment each key had
+                            before the batch passed it to new() or delete().
+            dirty (set): The ids of the objects already dirty before the
+                         batch started.
+        """
+        for obj in BaseModel.collect_dirty(clear=False):
+            key = type(obj).__name__ + '.' + obj.id
+            if id(obj) not in dirty and key not in touched and \
+                    FileStorage.__objects.get(key) is obj:
+                touched[key] = (obj, FileStorage.__fragments.get(key))
+        classes = self.__classes()
+        records = None
+        for key, (obj, fragment) in touched.items():
+            FileStorage.__pending.pop(key, None)
+            if obj is None:
+                if key in FileStorage.__objects:
+                    self.__drop(key)
+                if fragment is not None:
+                    # the record was never built into an object
+                    self.__stash(key, fragment)
+                continue
+            if fragment is not None:
+                val = FileStorage.__codec.loads('{' + fragment + '}')[key]
+            else:
+                if records is None:
+                    records = {k: v for k, v, _ in self.__read_records()}
+                val = records.get(key)
+            if val is None:
+                # never persisted, so there is nothing to revert to
+                self.__put(key, obj)
+                continue
+            obj = classes[val['__class__']].from_dict(val)
+            self.__put(key, obj)
+            if fragment is not None:
+                FileStorage.__fragments[key] = fragment
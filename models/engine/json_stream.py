@@ -0,0 +1,112 @@
+#!/usr/bin/python3
+"""This module reads and writes the members of a large JSON object
+incrementally"""
+import json
+
+_decoder = json.JSONDecoder()
+_whitespace = ' \t\n\r'
+
+
+def iter_items(f, chunk_size=1 << 16):
+    """Yields the members of the JSON object stored in a text file
+
+    Only the member being decoded and one chunk of text are held in
+    memory, whatever the size of the file.
+
+    Args:
+        f (file): A text file holding one JSON object.
+        chunk_size (int): The number of characters read at a time.
+
+    Yields:
+        tuple: The key, the decoded value and the JSON text of the value
+               of each member, in file order.
+
+    Raises:
+        ValueError: If the file does not hold one JSON object.
+    """
+    buf = ''
+    pos = 0
+    eof = False
+
+    def fill(size=chunk_size):
+        """Reads more text, dropping what was already consumed"""
+        nonlocal buf, pos, eof
+        chunk = f.read(max(size, len(buf) - pos))
+        buf = buf[pos:] + chunk
+        pos = 0
+        eof = not chunk
+        return not eof
+
+    def skip():
+        """Moves past whitespace and returns the next character or ''"""
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in _whitespace:
+                pos += 1
+            if pos < len(buf) or not fill():
+                return buf[pos:pos + 1]
+
+    def decode():
+        """Decodes the JSON value at pos, reading more text if needed"""
+        nonlocal pos
+        while True:
+            try:
+                value, end = _decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof or not fill():
+                    raise
+                continue
+            # a value touching the end of the text may be cut short
+            if end < len(buf) or eof or not fill():
+                break
+        start, pos = pos, end
+        return value, buf[start:end]
+
+    if skip() != '{':
+        raise json.JSONDecodeError("Expecting '{'", buf, pos)
+    pos += 1
+    if skip() == '}':
+        return
+    while True:
+        if skip() != '"':
+            raise json.JSONDecodeError("Expecting property name", buf, pos)
+        key, _ = decode()
+        if skip() != ':':
+            raise json.JSONDecodeError("Expecting ':' delimiter", buf, pos)
+        pos += 1
+        skip()
+        value, text = decode()
+        yield key, value, text
+        separator = skip()
+        pos += 1
+        if separator == '}':
+            return
+        if separator != ',':
+            raise json.JSONDecodeError("Expecting ',' delimiter", buf, pos)
+
+
+def write_items(f, members, chunk_size=1 << 16):
+    """Writes a JSON object member by member to a text file
+
+    The members are joined into chunks of about chunk_size characters
+    as they come, so the text of the whole object is never built.
+
+    Args:
+        f (file): The text file to write to.
+        members (iterable): The '"key": value' JSON text of each member.
+        chunk_size (int): The number of characters written at a time.
+    """
+    parts = ['{']
+    size = 0
+    separator = ''
+    for member in members:
+        parts.append(separator)
+        parts.append(member)
+        separator = ', '
+        size += len(member)
+        if size >= chunk_size:
+            f.write(''.join(parts))
+            parts = []
+            size = 0
+    parts.append('}')
+    f.write(''.join(parts))
@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+"""This module brings the indexes of an existing database up to date
+
+Base.metadata.create_all() creates the tables that are missing, with
+their indexes, but leaves existing tables alone, so an index declared
+on a model after its table was created never reaches the database.
+migrate() creates those indexes; DBStorage.reload() and
+AsyncDBStorage.reload() run it.
+"""
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection
+from models.base_model import Base
+
+
+def missing_indexes(bind):
+    """Returns the declared indexes the database does not have
+
+    An index is also considered present when an existing index of its
+    table starts with the same columns, like the one MySQL creates for
+    each foreign key constraint.
+
+    Args:
+        bind (sqlalchemy.Engine): The engine of the database, or a
+            connection to it.
+
+    Returns:
+        list: The sqlalchemy.Index objects to create.
+    """
+    inspector = inspect(bind)
+    tables = set(inspector.get_table_names())
+    missing = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in tables:
+            continue
+        existing = inspector.get_indexes(table.name)
+        primary = inspector.get_pk_constraint(table.name)
+        existing.append({'name': primary.get('name'),
+                         'column_names': primary['constrained_columns']})
+        for index in table.indexes:
+            columns = [column.name for column in index.columns]
+            if not any(ix['name'] == index.name or
+                       ix['column_names'][:len(columns)] == columns
+                       for ix in existing):
+                missing.append(index)
+    return missing
+
+
+def migrate(bind):
+    """Creates the declared indexes the database does not have
+
+    Given a connection, the indexes are created in its transaction, as
+    AsyncDBStorage does through run_sync().
+
+    Args:
+        bind (sqlalchemy.Engine): The engine of the database, or a
+            connection to it.
+
+    Returns:
+        list: The names of the indexes created.
+    """
+    missing = missing_indexes(bind)
+    if missing and isinstance(bind, Connection):
+        for index in missing:
+            index.create(bind)
+    elif missing:
+        with bind.begin() as conn:
+            for index in missing:
+                index.create(conn)
+    return [index.name for index in missing]
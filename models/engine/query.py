@@ -0,0 +1,129 @@
+#!/usr/bin/python3
+"""This module parses the arguments of storage.query() for both engines"""
+import operator
+
+
+class Query:
+    """A query on the models of one class
+
+    Filters are keyword arguments named after an attribute, optionally
+    followed by two underscores and an operator, e.g. name="Texas",
+    price_by_night__gte=100 or state_id__in=[...]. The operators are
+    eq (the default), ne, lt, lte, gt, gte and in.
+
+    order_by is an attribute name, or a list of them, each prefixed with
+    "-" for descending order. Missing values (None) sort first, as they
+    do in SQL.
+
+    Attributes:
+        cls (class): The class of the models.
+        conditions (list): The (attribute, operator, value) filters.
+        order (list): The (attribute, descending) sort keys.
+        limit (int): The maximum number of models, or None.
+        offset (int): The number of models to skip.
+    """
+    operators = {
+        'eq': operator.eq,
+        'ne': operator.ne,
+        'lt': operator.lt,
+        'lte': operator.le,
+        'gt': operator.gt,
+        'gte': operator.ge,
+        'in': lambda value, values: value in values,
+    }
+
+    def __init__(self, cls, order_by=None, limit=None, offset=None,
+                 **filters):
+        """Parses and checks the arguments of a query
+
+        Raises:
+            AttributeError: If an attribute is not one of cls.
+            ValueError: If an operator is unknown, an in filter is not
+                given a list, or limit or offset is negative.
+        """
+        self.cls = cls
+        self.conditions = []
+        for name, value in filters.items():
+            attr, _, op = name.partition('__')
+            op = op or 'eq'
+            if op not in self.operators:
+                raise ValueError("unknown operator {} in {}".format(op, name))
+            if op == 'in':
+                if isinstance(value, str):
+                    raise ValueError("{} needs a list".format(name))
+                value = list(value)
+            self.conditions.append((self.__check(attr), op, value))
+        if isinstance(order_by, str):
+            order_by = [order_by]
+        self.order = [(self.__check(key.lstrip('-')), key.startswith('-'))
+                      for key in order_by or ()]
+        for name, value in (('limit', limit), ('offset', offset)):
+            if value is not None and value < 0:
+                raise ValueError("{} must not be negative".format(name))
+        self.limit = limit
+        self.offset = offset or 0
+
+    def __check(self, attr):
+        """Returns attr if it is an attribute of the queried class"""
+        if attr != 'id' and not hasattr(self.cls, attr):
+            raise AttributeError("{} has no attribute {}"
+                                 .format(self.cls.__name__, attr))
+        return attr
+
+    def matches(self, obj):
+        """Tells whether obj passes every filter
+
+        None compares as SQL NULL does once SQLAlchemy turns == None and
+        != None into IS NULL and IS NOT NULL: a missing value only passes
+        eq None, and ne None passes every other value.
+        """
+        for attr, op, value in self.conditions:
+            actual = getattr(obj, attr, None)
+            if actual is None or value is None:
+                if op == 'eq' and actual is None and value is None:
+                    continue
+                if op == 'ne' and actual is not None:
+                    continue
+                return False
+            if not self.operators[op](actual, value):
+                return False
+        return True
+
+    def apply(self, objs):
+        """Filters, sorts and slices objs
+
+        Args:
+            objs (iterable): The candidate models.
+
+        Returns:
+            list: The models of the result, in order.
+        """
+        result = [obj for obj in objs if self.matches(obj)]
+        for attr, descending in reversed(self.order):
+            result.sort(key=lambda obj: self.__sort_key(obj, attr),
+                        reverse=descending)
+        end = None if self.limit is None else self.offset + self.limit
+        return result[self.offset:end]
+
+    @staticmethod
+    def __sort_key(obj, attr):
+        """Sorts missing values before all others"""
+        value = getattr(obj, attr, None)
+        return (value is not None, value)
+
+    def describe(self):
+        """Returns the filters, order and slice of the query as text"""
+        parts = []
+        if self.conditions:
+            parts.append('filter ' + ' and '.join(
+                '{} {} {!r}'.format(attr, op, value)
+                for attr, op, value in self.conditions))
+        if self.order:
+            parts.append('order by ' + ', '.join(
+                ('-' if descending else '') + attr
+                for attr, descending in self.order))
+        if self.offset:
+            parts.append('offset {}'.format(self.offset))
+        if self.limit is not None:
+            parts.append('limit {}'.format(self.limit))
+        return ', '.join(parts)
@@ -0,0 +1,241 @@
+#!/usr/bin/python3
+"""This module reads and writes the binary snapshot format of FileStorage
+
+A binary snapshot starts with MAGIC, followed by one record per model:
+
+    class       1 byte, the index of the class name in class_names, or
+                255 when the name follows the length
+    length      4 bytes, the number of bytes of the record past this field
+    [name]      1 byte length and the UTF-8 class name, for class 255
+    id          2 bytes length and the UTF-8 id
+    created_at  8 bytes, microseconds since 1970-01-01
+    updated_at  8 bytes, the same
+    attributes  the other attributes, as UTF-8 JSON text
+
+Integers are little endian. A timestamp that is missing or not in ISO
+format is stored as no_time and kept with the other attributes. The key
+of a record is "<class name>.<id>", as FileStorage.new() makes it.
+
+FileStorage reads both formats, telling them apart by MAGIC, and writes
+the one HBNB_FILE_FORMAT names. Convert a file with:
+
+    ./convert_snapshot.py <source> <target> json|binary
+"""
+import os
+import struct
+import tempfile
+from datetime import datetime, timedelta
+from models.engine.codec import JsonCodec
+from models.engine.json_stream import iter_items, write_items
+
+MAGIC = b'\x89HBNB\r\n\x1a'
+class_names = ('BaseModel', 'User', 'Place', 'State', 'City', 'Amenity',
+               'Review')
+no_time = -2 ** 63
+
+_class_ids = {name: i for i, name in enumerate(class_names)}
+_header = struct.Struct('<BI')
+_name = struct.Struct('<B')
+_id = struct.Struct('<H')
+_times = struct.Struct('<qq')
+_epoch = datetime(1970, 1, 1)
+_microsecond = timedelta(microseconds=1)
+_timestamps = ('created_at', 'updated_at')
+
+
+def is_binary(path):
+    """Tells whether the file at path is a binary snapshot
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def encode(key, record, codec=None):
+    """Returns the bytes of one record
+
+    Args:
+        key (str): The "<class name>.<id>" key of the record.
+        record (dict): The record, as to_dict() returns it.
+        codec (JsonCodec, optional): Encodes the other attributes.
+    """
+    record = dict(record)
+    name = record.pop('__class__', None) or key.partition('.')[0]
+    times = []
+    for attr in _timestamps:
+        value = record.get(attr)
+        try:
+            times.append((datetime.fromisoformat(value) - _epoch) //
+                         _microsecond)
+        except (TypeError, ValueError):
+            times.append(no_time)
+        else:
+            del record[attr]
+    id = str(record.pop('id', key.partition('.')[2])).encode()
+    attrs = (codec or JsonCodec()).dumps(record).encode()
+    class_id = _class_ids.get(name, 255)
+    parts = [b'', _id.pack(len(id)), id, _times.pack(*times), attrs]
+    if class_id == 255:
+        name = name.encode()
+        parts[0] = _name.pack(len(name)) + name
+    size = sum(map(len, parts))
+    return _header.pack(class_id, size) + b''.join(parts)
+
+
+def write_records(f, records, codec=None, chunk_size=1 << 16):
+    """Writes a binary snapshot
+
+    Args:
+        f (file): The binary file to write to.
+        records (iterable): The key and the dictionary of each record.
+        codec (JsonCodec, optional): Encodes the other attributes.
+        chunk_size (int): The number of bytes written at a time.
+    """
+    codec = codec or JsonCodec()
+    write_encoded(f, (encode(key, record, codec) for key, record in records),
+                  chunk_size)
+
+
+def write_encoded(f, encoded, chunk_size=1 << 16):
+    """Writes a binary snapshot of records already encoded
+
+    Args:
+        f (file): The binary file to write to.
+        encoded (iterable): The bytes encode() returned for each record.
+        chunk_size (int): The number of bytes written at a time.
+    """
+    parts = [MAGIC]
+    size = 0
+    for data in encoded:
+        parts.append(data)
+        size += len(data)
+        if size >= chunk_size:
+            f.write(b''.join(parts))
+            parts = []
+            size = 0
+    f.write(b''.join(parts))
+
+
+def iter_records(f, codec=None, chunk_size=1 << 20, datetimes=False):
+    """Yields the records of a binary snapshot
+
+    The file is read chunk_size bytes at a time, and the attributes of
+    all the records a chunk holds are decoded by one codec.loads() call.
+
+    Args:
+        f (file): A binary file positioned at MAGIC.
+        codec (JsonCodec, optional): Decodes the other attributes.
+        chunk_size (int): The number of bytes read at a time.
+        datetimes (bool): Yields the timestamps as datetime objects,
+                          which BaseModel.from_dict() takes as they are,
+                          rather than formatting them as to_dict() does.
+
+    Yields:
+        tuple: The key and the dictionary of each record.
+
+    Raises:
+        ValueError: If the file is not a binary snapshot, or ends in the
+                    middle of a record.
+    """
+    codec = codec or JsonCodec()
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError("not a binary snapshot")
+    buf = b''
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            if buf:
+                raise ValueError("truncated binary snapshot")
+            return
+        buf += chunk
+        heads = []
+        attrs = []
+        pos = 0
+        while len(buf) - pos >= _header.size:
+            class_id, size = _header.unpack_from(buf, pos)
+            end = pos + _header.size + size
+            if end > len(buf):
+                break
+            pos += _header.size
+            if class_id == 255:
+                length = buf[pos]
+                name = buf[pos + 1:pos + 1 + length].decode()
+                pos += 1 + length
+            else:
+                name = class_names[class_id]
+            length = _id.unpack_from(buf, pos)[0]
+            pos += _id.size
+            id = buf[pos:pos + length].decode()
+            pos += length
+            heads.append((name, id, _times.unpack_from(buf, pos)))
+            attrs.append(buf[pos + _times.size:end])
+            pos = end
+        buf = buf[pos:]
+        if not heads:
+            continue
+        values = codec.loads(b'[' + b','.join(attrs) + b']')
+        for (name, id, times), value in zip(heads, values):
+            record = {'id': id}
+            for attr, time in zip(_timestamps, times):
+                if time != no_time:
+                    time = _epoch + time * _microsecond
+                    record[attr] = time if datetimes else time.isoformat()
+            record.update(value)
+            record['__class__'] = name
+            yield name + '.' + id, record
+
+
+def convert(source, target, fmt):
+    """Rewrites the snapshot at source in the format fmt at target
+
+    The records go to a temporary file next to target, which then
+    replaces it, so source and target may be the same file.
+
+    Args:
+        source (str): The path of a JSON or binary snapshot.
+        target (str): The path to write.
+        fmt (str): json or binary.
+
+    Returns:
+        int: The number of records written.
+
+    Raises:
+        ValueError: If fmt is unknown.
+    """
+    if fmt not in ('json', 'binary'):
+        raise ValueError("unknown format {}".format(fmt))
+    codec = JsonCodec()
+    count = 0
+
+    def counted(records):
+        """Yields records, counting them"""
+        nonlocal count
+        for record in records:
+            count += 1
+            yield record
+
+    binary = is_binary(source)
+    with open(source, 'rb' if binary else 'r',
+              encoding=None if binary else 'utf-8') as src:
+        if binary:
+            records = counted(iter_records(src, codec))
+        else:
+            records = counted((key, val) for key, val, _ in iter_items(src))
+        fd, path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(target)))
+        try:
+            with open(fd, 'wb' if fmt == 'binary' else 'w',
+                      encoding=None if fmt == 'binary' else 'utf-8') as dst:
+                if fmt == 'binary':
+                    write_records(dst, records, codec)
+                else:
+                    write_items(dst, (codec.dumps(key) + ': ' +
+                                      codec.dumps(val)
+                                      for key, val in records))
+        except BaseException:
+            os.remove(path)
+            raise
+    os.replace(path, target)
+    return count
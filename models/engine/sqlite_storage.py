@@ -0,0 +1,61 @@
+#!/usr/bin/python3
+"""
+This module defines the SQLiteStorage class which manages persistent
+storage for the hbnb clone in an embedded SQLite database.
+"""
+from os import getenv
+from sqlalchemy import event
+from models.engine.db_storage import DBStorage
+
+
+class SQLiteStorage(DBStorage):
+    """
+    This class stores the models in a SQLite database file through the
+    same SQLAlchemy mappings as DBStorage, for single node deployments and
+    test runs without a MySQL server.
+
+    Every connection is opened in WAL mode, so readers keep reading while
+    a request commits, and with the pragmas below.
+
+    Attributes:
+        pragmas (tuple): The (name, value) pragmas set on every connection.
+    """
+    pragmas = (
+        ('journal_mode', 'WAL'),
+        ('synchronous', 'NORMAL'),
+        ('foreign_keys', 'ON'),
+        ('busy_timeout', '5000'),
+        ('cache_size', '-16000'),
+        ('temp_store', 'MEMORY'),
+        ('mmap_size', '268435456'),
+    )
+
+    def __init__(self):
+        """
+        Initialize SQLiteStorage instance on the database file named by
+        HBNB_SQLITE_PATH, hbnb.db by default.
+        """
+        path = getenv("HBNB_SQLITE_PATH", "hbnb.db")
+        super().__init__('sqlite:///' + path)
+
+    def _configure(self, engine):
+        """
+        Set the pragmas on every new connection of the engine.
+
+        Args:
+            engine (sqlalchemy.Engine): The engine.
+        """
+        event.listen(engine, "connect", self.__connect)
+
+    def __connect(self, dbapi_connection, connection_record):
+        """
+        Set the pragmas on a new DBAPI connection.
+
+        Args:
+            dbapi_connection (sqlite3.Connection): The connection.
+            connection_record: The pool record of the connection.
+        """
+        cursor = dbapi_connection.cursor()
+        for name, value in self.pragmas:
+            cursor.execute('PRAGMA {} = {}'.format(name, value))
+        cursor.close()
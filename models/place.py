@@ -2,6 +2,7 @@
 """ Place Module for HBNB project """
 from models.base_model import BaseModel, Base
 from sqlalchemy import Table, Column, Integer, String, ForeignKey, Float
+from sqlalchemy import Index
 from sqlalchemy.orm import relationship
 from os import getenv
 
@@ -21,6 +22,7 @@ place_amenity = Table(
         ForeignKey("amenities.id"),
         primary_key=True,
         nullable=False,
+        index=True,
     ),
 )
 
@@ -29,9 +31,13 @@ class Place(BaseModel, Base):
     """A place to stay"""
 
     __tablename__ = "places"
-    if getenv("HBNB_TYPE_STORAGE") == "db":
+    if getenv("HBNB_TYPE_STORAGE") in ("db", "sqlite"):
+        # the places of a city, by price: also serves lookups by city_id
+        __table_args__ = (Index("ix_places_city_id_price_by_night",
+                                "city_id", "price_by_night"),)
         city_id = Column(String(60), ForeignKey("cities.id"), nullable=False)
-        user_id = Column(String(60), ForeignKey("users.id"), nullable=False)
+        user_id = Column(String(60), ForeignKey("users.id"), nullable=False,
+                         index=True)
         name = Column(String(128), nullable=False)
         description = Column(String(1024))
         number_rooms = Column(Integer, nullable=False, default=0)
@@ -59,32 +65,24 @@ class Place(BaseModel, Base):
 
         @property
         def reviews(self):
-            from models.__init__ import storage
+            from models import storage
             from models.review import Review
 
-            review_list = []
-            all_reviews = storage.all(Review)
-            for review in all_reviews:
-                if self.id == review.place_id:
-                    review_list.append(review)
-            return review_list
+            return list(storage.lookup(Review, 'place_id', self.id).values())
 
         @property
         def amenities(self):
-            from models.__init__ import storage
+            from models import storage
             from models.amenity import Amenity
 
-            amenity_list = []
-            all_amenities = storage.all(Amenity)
-            for amenity in all_amenities:
-                if self.id == amenity.place_id:
-                    amenity_list.append(amenity)
-            return amenity_list
+            amenities = [storage.get(Amenity, amenity_id)
+                         for amenity_id in self.amenity_ids]
+            return [amenity for amenity in amenities if amenity is not None]
 
         @amenities.setter
         def amenities(self, obj):
-            from models.__init__ import storage
+            from models import storage
             from models.amenity import Amenity
 
             if isinstance(obj, Amenity):
-                self.amenity_ids.append(obj.id)
+                storage.link_amenity(self, obj)
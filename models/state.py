@@ -22,19 +22,14 @@ class State(BaseModel, Base):
         instances where the state_id matches the current State instance id.
     """
     __tablename__ = "states"
-    if getenv('HBNB_TYPE_STORAGE') == "db":
-        name = Column(String(128), nullable=False)
+    if getenv('HBNB_TYPE_STORAGE') in ("db", "sqlite"):
+        name = Column(String(128), nullable=False, index=True)
         cities = relationship('City', cascade='all, delete', backref='state')
     else:
         name = ""
 
         @property
         def cities(self):
-            from models.__init__ import storage
+            from models import storage
             from models.city import City
-            city_list = []
-            storage_data = storage.all(City)
-            for city in storage_data.values():
-                if self.id == city.state_id:
-                    city_list.append(city)
-            return city_list
+            return list(storage.lookup(City, 'state_id', self.id).values())
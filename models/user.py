@@ -9,7 +9,7 @@ from os import getenv
 class User(BaseModel, Base):
     """This class defines a user by various attributes"""
     __tablename__ = 'users'
-    if getenv("HBNB_TYPE_STORAGE") == "db":
+    if getenv("HBNB_TYPE_STORAGE") in ("db", "sqlite"):
         email = Column(String(128), nullable=False)
         password = Column(String(128), nullable=False)
         first_name = Column(String(128), nullable=True)
@@ -21,3 +21,15 @@ class User(BaseModel, Base):
         password = ''
         first_name = ''
         last_name = ''
+
+        @property
+        def places(self):
+            from models import storage
+            from models.place import Place
+            return list(storage.lookup(Place, 'user_id', self.id).values())
+
+        @property
+        def reviews(self):
+            from models import storage
+            from models.review import Review
+            return list(storage.lookup(Review, 'user_id', self.id).values())
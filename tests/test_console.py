@@ -3,12 +3,21 @@
 This module contains unit tests for the HBNBCommand class.
 """
 
+import ast
 import unittest
+from io import StringIO
+from unittest.mock import patch
 from console import HBNBCommand
 from models import storage
+from models.engine.file_storage import FileStorage
+from models.amenity import Amenity
 from models.place import Place
+from models.state import State
 import os
 
+file_only = unittest.skipIf(not isinstance(storage, FileStorage),
+                            "file storage only")
+
 
 class TestHBNBCommand(unittest.TestCase):
     """
@@ -27,12 +36,14 @@ class TestHBNBCommand(unittest.TestCase):
         This method cleans up the testing environment.
         It is run after each test.
         """
-        storage._FileStorage__objects.clear()
+        if isinstance(storage, FileStorage):
+            storage._FileStorage__objects.clear()
         try:
             os.remove('file.json')
         except Exception:
             pass
 
+    @file_only
     def test_do_create(self):
         """
         This method tests the 'create' command of the HBNBCommand class.
@@ -55,3 +66,82 @@ class TestHBNBCommand(unittest.TestCase):
         self.assertEqual(obj.price_by_night, 300)
         self.assertEqual(obj.latitude, 37.773972)
         self.assertEqual(obj.longitude, -122.431297)
+
+    def output(self, line):
+        """
+        This method runs a console command and returns what it printed.
+        """
+        with patch('sys.stdout', new=StringIO()) as out:
+            self.cons.onecmd(self.cons.precmd(line))
+        return out.getvalue().strip()
+
+    @file_only
+    def test_do_count(self):
+        """
+        This method tests the 'count' command of the HBNBCommand class.
+        """
+        storage._FileStorage__objects.clear()
+        self.output('create Place')
+        self.output('create Place')
+        self.output('create State')
+        self.assertEqual(self.output('count Place'), '2')
+        self.assertEqual(self.output('State.count()'), '1')
+        self.assertEqual(self.output('count Nope'), '0')
+
+    def test_do_show_destroy(self):
+        """
+        This method tests the 'show' and 'destroy' commands.
+        """
+        obj_id = self.output('create State name="Texas"')
+        self.assertIn(obj_id, self.output('show State ' + obj_id))
+        self.assertEqual(self.output('show State nope'),
+                         '** no instance found **')
+        self.output('destroy State ' + obj_id)
+        self.assertEqual(self.output('show State ' + obj_id),
+                         '** no instance found **')
+
+    def test_do_all(self):
+        """
+        This method tests that 'all' prints the list of objects.
+        """
+        obj_id = self.output('create State name="Texas"')
+        self.output('create Amenity name="Wifi"')
+        states = ast.literal_eval(self.output('all State'))
+        self.assertEqual(len(states), storage.count(State))
+        self.assertTrue(all(s.startswith('[State] (') for s in states))
+        self.assertIn(obj_id, ''.join(states))
+        self.assertEqual(len(ast.literal_eval(self.output('all'))),
+                         storage.count())
+        self.assertEqual(self.output('all Nope'),
+                         "** class doesn't exist **")
+
+    @unittest.skipIf(isinstance(storage, FileStorage), "db storage only")
+    def test_unmapped_class(self):
+        """
+        This method tests that the database finds nothing of BaseModel,
+        which has no table.
+        """
+        self.assertEqual(self.output('all BaseModel'), '[]')
+        self.assertEqual(self.output('BaseModel.all()'), '[]')
+        self.assertEqual(self.output('count BaseModel'), '0')
+        self.assertEqual(self.output('show BaseModel nope'),
+                         '** no instance found **')
+        self.assertEqual(self.output('all BaseModel --limit 1'), '[]')
+
+    def test_do_all_page(self):
+        """
+        This method tests the '--limit' and '--after' options of 'all'.
+        """
+        for _ in range(3):
+            self.output('create Amenity name="Pool"')
+        ids = [obj.id for obj in storage.page(Amenity)]
+        first = ast.literal_eval(self.output('all Amenity --limit 2'))
+        self.assertEqual(len(first), 2)
+        self.assertIn(ids[1], first[1])
+        rest = ast.literal_eval(self.output(
+            'all Amenity --limit 2 --after ' + ids[1]))
+        self.assertIn(ids[2], rest[0])
+        self.assertEqual(self.output('all --limit 2'),
+                         "** class name missing **")
+        self.assertEqual(self.output('all Amenity --limit x'),
+                         "** invalid limit **")
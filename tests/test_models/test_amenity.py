@@ -1,6 +1,6 @@
 #!/usr/bin/python3
 """ """
-from tests.test_models.test_base_model import test_basemodel
+from tests.test_models.test_base_model import test_basemodel, file_only
 from models.amenity import Amenity
 
 
@@ -13,6 +13,7 @@ class test_Amenity(test_basemodel):
         self.name = "Amenity"
         self.value = Amenity
 
+    @file_only
     def test_name2(self):
         """ """
         new = self.value()
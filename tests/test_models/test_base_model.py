@@ -6,6 +6,10 @@ import datetime
 from uuid import UUID
 import json
 import os
+from os import getenv
+
+file_only = unittest.skipIf(getenv("HBNB_TYPE_STORAGE") in ("db", "sqlite"),
+                            "file storage only")
 
 
 class test_basemodel(unittest.TestCase):
@@ -39,6 +43,19 @@ class test_basemodel(unittest.TestCase):
         new = BaseModel(**copy)
         self.assertFalse(new is i)
 
+    def test_from_dict(self):
+        """ from_dict() rebuilds an equal, unchanged instance """
+        i = self.value()
+        i.created_at = i.created_at.replace(microsecond=0)
+        new = self.value.from_dict(i.to_dict())
+        self.assertIs(type(new), self.value)
+        self.assertIsNot(new, i)
+        self.assertEqual(new.to_dict(), i.to_dict())
+        self.assertEqual(new.created_at, i.created_at)
+        self.assertFalse(new.is_dirty)
+        new.name = 'dirty'
+        self.assertTrue(new.is_dirty)
+
     def test_kwargs_int(self):
         """ """
         i = self.value()
@@ -47,6 +64,7 @@ class test_basemodel(unittest.TestCase):
         with self.assertRaises(TypeError):
             new = BaseModel(**copy)
 
+    @file_only
     def test_save(self):
         """ Testing save """
         i = self.value()
@@ -62,12 +80,75 @@ class test_basemodel(unittest.TestCase):
         self.assertEqual(str(i), '[{}] ({}) {}'.format(self.name, i.id,
                          i.__dict__))
 
+    def test_dirty(self):
+        """ Attribute writes mark the instance dirty """
+        i = self.value()
+        i.mark_clean()
+        self.assertFalse(i.is_dirty)
+        i.name = 'dirty'
+        self.assertTrue(i.is_dirty)
+
+    @file_only
+    def test_dirty_in_place(self):
+        """ Lists and dicts changed in place mark the instance dirty """
+        i = self.value()
+        shared = []
+        i.tags = shared
+        i.extra = {}
+        self.assertIsNot(i.tags, shared)
+        for change in (lambda: i.tags.append('a'), lambda: i.tags.sort(),
+                       lambda: i.extra.update(a=1), lambda: i.extra.pop('a')):
+            i.mark_clean()
+            change()
+            self.assertTrue(i.is_dirty)
+        other = self.value.from_dict(i.to_dict())
+        other.mark_clean()
+        other.tags.clear()
+        self.assertTrue(other.is_dirty)
+        self.assertEqual(i.tags, ['a'])
+        i.mark_clean()
+        other.tags = i.tags
+        other.tags.append('b')
+        self.assertFalse(i.is_dirty)
+        self.assertEqual(i.tags, ['a'])
+        self.assertEqual(json.loads(json.dumps(other.to_dict()))['tags'],
+                         ['a', 'b'])
+
     def test_todict(self):
         """ """
         i = self.value()
         n = i.to_dict()
         self.assertEqual(i.to_dict(), n)
 
+    def test_todict_changes(self):
+        """ to_dict() and str() follow the changes of the instance """
+        i = self.value()
+        n = i.to_dict()
+        n['name'] = 'copy'
+        self.assertNotIn('name', i.to_dict())
+        self.assertEqual(i.to_dict()['__class__'], self.name)
+        self.assertEqual(str(i), str(i))
+        i.name = 'set'
+        self.assertEqual(i.to_dict()['name'], 'set')
+        self.assertIn("'name': 'set'", str(i))
+        i.__dict__['name'] = 'direct'
+        i.mark_dirty()
+        self.assertEqual(i.to_dict()['name'], 'direct')
+        self.assertIn("'name': 'direct'", str(i))
+        i.amenity_ids = []
+        self.assertEqual(i.to_dict()['amenity_ids'], [])
+        i.amenity_ids.append('A1')
+        self.assertEqual(i.to_dict()['amenity_ids'], ['A1'])
+        self.assertIn("'amenity_ids': ['A1']", str(i))
+
+    def test_class_name_attribute(self):
+        """ An instance attribute does not rename the class """
+        i = self.value()
+        i.class_name = 'Foo'
+        self.assertEqual(i.to_dict()['__class__'], self.name)
+        self.assertEqual(i.to_dict()['class_name'], 'Foo')
+        self.assertTrue(str(i).startswith('[{}]'.format(self.name)))
+
     def test_kwargs_none(self):
         """ """
         n = {None: None}
@@ -1,6 +1,6 @@
 #!/usr/bin/python3
 """ """
-from tests.test_models.test_base_model import test_basemodel
+from tests.test_models.test_base_model import test_basemodel, file_only
 from models.city import City
 
 
@@ -13,11 +13,13 @@ class test_City(test_basemodel):
         self.name = "City"
         self.value = City
 
+    @file_only
     def test_state_id(self):
         """ """
         new = self.value()
         self.assertEqual(type(new.state_id), str)
 
+    @file_only
     def test_name(self):
         """ """
         new = self.value()
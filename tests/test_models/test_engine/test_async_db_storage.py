@@ -0,0 +1,113 @@
+#!/usr/bin/python3
+""" Module for testing the asyncio db storage"""
+import asyncio
+import os
+import tempfile
+import unittest
+from importlib.util import find_spec
+from os import getenv
+from models.base_model import BaseModel
+from models.engine.async_db_storage import AsyncDBStorage, async_url
+from models.city import City
+from models.state import State
+
+
+class test_asyncUrl(unittest.TestCase):
+    """ Class to test async_url """
+
+    def test_drivers(self):
+        """ Blocking drivers are swapped for the asyncio ones """
+        self.assertEqual(async_url("sqlite:///hbnb.db"),
+                         "sqlite+aiosqlite:///hbnb.db")
+        self.assertEqual(async_url("mysql+mysqldb://u:p@h/db"),
+                         "mysql+aiomysql://u:p@h/db")
+        self.assertEqual(async_url("mysql+aiomysql://u:p@h/db"),
+                         "mysql+aiomysql://u:p@h/db")
+
+
+@unittest.skipIf(getenv("HBNB_TYPE_STORAGE") not in ("db", "sqlite"),
+                 "db storage only")
+@unittest.skipIf(not find_spec("aiosqlite") or not find_spec("greenlet"),
+                 "aiosqlite and greenlet needed")
+class test_asyncDBStorage(unittest.IsolatedAsyncioTestCase):
+    """ Class to test AsyncDBStorage on a SQLite file of its own """
+
+    async def asyncSetUp(self):
+        """ Create the storage and a state with one city """
+        fd, self.path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        self.storage = AsyncDBStorage('sqlite:///' + self.path)
+        await self.storage.reload()
+        self.state = State(name="California")
+        self.city = City(name="San Francisco", state_id=self.state.id)
+        async with self.storage.request():
+            self.storage.new(self.state)
+            self.storage.new(self.city)
+            await self.storage.save()
+
+    async def asyncTearDown(self):
+        """ Close the storage and remove its file """
+        await self.storage.dispose()
+        os.remove(self.path)
+
+    async def test_read(self):
+        """ all(), get(), count(), query() and page() read the rows """
+        store = self.storage
+        async with store.request():
+            states = await store.all(State)
+            self.assertEqual(list(states), ['State.' + self.state.id])
+            self.assertEqual(len(await store.all()), 2)
+            self.assertIs(await store.get(State, self.state.id),
+                          states['State.' + self.state.id])
+            self.assertIsNone(await store.get(State, "nope"))
+            self.assertEqual(await store.count(), 2)
+            cities = await store.query(City, state_id=self.state.id)
+            self.assertEqual([city.id for city in cities], [self.city.id])
+            self.assertEqual(
+                await store.query(City, name__gt="San Francisco"), [])
+            self.assertEqual(await store.page(City, after=self.city.id), [])
+
+    async def test_unmapped(self):
+        """ Classes without a table have no rows, as with DBStorage """
+        store = self.storage
+        async with store.request():
+            self.assertEqual(await store.all(BaseModel), {})
+            self.assertIsNone(await store.get(BaseModel, self.state.id))
+            self.assertEqual(await store.count(BaseModel), 0)
+            self.assertEqual(await store.query(BaseModel, id="x"), [])
+            self.assertEqual(await store.page(BaseModel), [])
+            self.assertEqual(await store.count(), 2)
+
+    async def test_load(self):
+        """ load= reads relationships without lazy loading """
+        async with self.storage.request():
+            states = await self.storage.all(State, load=['cities'])
+        state = states['State.' + self.state.id]
+        self.assertEqual([city.id for city in state.cities], [self.city.id])
+
+    async def test_write(self):
+        """ save() commits new objects and delete() removes them """
+        store = self.storage
+        async with store.request():
+            other = State(name="Nevada")
+            store.new(other)
+            await store.save()
+        async with store.request():
+            self.assertEqual(await store.count(State), 2)
+            await store.delete(await store.get(State, other.id))
+            await store.save()
+        async with store.request():
+            self.assertEqual(await store.count(State), 1)
+
+    async def test_task_sessions(self):
+        """ Each task reads through a session of its own """
+        async def read():
+            async with self.storage.request():
+                return await self.storage.get(State, self.state.id)
+
+        first, second = await asyncio.gather(read(), read())
+        self.assertEqual(first.id, second.id)
+        self.assertIsNot(first, second)
+        async with self.storage.request():
+            self.assertIs(await self.storage.get(State, self.state.id),
+                          await self.storage.get(State, self.state.id))
@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+""" Module for testing the query result cache """
+import unittest
+from unittest.mock import patch
+from models.engine.cache import QueryCache
+
+
+class test_queryCache(unittest.TestCase):
+    """ Class to test QueryCache """
+
+    def test_hit_miss(self):
+        """ Stored results are returned and counted """
+        cache = QueryCache()
+        self.assertIsNone(cache.get('a'))
+        cache.put('a', [1, 2], ['State'])
+        self.assertEqual(cache.get('a'), [1, 2])
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 1,
+                                         'evictions': 0, 'invalidations': 0,
+                                         'entries': 1, 'size': 2})
+
+    def test_invalidate(self):
+        """ invalidate() drops the entries of a class only """
+        cache = QueryCache()
+        cache.put('states', [1], ['State'])
+        cache.put('cities', [2], ['City', 'State'])
+        cache.put('users', [3], ['User'])
+        cache.invalidate(['State'])
+        self.assertIsNone(cache.get('states'))
+        self.assertIsNone(cache.get('cities'))
+        self.assertEqual(cache.get('users'), [3])
+        self.assertEqual(cache.stats()['invalidations'], 2)
+
+    def test_generation(self):
+        """ A result invalidated while it was loaded is not stored """
+        cache = QueryCache()
+        before = cache.generation(['State', 'City'])
+        cache.invalidate(['City'])
+        cache.put('cities', [1], ['State', 'City'], before)
+        self.assertNotIn('cities', cache)
+        cache.put('cities', [1], ['State', 'City'],
+                  cache.generation(['State', 'City']))
+        self.assertIn('cities', cache)
+
+    def test_lru(self):
+        """ The least recently used entries go first """
+        cache = QueryCache(maxsize=4)
+        cache.put('a', [1, 2], ['State'])
+        cache.put('b', [3], ['State'])
+        cache.get('a')
+        cache.put('c', [4, 5], ['State'])
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), [1, 2])
+        cache.put('d', list(range(5)), ['State'])
+        self.assertIsNone(cache.get('d'))
+        self.assertEqual(cache.stats()['size'], 4)
+
+    def test_ttl(self):
+        """ Entries expire after ttl seconds """
+        cache = QueryCache(ttl=10)
+        with patch('models.engine.cache.monotonic', return_value=100):
+            cache.put('a', [1], ['State'])
+        with patch('models.engine.cache.monotonic', return_value=109):
+            self.assertIn('a', cache)
+            self.assertEqual(cache.get('a'), [1])
+        with patch('models.engine.cache.monotonic', return_value=110):
+            self.assertNotIn('a', cache)
+            self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats()['entries'], 0)
@@ -0,0 +1,66 @@
+#!/usr/bin/python3
+""" Module for testing the JSON codecs of file storage """
+import json
+import math
+import unittest
+from importlib.util import find_spec
+from unittest.mock import patch
+from models.engine.codec import JsonCodec, OrjsonCodec, UjsonCodec
+from models.engine.codec import get_codec
+
+record = {'id': 'a/b', 'name': 'Café "Loft"', 'price_by_night': 120,
+          'latitude': 37.7749295, 'amenity_ids': ['x', 'y'], 'max': None}
+
+
+class test_codec(unittest.TestCase):
+    """ Class to test the codecs and get_codec """
+
+    def check(self, codec):
+        """ codec reads its own text and writes JSON json reads """
+        text = codec.dumps(record)
+        self.assertIsInstance(text, str)
+        self.assertEqual(codec.loads(text), record)
+        self.assertEqual(json.loads(text), record)
+        self.assertEqual(codec.loads(json.dumps(record)), record)
+        self.assertEqual(codec.loads(text.encode()), record)
+        big = {'number_rooms': 2 ** 70, 'max_guest': -2 ** 64 - 1,
+               'price_by_night': 2 ** 63 - 1}
+        for text in (codec.dumps(big), json.dumps(big)):
+            self.assertEqual(codec.loads(text), big)
+            self.assertEqual(codec.loads(text.encode()), big)
+        odd = [float('nan'), float('inf'), -float('inf')]
+        for text in (codec.dumps(odd), json.dumps(odd)):
+            values = codec.loads(text)
+            self.assertTrue(math.isnan(values[0]))
+            self.assertEqual(values[1:], odd[1:])
+
+    def test_json(self):
+        """ The standard library codec """
+        self.check(JsonCodec())
+
+    @unittest.skipIf(not find_spec("orjson"), "orjson not installed")
+    def test_orjson(self):
+        """ The orjson codec """
+        self.check(OrjsonCodec())
+
+    @unittest.skipIf(not find_spec("ujson"), "ujson not installed")
+    def test_ujson(self):
+        """ The ujson codec """
+        self.check(UjsonCodec())
+
+    def test_get_codec(self):
+        """ Codecs are picked by name, from HBNB_JSON_CODEC by default """
+        self.assertIsInstance(get_codec('json'), JsonCodec)
+        with patch.dict('os.environ', {'HBNB_JSON_CODEC': 'json'}):
+            self.assertIs(type(get_codec()), JsonCodec)
+        self.assertIsInstance(get_codec('auto'), JsonCodec)
+        with self.assertRaises(ValueError):
+            get_codec('pickle')
+
+    def test_missing_library(self):
+        """ A codec whose library is missing raises, auto falls back """
+        with patch('models.engine.codec.import_module',
+                   side_effect=ImportError):
+            with self.assertRaises(ImportError):
+                get_codec('orjson')
+            self.assertIs(type(get_codec('auto')), JsonCodec)
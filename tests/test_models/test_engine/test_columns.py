@@ -0,0 +1,95 @@
+#!/usr/bin/python3
+""" Module for testing the column store of file storage """
+import unittest
+from array import array
+from datetime import datetime
+from models.engine.columns import ColumnStore
+
+
+class test_columnStore(unittest.TestCase):
+    """ Class to test ColumnStore """
+
+    def setUp(self):
+        """ Two records of different shapes """
+        self.first = {'id': 'a', 'created_at': '2023-09-20T09:54:27',
+                      'updated_at': '2023-09-20T09:54:27.521709',
+                      'name': 'Loft', 'price_by_night': 3, 'latitude': 1.5,
+                      'amenity_ids': ['x'], '__class__': 'Place'}
+        self.second = {'id': 'b', 'created_at': 'yesterday',
+                       'latitude': 2, 'is_open': True,
+                       '__class__': 'Place'}
+
+    def test_round_trip(self):
+        """ Records read back equal to the ones stored """
+        store = ColumnStore()
+        store.add('Place.a', self.first)
+        store.add('Place.b', self.second)
+        self.assertEqual(store.get('Place.a', 'Place'), self.first)
+        self.assertEqual(store.get('Place.b', 'Place'), self.second)
+        self.assertNotIn('__class__', store.get('Place.a'))
+        self.assertIsNone(store.get('Place.c'))
+        self.assertEqual(len(store), 2)
+        self.assertIn('Place.a', store)
+
+    def test_packing(self):
+        """ Numbers and timestamps are packed while they fit """
+        store = ColumnStore()
+        store.add('Place.a', self.first)
+        columns = store._ColumnStore__columns
+        self.assertIsInstance(columns['price_by_night'], array)
+        self.assertIsInstance(columns['created_at'], array)
+        self.assertIsInstance(columns['latitude'], array)
+        store.add('Place.b', self.second)
+        self.assertIsInstance(columns['price_by_night'], list)
+        self.assertIsInstance(columns['latitude'], list)
+        self.assertEqual(store.get('Place.b')['latitude'], 2)
+
+    def test_big_int(self):
+        """ Integers beyond 64 bits turn their column into a list """
+        store = ColumnStore()
+        store.add('Place.a', self.first)
+        store.add('Place.b', dict(self.second, price_by_night=2 ** 63))
+        store.add('Place.c', {'number_rooms': -2 ** 64})
+        columns = store._ColumnStore__columns
+        self.assertIsInstance(columns['price_by_night'], list)
+        self.assertIsInstance(columns['number_rooms'], list)
+        self.assertEqual(store.get('Place.b')['price_by_night'], 2 ** 63)
+        self.assertEqual(store.get('Place.c')['number_rooms'], -2 ** 64)
+        self.assertEqual(store.get('Place.a', 'Place'), self.first)
+
+    def test_datetimes(self):
+        """ datetime timestamps are packed and read back formatted """
+        store = ColumnStore()
+        record = dict(self.first, created_at=datetime(2023, 9, 20, 9, 54, 27))
+        store.add('Place.a', record)
+        self.assertIsInstance(store._ColumnStore__columns['created_at'],
+                              array)
+        self.assertEqual(store.get('Place.a', 'Place'), self.first)
+
+    def test_interned(self):
+        """ Equal foreign keys are held once, ids are not stored """
+        store = ColumnStore()
+        for key in ('City.a', 'City.b'):
+            store.add(key, {'state_id': ''.join(['s', '1'])})
+        column = store._ColumnStore__columns['state_id']
+        self.assertIs(column[0], column[1])
+        store.add('City.c', {'id': 'c'})
+        self.assertNotIn('id', store._ColumnStore__columns)
+        store.add('City.d', {'id': 'other'})
+        self.assertEqual(store.get('City.c')['id'], 'c')
+        self.assertEqual(store.get('City.d')['id'], 'other')
+
+    def test_discard(self):
+        """ Removed records leave slots that get packed away """
+        store = ColumnStore()
+        for i in range(10):
+            store.add('Place.{}'.format(i), dict(self.first, id=str(i)))
+        for i in range(8):
+            store.discard('Place.{}'.format(i))
+        store.discard('Place.99')
+        self.assertEqual(len(store), 2)
+        self.assertLess(len(store._ColumnStore__columns['name']), 10)
+        self.assertEqual(store.get('Place.9')['id'], '9')
+        store.add('Place.9', dict(self.second, id='9'))
+        self.assertEqual(store.get('Place.9', 'Place'),
+                         dict(self.second, id='9'))
@@ -0,0 +1,280 @@
+#!/usr/bin/python3
+""" Module for testing db storage"""
+import unittest
+from os import getenv
+from threading import Thread
+from unittest.mock import patch
+from sqlalchemy import create_engine, event
+from models import storage
+from models.engine.db_storage import TimedQueuePool
+from models.engine.migrations import migrate
+from models.city import City
+from models.place import Place
+from models.state import State
+
+
+@unittest.skipIf(getenv("HBNB_TYPE_STORAGE") not in ("db", "sqlite"),
+                 "db storage only")
+class test_dbStorage(unittest.TestCase):
+    """ Class to test the db storage method """
+
+    def setUp(self):
+        """ Set up a state with one city """
+        self.state = State(name="California")
+        self.state.save()
+        self.city = City(name="San Francisco", state_id=self.state.id)
+        self.city.save()
+
+    def tearDown(self):
+        """ Remove the rows of the test """
+        storage.delete(self.city)
+        storage.delete(self.state)
+        storage.save()
+
+    def test_get(self):
+        """ get() finds an object by id """
+        self.assertIs(storage.get(State, self.state.id), self.state)
+        self.assertIsNone(storage.get(State, "nope"))
+
+    def test_unmapped(self):
+        """ BaseModel has no table, so nothing of it is found """
+        from models.base_model import BaseModel
+        self.assertEqual(storage.all(BaseModel), {})
+        self.assertEqual(list(storage.iter(BaseModel)), [])
+        self.assertEqual(storage.keys(BaseModel), [])
+        self.assertIsNone(storage.get(BaseModel, self.state.id))
+        self.assertEqual(storage.count(BaseModel), 0)
+        self.assertEqual(storage.page(BaseModel, 1), [])
+
+    def test_count(self):
+        """ count() counts one class or every class """
+        self.assertEqual(storage.count(State), len(storage.all(State)))
+        self.assertEqual(storage.count(), len(storage.all()))
+
+    def test_all_parallel(self):
+        """ all() can query the classes on several connections at once,
+        and only sees unsaved objects by querying in the session """
+        with patch.dict('os.environ', {'HBNB_DB_PARALLEL_ALL': '1'}):
+            parallel = type(storage)()
+        parallel.reload()
+        self.addCleanup(parallel.close)
+        connections = set()
+        engine = parallel._DBStorage__engine
+        listener = (lambda conn, *args: connections.add(id(conn)))
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            objs = parallel.all()
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        self.assertGreater(len(connections), 1)
+        self.assertEqual(sorted(objs), sorted(parallel.keys()))
+        self.assertIs(objs['State.' + self.state.id],
+                      parallel.get(State, self.state.id))
+        state = State(name="Unsaved")
+        parallel.new(state)
+        self.assertIs(parallel.all()['State.' + state.id], state)
+        parallel.close()
+
+    def test_keys(self):
+        """ keys() matches the keys of all() """
+        self.assertEqual(sorted(storage.keys()), sorted(storage.all()))
+        self.assertIn('City.' + self.city.id, storage.keys(City))
+
+    def test_query(self):
+        """ query() filters and explain() shows the SQL """
+        self.assertEqual(storage.query(City, state_id=self.state.id),
+                         [self.city])
+        self.assertEqual(storage.query(State, id__in=[self.state.id],
+                                       name__ne=None), [self.state])
+        self.assertEqual(storage.query(City, name__gt="San Francisco"), [])
+        plan = storage.explain(City, state_id=self.state.id, order_by='name',
+                               limit=1)
+        self.assertIn("WHERE cities.state_id =", plan)
+        self.assertIn("LIMIT", plan)
+
+    def test_iter(self):
+        """ iter() yields the objects of all() """
+        self.assertEqual(list(storage.iter(City, batch_size=1)),
+                         list(storage.all(City).values()))
+        self.assertEqual(len(list(storage.iter())), len(storage.all()))
+
+    def test_page(self):
+        """ page() reads ids in order after a cursor """
+        ids = sorted(storage.keys(State))
+        ids = [key.partition('.')[2] for key in ids]
+        self.assertEqual([s.id for s in storage.page(State, 1)], ids[:1])
+        self.assertEqual(storage.page(State, 1, ids[-1]), [])
+        self.assertIn("cities.id > ", storage.explain(
+            City, order_by='id', limit=1, id__gt=self.city.id))
+
+    def test_cache(self):
+        """ The cache answers repeated reads until a class changes """
+        with patch.dict('os.environ', {'HBNB_DB_CACHE': '1'}):
+            cached = type(storage)()
+        cached.reload()
+        self.addCleanup(cached.close)
+        self.assertEqual(list(cached.all(State)), list(cached.all(State)))
+        cached.get(City, self.city.id)
+        self.assertEqual(cached.get(City, self.city.id).id, self.city.id)
+        self.assertEqual(cached.cache_stats()['hits'], 2)
+        state = State(name="Utah")
+        cached.new(state)
+        cached.save()
+        self.assertIn('State.' + state.id, cached.all(State))
+        city = cached.get(City, self.city.id)
+        city.name = "Oakland"
+        cached.save()
+        self.assertEqual(cached.query(City, name="Oakland"), [city])
+        cached.delete(state)
+        cached.save()
+        self.assertNotIn('State.' + state.id, cached.all(State))
+
+    def test_cache_race(self):
+        """ A commit during a query keeps its result out of the cache """
+        with patch.dict('os.environ', {'HBNB_DB_CACHE': '1'}):
+            cached = type(storage)()
+        cached.reload()
+        self.addCleanup(cached.close)
+        cache = cached._DBStorage__cache
+        put = cache.put
+        state = State(name="Racer")
+
+        def write():
+            cached.new(state)
+            cached.save()
+            cached.close()
+
+        def racing_put(*args):
+            thread = Thread(target=write)
+            thread.start()
+            thread.join()
+            put(*args)
+        with patch.object(cache, 'put', racing_put):
+            cached.all(State)
+        self.addCleanup(storage.save)
+        self.addCleanup(lambda: storage.delete(
+            storage.get(State, state.id)))
+        self.assertIn('State.' + state.id, cached.all(State))
+        self.assertEqual(len(cached.all(State)), cached.count(State))
+
+    def test_bulk(self):
+        """ bulk_new() inserts rows and bulk_update() changes them """
+        states = [State(name="Bulk {}".format(i)) for i in range(3)]
+        self.assertEqual(storage.bulk_new(states), 3)
+        loaded = storage.query(State, id__in=[s.id for s in states])
+        self.addCleanup(storage.save)
+        for state in loaded:
+            self.addCleanup(storage.delete, state)
+        self.assertEqual({s.name for s in loaded},
+                         {"Bulk 0", "Bulk 1", "Bulk 2"})
+        rows = [{'id': states[0].id, 'name': "Bulk X"},
+                {'id': self.state.id, 'name': "Golden"}]
+        self.assertEqual(storage.bulk_update(State, rows), 2)
+        self.assertEqual(self.state.name, "Golden")
+        self.assertEqual(storage.get(State, states[0].id).name, "Bulk X")
+
+    def test_bulk_order(self):
+        """ bulk_new() inserts parents first and rolls back on error """
+        state = State(name="Bulk")
+        city = City(name="Bulk", state_id=state.id)
+        self.assertEqual(storage.bulk_new([city, state]), 2)
+        self.addCleanup(storage.save)
+        self.addCleanup(storage.delete, storage.get(State, state.id))
+        self.addCleanup(storage.delete, storage.get(City, city.id))
+        self.assertEqual(storage.get(City, city.id).state_id, state.id)
+        with self.assertRaises(Exception):
+            storage.bulk_new([City(name="Twin", id=city.id,
+                                   state_id=state.id),
+                              State(name="Inserted first")])
+        self.assertEqual(storage.query(State, name="Inserted first"), [])
+
+    def test_all_load(self):
+        """ all() loads the listed relationships up front """
+        others = [State(name="Nevada"), State(name="Texas")]
+        for state in others:
+            state.save()
+        self.addCleanup(storage.save)
+        for state in others:
+            self.addCleanup(storage.delete, state)
+        storage.close()
+        statements = []
+        engine = storage._DBStorage__engine
+        listener = (lambda *args: statements.append(args[2]))
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            states = storage.all(State, load=['cities']).values()
+            for state in states:
+                [city.name for city in state.cities]
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        self.assertEqual(len(statements), 2)
+        with self.assertRaises(AttributeError):
+            storage.all(State, load=['towns'])
+
+    def test_thread_sessions(self):
+        """ Each thread works in its own session """
+        session = storage._DBStorage__session
+        sessions = []
+        thread = Thread(target=lambda: sessions.append(session()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(sessions[0], session())
+        self.assertIs(session(), session())
+
+    def test_close(self):
+        """ close() gives the next call a new session """
+        session = storage._DBStorage__session()
+        storage.close()
+        self.assertIsNot(storage._DBStorage__session(), session)
+        self.assertEqual(storage.get(State, self.state.id).id, self.state.id)
+
+
+class test_timedQueuePool(unittest.TestCase):
+    """ Class to test the pool behind DBStorage """
+
+    def test_stats(self):
+        """ The pool counts checkouts and their wait """
+        engine = create_engine("sqlite://", poolclass=TimedQueuePool,
+                               pool_size=1, max_overflow=0)
+        with engine.connect():
+            self.assertEqual(engine.pool.checkedout(), 1)
+        with engine.connect():
+            pass
+        self.assertEqual(engine.pool.waits, 2)
+        self.assertGreater(engine.pool.wait_time, 0)
+        self.assertGreaterEqual(engine.pool.wait_time, engine.pool.max_wait)
+        engine.dispose()
+
+
+@unittest.skipIf(getenv("HBNB_TYPE_STORAGE") != "sqlite", "sqlite only")
+class test_sqliteStorage(unittest.TestCase):
+    """ Class to test the SQLite backend """
+
+    def test_pragmas(self):
+        """ Connections are opened in WAL mode with foreign keys on """
+        with storage._DBStorage__engine.connect() as conn:
+            mode = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+            fks = conn.exec_driver_sql("PRAGMA foreign_keys").scalar()
+        self.assertEqual(mode, "wal")
+        self.assertEqual(fks, 1)
+
+    def test_fk_indexes(self):
+        """ Foreign key columns are indexed """
+        with storage._DBStorage__engine.connect() as conn:
+            plan = conn.exec_driver_sql(
+                "EXPLAIN QUERY PLAN SELECT * FROM cities WHERE state_id = ?",
+                ("x",)).all()
+        self.assertIn("USING INDEX", " ".join(row[-1] for row in plan))
+
+    def test_migrate(self):
+        """ migrate() puts back missing indexes, which the plans use """
+        engine = storage._DBStorage__engine
+        with engine.begin() as conn:
+            conn.exec_driver_sql("DROP INDEX ix_states_name")
+        self.assertEqual(migrate(engine), ["ix_states_name"])
+        self.assertEqual(migrate(engine), [])
+        self.assertIn("USING INDEX ix_states_name",
+                      storage.explain(State, order_by='name'))
+        plan = storage.explain(Place, city_id="x", order_by='price_by_night')
+        self.assertIn("USING INDEX ix_places_city_id_price_by_night", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
@@ -3,9 +3,18 @@
 import unittest
 from models.base_model import BaseModel
 from models import storage
+from models.engine.codec import get_codec
+from models.engine.file_storage import FileStorage
+import json
 import os
+from importlib.util import find_spec
+from os import getenv
 
+file_only = unittest.skipIf(getenv("HBNB_TYPE_STORAGE") in ("db", "sqlite"),
+                            "file storage only")
 
+
+@file_only
 class test_fileStorage(unittest.TestCase):
     """ Class to test the file storage method """
 
@@ -107,3 +116,517 @@ class test_fileStorage(unittest.TestCase):
         from models.engine.file_storage import FileStorage
         print(type(storage))
         self.assertEqual(type(storage), FileStorage)
+
+    def test_all_cls(self):
+        """ all(cls) only returns objects of that class """
+        from models.state import State
+        from models.city import City
+        state = State()
+        city = City()
+        storage.new(state)
+        storage.new(city)
+        self.assertEqual(storage.all(State), {'State.' + state.id: state})
+        self.assertEqual(storage.all(City), {'City.' + city.id: city})
+
+    def test_all_cls_after_delete(self):
+        """ Deleted objects leave the class index """
+        from models.state import State
+        state = State()
+        storage.new(state)
+        storage.delete(state)
+        self.assertEqual(storage.all(State), {})
+
+    def test_all_cls_direct_edit(self):
+        """ Class index follows keys removed from all() directly """
+        from models.state import State
+        state = State()
+        storage.new(state)
+        del storage.all()['State.' + state.id]
+        self.assertEqual(storage.all(State), {})
+
+    def test_save_reuses_clean_fragment(self):
+        """ Clean objects are written from their cached JSON """
+        new = BaseModel()
+        new.save()
+        new.__dict__['name'] = 'unseen'
+        storage.save()
+        with open('file.json') as f:
+            self.assertNotIn('name', json.load(f)['BaseModel.' + new.id])
+        new.name = 'seen'
+        storage.save()
+        with open('file.json') as f:
+            self.assertEqual(json.load(f)['BaseModel.' + new.id]['name'],
+                             'seen')
+
+    def test_save_in_place_change(self):
+        """ Lists changed in place are saved without being reassigned """
+        from models.place import Place
+        place = Place()
+        place.amenity_ids = []
+        place.save()
+        place.amenity_ids.append('A1')
+        storage.save()
+        with open('file.json') as f:
+            saved = json.load(f)['Place.' + place.id]
+        self.assertEqual(saved['amenity_ids'], ['A1'])
+        self.assertIn(place.id, storage.places_with('A1'))
+        storage.save()
+        self.assertFalse(place.is_dirty)
+        storage.all().clear()
+        storage.reload()
+        loaded = storage.all()['Place.' + place.id]
+        loaded.amenity_ids.remove('A1')
+        self.assertTrue(loaded.is_dirty)
+        storage.save()
+        with open('file.json') as f:
+            saved = json.load(f)['Place.' + place.id]
+        self.assertEqual(saved['amenity_ids'], [])
+
+    def test_close_unchanged(self):
+        """ close() keeps the objects when the file did not change """
+        new = BaseModel()
+        new.save()
+        storage.close()
+        self.assertIs(storage.all()['BaseModel.' + new.id], new)
+
+    def test_close_changed(self):
+        """ close() reloads a file changed by someone else """
+        new = BaseModel()
+        new.save()
+        with open('file.json') as f:
+            data = json.load(f)
+        data['BaseModel.' + new.id]['name'] = 'outside'
+        with open('file.json', 'w') as f:
+            json.dump(data, f)
+        storage.close()
+        self.assertEqual(storage.all()['BaseModel.' + new.id].name,
+                         'outside')
+
+    def test_lookup(self):
+        """ State.cities follows new(), delete() and state_id changes """
+        from models.state import State
+        from models.city import City
+        first = State()
+        second = State()
+        city = City(state_id=first.id)
+        storage.new(city)
+        self.assertEqual(first.cities, [city])
+        city.state_id = second.id
+        self.assertEqual(first.cities, [])
+        self.assertEqual(second.cities, [city])
+        storage.delete(city)
+        self.assertEqual(second.cities, [])
+
+    def test_lookup_keeps_objects(self):
+        """ Relationships use the one storage and its stored objects """
+        import sys
+        from models.state import State
+        from models.city import City
+        first = State()
+        second = State()
+        city = City(state_id=first.id)
+        for obj in (first, second, city):
+            storage.new(obj)
+        storage.save()
+        city.state_id = second.id
+        self.assertEqual(second.cities, [city])
+        self.assertIs(storage.all()['City.' + city.id], city)
+        self.assertNotIn('models.__init__', sys.modules)
+
+    def test_query(self):
+        """ query() uses the id and foreign key indexes when it can """
+        from models.city import City
+        first = City(state_id='s1', name='b')
+        second = City(state_id='s1', name='a')
+        third = City(state_id='s2', name='c')
+        for city in (first, second, third):
+            storage.new(city)
+        self.assertEqual(storage.query(City, state_id='s1', order_by='name'),
+                         [second, first])
+        self.assertTrue(storage.explain(City, state_id='s1')
+                        .startswith('index City.state_id'))
+        self.assertEqual(storage.query(City, id__in=[third.id, 'nope']),
+                         [third])
+        self.assertTrue(storage.explain(City, id=third.id)
+                        .startswith('get City.id'))
+        self.assertEqual(storage.query(City, name__gte='b', limit=1,
+                                       order_by='-name'), [third])
+        self.assertTrue(storage.explain(City, name='a').startswith('scan'))
+        third.state_id = 's1'
+        self.assertEqual(len(storage.query(City, state_id__in=['s1'])), 3)
+
+    def test_page(self):
+        """ page() walks ids in order and follows new() and delete() """
+        from models.state import State
+        states = [State() for _ in range(5)]
+        for state in states[:3]:
+            storage.new(state)
+        ids = sorted(state.id for state in states[:3])
+        self.assertEqual([s.id for s in storage.page(State, 2)], ids[:2])
+        storage.new(states[3])
+        storage.delete(storage.get(State, ids[1]))
+        ids = sorted(ids[:1] + ids[2:] + [states[3].id])
+        self.assertEqual([s.id for s in storage.page(State)], ids)
+        self.assertEqual([s.id for s in storage.page(State, 2, ids[0])],
+                         ids[1:3])
+        self.assertEqual(storage.page(State, 2, ids[-1]), [])
+
+    def test_bulk(self):
+        """ bulk_new() and bulk_update() write the file once each """
+        from models.state import State
+        states = [State(name=str(i)) for i in range(3)]
+        self.assertEqual(storage.bulk_new(states), 3)
+        with open('file.json') as f:
+            self.assertEqual(len(json.load(f)), 3)
+        rows = [{'id': states[0].id, 'name': 'Texas'},
+                {'id': 'nope', 'name': 'Utah'}]
+        self.assertEqual(storage.bulk_update(State, rows), 1)
+        self.assertEqual(states[0].name, 'Texas')
+        with open('file.json') as f:
+            self.assertEqual(json.load(f)['State.' + states[0].id]['name'],
+                             'Texas')
+
+    def test_lookup_reviews(self):
+        """ Place.reviews and User.reviews come from the index """
+        from models.place import Place
+        from models.review import Review
+        from models.user import User
+        place = Place()
+        user = User()
+        review = Review(place_id=place.id, user_id=user.id)
+        storage.new(review)
+        storage.new(Review(place_id='other', user_id=user.id))
+        self.assertEqual(place.reviews, [review])
+        self.assertEqual(len(user.reviews), 2)
+
+    def test_place_amenity(self):
+        """ Links are indexed both ways and survive a reload """
+        from models.place import Place
+        from models.amenity import Amenity
+        place = Place()
+        wifi = Amenity()
+        place.save()
+        wifi.save()
+        place.amenities = wifi
+        place.amenities = wifi
+        self.assertEqual(Place.amenity_ids, [])
+        self.assertEqual(place.amenities, [wifi])
+        self.assertIn(wifi.id, storage.amenities_of(place.id))
+        self.assertEqual(list(storage.places_with(wifi.id)), [place.id])
+        place.save()
+        storage.all().clear()
+        storage.reload()
+        self.assertEqual(list(storage.places_with(wifi.id)), [place.id])
+
+    def test_place_amenity_delete(self):
+        """ Deleting an amenity removes its links """
+        from models.place import Place
+        from models.amenity import Amenity
+        place = Place()
+        wifi = Amenity()
+        storage.new(place)
+        storage.new(wifi)
+        place.amenities = wifi
+        storage.delete(wifi)
+        self.assertEqual(place.amenity_ids, [])
+        self.assertEqual(list(storage.places_with(wifi.id)), [])
+
+    def test_lazy_reload(self):
+        """ Lazy reload builds objects on the first all(cls) """
+        from models.state import State
+        state = State()
+        state.save()
+        BaseModel().save()
+        storage.all().clear()
+        FileStorage._FileStorage__lazy = True
+        try:
+            storage.reload()
+            self.assertEqual(len(storage._FileStorage__objects), 0)
+            self.assertEqual(storage.keys(State), ['State.' + state.id])
+            self.assertEqual(storage.count(), 2)
+            self.assertEqual(list(storage.all(State)),
+                             ['State.' + state.id])
+            self.assertEqual(len(storage._FileStorage__objects), 1)
+            storage.save()
+            with open('file.json') as f:
+                self.assertEqual(len(json.load(f)), 2)
+            self.assertEqual(len(storage.all()), 2)
+        finally:
+            FileStorage._FileStorage__lazy = False
+
+    def test_compact_reload(self):
+        """ Compact reload keeps records in columns until they are used """
+        from models.place import Place
+        from models.state import State
+        state = State(name="Texas")
+        state.save()
+        places = [Place(name=str(i), price_by_night=i, latitude=0.5)
+                  for i in range(3)]
+        for place in places:
+            place.save()
+        with open('file.json') as f:
+            before = json.load(f)
+        storage.all().clear()
+        FileStorage._FileStorage__compact = True
+        try:
+            storage.reload()
+            self.assertEqual(len(storage._FileStorage__objects), 0)
+            self.assertEqual(
+                len(storage._FileStorage__columns['Place']), 3)
+            self.assertEqual(storage.count(Place), 3)
+            self.assertEqual(sorted(obj.price_by_night for obj in
+                                    storage.iter(Place)), [0, 1, 2])
+            self.assertEqual(len(storage._FileStorage__objects), 0)
+            got = storage.get(Place, places[1].id)
+            self.assertEqual(got.to_dict(), places[1].to_dict())
+            self.assertEqual(
+                len(storage._FileStorage__columns['Place']), 2)
+            storage.delete(storage.get(Place, places[2].id))
+            storage.save()
+            with open('file.json') as f:
+                after = json.load(f)
+            del before['Place.' + places[2].id]
+            self.assertEqual(after, before)
+            self.assertEqual(storage.all(State)['State.' + state.id].name,
+                             "Texas")
+            self.assertNotIn('State', storage._FileStorage__columns)
+        finally:
+            FileStorage._FileStorage__compact = False
+            storage.all()
+
+    def test_binary_snapshot(self):
+        """ Binary snapshots reload like JSON ones, whatever is written """
+        from models.engine.snapshot import is_binary
+        from models.place import Place
+        binary = FileStorage._FileStorage__binary
+        FileStorage._FileStorage__binary = False
+        places = [Place(name=str(i), price_by_night=i, latitude=0.5)
+                  for i in range(3)]
+        for place in places:
+            place.save()
+        with open('file.json') as f:
+            before = json.load(f)
+        FileStorage._FileStorage__binary = True
+        try:
+            storage.save()
+            self.assertTrue(is_binary('file.json'))
+            for lazy in (False, True):
+                storage.all().clear()
+                FileStorage._FileStorage__lazy = lazy
+                storage.reload()
+                got = storage.get(Place, places[1].id)
+                self.assertEqual(got.to_dict(), places[1].to_dict())
+                storage.save()
+            FileStorage._FileStorage__binary = False
+            storage.save()
+            self.assertFalse(is_binary('file.json'))
+            with open('file.json') as f:
+                self.assertEqual(json.load(f), before)
+        finally:
+            FileStorage._FileStorage__binary = binary
+            FileStorage._FileStorage__lazy = False
+            storage.all()
+
+    def test_binary_cache(self):
+        """ Binary saves only encode the objects changed since the last """
+        from unittest.mock import patch
+        from models.engine import snapshot
+        from models.place import Place
+        binary = FileStorage._FileStorage__binary
+        FileStorage._FileStorage__binary = True
+        places = [Place(name=str(i), amenity_ids=[]) for i in range(3)]
+        try:
+            for place in places:
+                storage.new(place)
+            storage.save()
+            places[0].name = 'renamed'
+            places[1].amenity_ids.append('A1')
+            with patch.object(snapshot, 'encode',
+                              wraps=snapshot.encode) as encode:
+                storage.save()
+            self.assertEqual(sorted(call.args[0] for call in
+                                    encode.call_args_list),
+                             sorted('Place.' + place.id
+                                    for place in places[:2]))
+            storage.all().clear()
+            storage.reload()
+            self.assertEqual(storage.get(Place, places[0].id).name,
+                             'renamed')
+            self.assertEqual(storage.get(Place, places[1].id).amenity_ids,
+                             ['A1'])
+        finally:
+            FileStorage._FileStorage__binary = binary
+
+    def test_iter(self):
+        """ iter() walks built and unbuilt records without keeping them """
+        from models.state import State
+        states = [State(name=str(i)) for i in range(5)]
+        for state in states:
+            state.save()
+        BaseModel().save()
+        self.assertEqual(list(storage.iter(State)), states)
+        self.assertEqual(len(list(storage.iter())), 6)
+        storage.all().clear()
+        FileStorage._FileStorage__lazy = True
+        try:
+            storage.reload()
+            storage.get(State, states[3].id)
+            names = [obj.name for obj in storage.iter(State, batch_size=2)]
+            self.assertEqual(sorted(names), ['0', '1', '2', '3', '4'])
+            self.assertEqual(len(storage._FileStorage__objects), 1)
+            self.assertEqual(storage.count(State), 5)
+        finally:
+            FileStorage._FileStorage__lazy = False
+            storage.all()
+
+
+@file_only
+class test_fileStorageJournal(unittest.TestCase):
+    """ Class to test the journal mode of file storage """
+
+    def setUp(self):
+        """ Empty storage and switch it to journal mode """
+        for path in ('file.json', 'file.json.journal'):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        storage.reload()
+        storage.all().clear()
+        storage._FileStorage__pending.clear()
+        FileStorage._FileStorage__journal = True
+
+    def tearDown(self):
+        """ Restore snapshot mode and remove storage files """
+        FileStorage._FileStorage__journal = False
+        storage.all().clear()
+        for path in ('file.json', 'file.json.journal'):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def test_save_appends(self):
+        """ Each save appends only the new records to the journal """
+        first = BaseModel()
+        first.save()
+        second = BaseModel()
+        second.save()
+        self.assertFalse(os.path.exists('file.json'))
+        with open('file.json.journal') as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual([line['key'] for line in lines],
+                         ['BaseModel.' + first.id, 'BaseModel.' + second.id])
+
+    def test_reload_replays(self):
+        """ Reload applies journal records, deletions included """
+        kept = BaseModel()
+        kept.save()
+        gone = BaseModel()
+        gone.save()
+        gone.delete()
+        storage.save()
+        storage.all().clear()
+        storage.reload()
+        self.assertEqual(list(storage.all()), ['BaseModel.' + kept.id])
+
+    @unittest.skipIf(not find_spec("orjson"), "orjson not installed")
+    def test_reload_orjson(self):
+        """ Values orjson writes as UTF-8 or leaves to json come back """
+        codec = FileStorage._FileStorage__codec
+        FileStorage._FileStorage__codec = get_codec('orjson')
+        try:
+            new = BaseModel(name='Café "Loft"', rooms=2 ** 70)
+            new.save()
+            storage.all().clear()
+            storage.reload()
+        finally:
+            FileStorage._FileStorage__codec = codec
+        loaded = storage.all()['BaseModel.' + new.id]
+        self.assertEqual(loaded.name, 'Café "Loft"')
+        self.assertEqual(loaded.rooms, 2 ** 70)
+
+    def test_save_appends_dirty(self):
+        """ Objects changed by attribute writes alone are journaled """
+        new = BaseModel()
+        new.save()
+        new.name = 'changed'
+        storage.save()
+        with open('file.json.journal') as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[1]['val']['name'], 'changed')
+
+    def test_close_applies_tail(self):
+        """ close() only applies records appended by someone else """
+        kept = BaseModel()
+        kept.save()
+        other = BaseModel()
+        record = {'op': 'set', 'key': 'BaseModel.' + other.id,
+                  'val': other.to_dict()}
+        with open('file.json.journal', 'a') as f:
+            f.write(json.dumps(record) + '\n')
+        storage.close()
+        self.assertIs(storage.all()['BaseModel.' + kept.id], kept)
+        self.assertIn('BaseModel.' + other.id, storage.all())
+
+    def test_compaction(self):
+        """ Journal is folded into the snapshot past the limit """
+        limit = FileStorage._FileStorage__journal_limit
+        FileStorage._FileStorage__journal_limit = 2
+        try:
+            for _ in range(3):
+                BaseModel().save()
+        finally:
+            FileStorage._FileStorage__journal_limit = limit
+        self.assertFalse(os.path.exists('file.json.journal'))
+        with open('file.json') as f:
+            self.assertEqual(len(json.load(f)), 3)
+
+
+@file_only
+class test_fileStorageBatch(unittest.TestCase):
+    """ Class to test batches of file storage changes """
+
+    def setUp(self):
+        """ Empty storage """
+        storage.all().clear()
+        storage._FileStorage__pending.clear()
+
+    def tearDown(self):
+        """ Remove storage file at end of tests """
+        storage.all().clear()
+        try:
+            os.remove('file.json')
+        except FileNotFoundError:
+            pass
+
+    def test_batch_defers_save(self):
+        """ The file is only written when the block exits """
+        with storage.batch():
+            first = BaseModel()
+            first.save()
+            BaseModel().save()
+            self.assertFalse(os.path.exists('file.json'))
+        with open('file.json') as f:
+            self.assertEqual(len(json.load(f)), 2)
+
+    def test_batch_rollback(self):
+        """ An exception undoes every change made in the block """
+        kept = BaseModel()
+        kept.name = 'before'
+        kept.save()
+        gone = BaseModel()
+        gone.save()
+        with self.assertRaises(KeyError):
+            with storage.batch():
+                BaseModel().save()
+                kept.name = 'after'
+                kept.save()
+                gone.delete()
+                raise KeyError
+        self.assertEqual(sorted(storage.all()),
+                         sorted(['BaseModel.' + kept.id,
+                                 'BaseModel.' + gone.id]))
+        self.assertEqual(storage.all()['BaseModel.' + kept.id].name,
+                         'before')
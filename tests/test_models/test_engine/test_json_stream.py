@@ -0,0 +1,47 @@
+#!/usr/bin/python3
+""" Module for testing the incremental JSON reader and writer """
+import io
+import json
+import unittest
+from models.engine.json_stream import iter_items, write_items
+
+
+class test_jsonStream(unittest.TestCase):
+    """ Class to test iter_items and write_items """
+
+    def test_items(self):
+        """ Members come out in order with their JSON text """
+        data = {'a': {'x': 1, 'y': 'two'}, 'b': [1, 2.5, None], 'c': 300}
+        items = list(iter_items(io.StringIO(json.dumps(data))))
+        self.assertEqual([(k, v) for k, v, _ in items], list(data.items()))
+        for key, val, text in items:
+            self.assertEqual(json.loads(text), val)
+
+    def test_small_chunks(self):
+        """ Values split across reads are decoded whole """
+        data = {str(i): {'n': i * 1000, 's': 'x' * i} for i in range(50)}
+        items = iter_items(io.StringIO(json.dumps(data)), chunk_size=3)
+        self.assertEqual({k: v for k, v, _ in items}, data)
+
+    def test_empty_object(self):
+        """ An empty object yields nothing """
+        self.assertEqual(list(iter_items(io.StringIO(' {} '))), [])
+
+    def test_invalid(self):
+        """ Text that is not one JSON object raises ValueError """
+        for text in ('', '[1]', '{"a": 1', '{"a" 1}', '{"a": 1,}'):
+            with self.assertRaises(ValueError):
+                list(iter_items(io.StringIO(text)))
+
+    def test_write_items(self):
+        """ Members written in chunks make one JSON object """
+        data = {str(i): {'n': i, 's': 'x' * i} for i in range(50)}
+        members = ['{}: {}'.format(json.dumps(k), json.dumps(v))
+                   for k, v in data.items()]
+        for chunk_size in (1, 100, 1 << 16):
+            f = io.StringIO()
+            write_items(f, iter(members), chunk_size=chunk_size)
+            self.assertEqual(f.getvalue(), json.dumps(data))
+        f = io.StringIO()
+        write_items(f, [])
+        self.assertEqual(f.getvalue(), '{}')
@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+""" Module for testing the parsing of storage queries """
+import unittest
+from models.engine.query import Query
+from models.place import Place
+
+
+class test_query(unittest.TestCase):
+    """ Class to test Query """
+
+    def places(self):
+        """ Three places with distinct prices """
+        return [Place(name=name, price_by_night=price, city_id=city)
+                for name, price, city in (('a', 50, 'x'), ('b', 150, 'y'),
+                                          ('c', 100, 'x'))]
+
+    def test_parse(self):
+        """ Filters are split into attribute, operator and value """
+        query = Query(Place, order_by=['-price_by_night', 'name'],
+                      name='a', price_by_night__gte=10, city_id__in=('x',))
+        self.assertEqual(query.conditions, [('name', 'eq', 'a'),
+                                            ('price_by_night', 'gte', 10),
+                                            ('city_id', 'in', ['x'])])
+        self.assertEqual(query.order, [('price_by_night', True),
+                                       ('name', False)])
+
+    def test_errors(self):
+        """ Unknown attributes and operators are refused """
+        with self.assertRaises(AttributeError):
+            Query(Place, nope=1)
+        with self.assertRaises(AttributeError):
+            Query(Place, order_by='-nope')
+        with self.assertRaises(ValueError):
+            Query(Place, name__like='a')
+        with self.assertRaises(ValueError):
+            Query(Place, name__in='abc')
+        with self.assertRaises(ValueError):
+            Query(Place, limit=-1)
+
+    def test_apply(self):
+        """ Models are filtered, sorted and sliced """
+        a, b, c = self.places()
+        query = Query(Place, order_by='-price_by_night',
+                      price_by_night__lt=200)
+        self.assertEqual(query.apply([a, b, c]), [b, c, a])
+        query = Query(Place, order_by=['city_id', '-name'], offset=1,
+                      limit=1)
+        self.assertEqual(query.apply([a, b, c]), [a])
+        query = Query(Place, city_id__in=['x'], name__ne='a')
+        self.assertEqual(query.apply([a, b, c]), [c])
+
+    def test_none(self):
+        """ Missing values compare as SQL NULL """
+        a, b, c = self.places()
+        b.name = None
+        self.assertEqual(Query(Place, name=None).apply([a, b, c]), [b])
+        self.assertEqual(Query(Place, name__ne=None).apply([a, b, c]),
+                         [a, c])
+        self.assertEqual(Query(Place, name__gt='a').apply([a, b, c]), [c])
+        self.assertEqual(Query(Place, order_by='name').apply([a, b, c]),
+                         [b, a, c])
+
+    def test_describe(self):
+        """ describe() spells out the query """
+        query = Query(Place, order_by='-name', limit=5, name__ne='a')
+        self.assertEqual(query.describe(),
+                         "filter name ne 'a', order by -name, limit 5")
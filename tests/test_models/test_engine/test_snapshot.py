@@ -0,0 +1,126 @@
+#!/usr/bin/python3
+""" Module for testing the binary snapshot format """
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+from models.engine.snapshot import MAGIC, convert, encode, is_binary
+from models.engine.snapshot import iter_records, write_records
+
+records = {
+    'Place.1': {'id': '1', 'created_at': '2017-06-14T22:31:03.285259',
+                'updated_at': '2017-06-14T22:31:03',
+                'name': 'Café "Loft"', 'price_by_night': 120,
+                'latitude': 37.77, 'amenity_ids': ['a', 'b'],
+                '__class__': 'Place'},
+    'State.2': {'id': '2', 'name': 'Texas', '__class__': 'State'},
+    'Pet.3': {'id': '3', 'created_at': 'yesterday',
+              'updated_at': '1969-12-31T23:59:59.999999',
+              '__class__': 'Pet'},
+}
+
+
+class test_snapshot(unittest.TestCase):
+    """ Class to test the binary snapshot reader and writer """
+
+    def test_round_trip(self):
+        """ Records come back in order as they were written """
+        f = io.BytesIO()
+        write_records(f, records.items())
+        self.assertTrue(f.getvalue().startswith(MAGIC))
+        f.seek(0)
+        self.assertEqual(list(iter_records(f)), list(records.items()))
+        f.seek(0)
+        place = dict(iter_records(f, datetimes=True))['Place.1']
+        self.assertEqual(place['updated_at'], datetime(2017, 6, 14, 22, 31, 3))
+
+    def test_small_chunks(self):
+        """ Records split across reads are decoded whole """
+        f = io.BytesIO()
+        write_records(f, records.items(), chunk_size=1)
+        f.seek(0)
+        self.assertEqual(dict(iter_records(f, chunk_size=3)), records)
+
+    def test_class_id(self):
+        """ Known classes take one byte, timestamps eight, and both are
+        left out of the JSON attributes """
+        data = encode('Place.1', records['Place.1'])
+        self.assertEqual(data[0], 2)
+        self.assertNotIn(b'Place', data)
+        self.assertNotIn(b'2017', data)
+        self.assertIn(b'Pet', encode('Pet.3', records['Pet.3']))
+
+    def test_invalid(self):
+        """ JSON text and truncated records raise ValueError """
+        with self.assertRaises(ValueError):
+            list(iter_records(io.BytesIO(b'{}')))
+        f = io.BytesIO()
+        write_records(f, records.items())
+        for size in (len(MAGIC) + 3, len(f.getvalue()) - 1):
+            with self.assertRaises(ValueError):
+                list(iter_records(io.BytesIO(f.getvalue()[:size])))
+
+    def test_convert(self):
+        """ convert() turns JSON into binary and back """
+        folder = tempfile.mkdtemp()
+        paths = [os.path.join(folder, name) for name in ('a', 'b', 'c')]
+        with open(paths[0], 'w') as f:
+            json.dump(records, f)
+        self.assertEqual(convert(paths[0], paths[1], 'binary'), 3)
+        self.assertTrue(is_binary(paths[1]))
+        self.assertFalse(is_binary(paths[0]))
+        self.assertLess(os.path.getsize(paths[1]),
+                        os.path.getsize(paths[0]))
+        self.assertEqual(convert(paths[1], paths[2], 'json'), 3)
+        with open(paths[2]) as f:
+            self.assertEqual(json.load(f), records)
+        with self.assertRaises(ValueError):
+            convert(paths[0], paths[1], 'xml')
+        for path in paths:
+            os.remove(path)
+        os.rmdir(folder)
+
+    def test_convert_in_place(self):
+        """ convert() may write over its source """
+        folder = tempfile.mkdtemp()
+        path = os.path.join(folder, 'file.json')
+        with open(path, 'w') as f:
+            json.dump(records, f)
+        self.assertEqual(convert(path, path, 'binary'), 3)
+        self.assertTrue(is_binary(path))
+        self.assertEqual(convert(path, path, 'json'), 3)
+        with open(path) as f:
+            self.assertEqual(json.load(f), records)
+        self.assertEqual(os.listdir(folder), ['file.json'])
+        os.remove(path)
+        os.rmdir(folder)
+
+    def test_script(self):
+        """ convert_snapshot.py converts without loading the storage """
+        root = os.path.dirname(os.path.dirname(os.path.dirname(
+            os.path.dirname(os.path.abspath(__file__)))))
+        script = os.path.join(root, 'convert_snapshot.py')
+        folder = tempfile.mkdtemp()
+        paths = [os.path.join(folder, name) for name in ('a', 'b')]
+        with open(paths[0], 'w') as f:
+            json.dump(records, f)
+        check = ("import runpy, sys; sys.argv = {!r}; "
+                 "runpy.run_path({!r}, run_name='__main__'); "
+                 "print('models.engine.file_storage' in sys.modules)")
+        out = subprocess.run(
+            [sys.executable, '-c', check.format(
+                [script, paths[0], paths[1], 'binary'], script)],
+            cwd=folder, capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.split(), ['3', 'False'])
+        self.assertTrue(is_binary(paths[1]))
+        out = subprocess.run([sys.executable, script, paths[0]],
+                             capture_output=True, text=True)
+        self.assertEqual(out.returncode, 1)
+        self.assertIn('Usage', out.stdout)
+        for path in paths:
+            os.remove(path)
+        os.rmdir(folder)
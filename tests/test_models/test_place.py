@@ -1,6 +1,6 @@
 #!/usr/bin/python3
 """ """
-from tests.test_models.test_base_model import test_basemodel
+from tests.test_models.test_base_model import test_basemodel, file_only
 from models.place import Place
 
 
@@ -13,56 +13,67 @@ class test_Place(test_basemodel):
         self.name = "Place"
         self.value = Place
 
+    @file_only
     def test_city_id(self):
         """ """
         new = self.value()
         self.assertEqual(type(new.city_id), str)
 
+    @file_only
     def test_user_id(self):
         """ """
         new = self.value()
         self.assertEqual(type(new.user_id), str)
 
+    @file_only
     def test_name(self):
         """ """
         new = self.value()
         self.assertEqual(type(new.name), str)
 
+    @file_only
     def test_description(self):
         """ """
         new = self.value()
         self.assertEqual(type(new.description), str)
 
+    @file_only
     def test_number_rooms(self):
         """ """
         new = self.value()
         self.assertEqual(type(new.number_rooms), int)
 
+    @file_only
     def test_number_bathrooms(self):
         """ """
         new = self.value()
         self.assertEqual(type(new.number_bathrooms), int)
 
+    @file_only
     def test_max_guest(self):
         """ """
         new = self.value()
         self.assertEqual(type(new.max_guest), int)
 
+    @file_only
     def test_price_by_night(self):
         """ """
         new = self.value()
         self.assertEqual(type(new.price_by_night), int)
 
+    @file_only
     def test_latitude(self):
         """ """
         new = self.value()
         self.assertEqual(type(new.latitude), float)
 
+    @file_only
     def test_longitude(self):
         """ """
         new = self.value()
         self.assertEqual(type(new.latitude), float)
 
+    @file_only
     def test_amenity_ids(self):
         """ """
         new = self.value()
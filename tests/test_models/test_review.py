@@ -1,6 +1,6 @@
 #!/usr/bin/python3
 """ """
-from tests.test_models.test_base_model import test_basemodel
+from tests.test_models.test_base_model import test_basemodel, file_only
 from models.review import Review
 
 
@@ -13,16 +13,19 @@ class test_review(test_basemodel):
         self.name = "Review"
         self.value = Review
 
+    @file_only
     def test_place_id(self):
         """ """
         new = self.value()
         self.assertEqual(type(new.place_id), str)
 
+    @file_only
     def test_user_id(self):
         """ """
         new = self.value()
         self.assertEqual(type(new.user_id), str)
 
+    @file_only
     def test_text(self):
         """ """
         new = self.value()
@@ -1,6 +1,6 @@
 #!/usr/bin/python3
 """ """
-from tests.test_models.test_base_model import test_basemodel
+from tests.test_models.test_base_model import test_basemodel, file_only
 from models.state import State
 
 
@@ -13,6 +13,7 @@ class test_state(test_basemodel):
         self.name = "State"
         self.value = State
 
+    @file_only
     def test_name3(self):
         """ """
         new = self.value()
@@ -1,6 +1,6 @@
 #!/usr/bin/python3
 """ """
-from tests.test_models.test_base_model import test_basemodel
+from tests.test_models.test_base_model import test_basemodel, file_only
 from models.user import User
 
 
@@ -13,21 +13,25 @@ class test_User(test_basemodel):
         self.name = "User"
         self.value = User
 
+    @file_only
     def test_first_name(self):
         """ """
         new = self.value()
         self.assertEqual(type(new.first_name), str)
 
+    @file_only
     def test_last_name(self):
         """ """
         new = self.value()
         self.assertEqual(type(new.last_name), str)
 
+    @file_only
     def test_email(self):
         """ """
         new = self.value()
         self.assertEqual(type(new.email), str)
 
+    @file_only
     def test_password(self):
         """ """
         new = self.value()
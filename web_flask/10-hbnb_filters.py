@@ -13,7 +13,7 @@ def hbnb_filters():
     """Route to display a HTML page with a list of all states
     """
 
-    states = storage.all(State).values()
+    states = storage.all(State, load=['cities']).values()
     amenities = storage.all(Amenity).values()
     return render_template('10-hbnb_filters.html',
                            states=states, amenities=amenities)
@@ -14,7 +14,7 @@ def hbnb_filters():
     """Route to display a HTML page with a list of all states
     """
 
-    states = storage.all(State).values()
+    states = storage.all(State, load=['cities']).values()
     amenities = storage.all(Amenity).values()
     places = storage.all(Place).values()
     return render_template('100-hbnb.html',
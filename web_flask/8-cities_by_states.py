@@ -11,7 +11,7 @@ app = Flask(__name__)
 def cities_by_states_list():
     """Route to display a HTML page with the list of all states
     """
-    states = storage.all(State).values()
+    states = storage.all(State, load=['cities']).values()
     return render_template('8-cities_by_states.html', states=states)
 
 
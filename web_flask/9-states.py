@@ -13,7 +13,10 @@ def states_list(id):
     """Route to display a HTML page with a list of all states
     """
 
-    states = storage.all(State).values()
+    if id is None:
+        states = storage.all(State).values()
+    else:
+        states = storage.query(State, id=id, load=['cities'])
     return render_template('9-states.html', states=states, state_id=id)
 
 